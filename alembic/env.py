@@ -1,3 +1,4 @@
+import os
 from logging.config import fileConfig
 
 from sqlalchemy import engine_from_config
@@ -5,6 +6,8 @@ from sqlalchemy import pool
 
 from alembic import context
 
+from timeline.models import Base
+
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
@@ -14,11 +17,18 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
+# Allow pointing at another timeline database:
+#   alembic -x db_url=sqlite:///path/to/timeline.db upgrade head
+# or set TIMELINE_DATABASE_URL in the environment.
+db_url = context.get_x_argument(as_dictionary=True).get("db_url") or os.getenv(
+    "TIMELINE_DATABASE_URL"
+)
+if db_url:
+    config.set_main_option("sqlalchemy.url", db_url)
+
 # add your model's MetaData object here
 # for 'autogenerate' support
-# from myapp import mymodel
-# target_metadata = mymodel.Base.metadata
-target_metadata = None
+target_metadata = Base.metadata
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -0,0 +1,45 @@
+"""timeline_events baseline
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Databases created by `timeline watch` already have the table
+    if sa.inspect(op.get_bind()).has_table('timeline_events'):
+        return
+    op.create_table(
+        'timeline_events',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('timestamp', sa.DateTime()),
+        sa.Column('event_type', sa.String(50)),
+        sa.Column('source', sa.String(100)),
+        sa.Column('action', sa.String(50)),
+        sa.Column('details', sa.JSON()),
+        sa.Column('content', sa.Text()),
+        sa.Column('cursor_event_type', sa.Enum(
+            'CHAT', 'COMPOSE', 'CREATE', 'EDIT', 'COMMAND', 'SUGGESTION',
+            name='cursoreventtype'
+        ), nullable=True),
+        sa.Column('ai_response', sa.Text(), nullable=True),
+        sa.Column('user_input', sa.Text(), nullable=True),
+        sa.Column('code_changes', sa.JSON(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('timeline_events')
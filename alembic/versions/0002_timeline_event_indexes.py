@@ -0,0 +1,34 @@
+"""timeline_events time/type/source indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # if_not_exists: fresh databases from init_db already carry these
+    op.create_index('ix_timeline_events_timestamp', 'timeline_events',
+                    ['timestamp'], if_not_exists=True)
+    op.create_index('ix_timeline_events_type_timestamp', 'timeline_events',
+                    ['event_type', 'timestamp'], if_not_exists=True)
+    op.create_index('ix_timeline_events_source_timestamp', 'timeline_events',
+                    ['source', 'timestamp'], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_timeline_events_source_timestamp', table_name='timeline_events')
+    op.drop_index('ix_timeline_events_type_timestamp', table_name='timeline_events')
+    op.drop_index('ix_timeline_events_timestamp', table_name='timeline_events')
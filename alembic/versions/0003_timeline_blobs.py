@@ -0,0 +1,41 @@
+"""timeline_blobs snapshot store
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Databases created by init_db or `timeline watch` already have both
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('timeline_blobs'):
+        op.create_table(
+            'timeline_blobs',
+            sa.Column('digest', sa.String(64), primary_key=True),
+            sa.Column('codec', sa.String(10)),
+            sa.Column('size', sa.Integer()),
+            sa.Column('data', sa.LargeBinary()),
+            sa.Column('created_at', sa.DateTime()),
+        )
+    columns = {column['name'] for column in inspector.get_columns('timeline_events')}
+    if 'content_digest' not in columns:
+        op.add_column('timeline_events', sa.Column('content_digest', sa.String(64), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('timeline_events') as batch_op:
+        batch_op.drop_column('content_digest')
+    op.drop_table('timeline_blobs')
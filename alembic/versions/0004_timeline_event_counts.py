@@ -0,0 +1,60 @@
+"""timeline_event_counts hourly rollup
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00
+
+"""
+import os
+from collections import Counter
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Databases created by init_database already have (and maintain) it
+    if sa.inspect(op.get_bind()).has_table('timeline_event_counts'):
+        return
+    counts_table = op.create_table(
+        'timeline_event_counts',
+        sa.Column('event_type', sa.String(50), primary_key=True),
+        sa.Column('source_dir', sa.String(255), primary_key=True),
+        sa.Column('hour', sa.DateTime(), primary_key=True),
+        sa.Column('count', sa.Integer(), nullable=False),
+    )
+
+    # Backfill from existing events in one streaming pass
+    events = sa.table(
+        'timeline_events',
+        sa.column('event_type', sa.String),
+        sa.column('source', sa.String),
+        sa.column('timestamp', sa.DateTime),
+    )
+    counts = Counter()
+    result = op.get_bind().execution_options(yield_per=10000).execute(
+        sa.select(events.c.event_type, events.c.source, events.c.timestamp)
+    )
+    for event_type, source, timestamp in result:
+        if timestamp is None:
+            continue
+        source_dir = (os.path.dirname(source) or source) if source else ''
+        hour = timestamp.replace(minute=0, second=0, microsecond=0)
+        counts[(event_type or '', source_dir, hour)] += 1
+    if counts:
+        op.bulk_insert(counts_table, [
+            {'event_type': event_type, 'source_dir': source_dir, 'hour': hour, 'count': count}
+            for (event_type, source_dir, hour), count in counts.items()
+        ])
+
+
+def downgrade() -> None:
+    op.drop_table('timeline_event_counts')
@@ -0,0 +1,58 @@
+"""timeline_events_fts full-text index
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS timeline_events_fts USING fts5(
+        content, user_input, ai_response,
+        content='timeline_events', content_rowid='id', tokenize='porter unicode61'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS timeline_events_fts_insert AFTER INSERT ON timeline_events BEGIN
+        INSERT INTO timeline_events_fts(rowid, content, user_input, ai_response)
+        VALUES (new.id, new.content, new.user_input, new.ai_response);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS timeline_events_fts_delete AFTER DELETE ON timeline_events BEGIN
+        INSERT INTO timeline_events_fts(timeline_events_fts, rowid, content, user_input, ai_response)
+        VALUES ('delete', old.id, old.content, old.user_input, old.ai_response);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS timeline_events_fts_update AFTER UPDATE OF content, user_input, ai_response ON timeline_events BEGIN
+        INSERT INTO timeline_events_fts(timeline_events_fts, rowid, content, user_input, ai_response)
+        VALUES ('delete', old.id, old.content, old.user_input, old.ai_response);
+        INSERT INTO timeline_events_fts(rowid, content, user_input, ai_response)
+        VALUES (new.id, new.content, new.user_input, new.ai_response);
+    END""",
+]
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for statement in FTS_DDL:
+        op.execute(statement)
+    # Index the events that already exist
+    op.execute("INSERT INTO timeline_events_fts(timeline_events_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute("DROP TRIGGER IF EXISTS timeline_events_fts_update")
+    op.execute("DROP TRIGGER IF EXISTS timeline_events_fts_delete")
+    op.execute("DROP TRIGGER IF EXISTS timeline_events_fts_insert")
+    op.execute("DROP TABLE IF EXISTS timeline_events_fts")
@@ -1,6 +1,16 @@
 """
 CrewAI automation package
 """
-from .base_crew import BaseCrew
+import importlib
 
-__all__ = ['BaseCrew'] 
\ No newline at end of file
+# BaseCrew pulls in crewai and langchain; import it on first access (PEP 562)
+# so tools that only need crews.visualization start quickly
+__all__ = ['BaseCrew']
+
+
+def __getattr__(name):
+    if name == 'BaseCrew':
+        value = importlib.import_module('.base_crew', __name__).BaseCrew
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,58 +2,57 @@ from pathlib import Path
 from loguru import logger
 from datetime import datetime
 from crewai import Agent, Task, Crew
-from langchain_openai import ChatOpenAI
 from langchain.tools import Tool
-from langchain_community.tools import DuckDuckGoSearchRun
-import os
 from typing import List
+from crews.registry import shared_llm, shared_tool, shared_agent, add_log_sink
 
 class BaseCrew:
-    """Base class for all crews with common functionality"""
+    """Base class for all crews with common functionality
+
+    The LLM, search tool and ecosystem agent are built on first use and
+    come from the shared registry, so constructing a crew is cheap and
+    crews with the same settings reuse one client. Subclasses change them
+    through ``model``, ``temperature`` and ``search_description``.
+    """
+    
+    # Using 3.5 for testing
+    model = "gpt-3.5-turbo"
+    temperature = 0.7
+    search_description = "Search for information"
     
     def __init__(self, output_dir: str):
         # Setup paths
         self.output_dir = Path(f"crews/crew-output/{output_dir}")
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Configure logging
-        log_path = Path("crews/crew-output/logs")
-        log_path.mkdir(parents=True, exist_ok=True)
-        logger.add(
-            log_path / f"{output_dir}_{{time}}.log",
+        # Configure logging (one sink per crew type per process)
+        add_log_sink(
+            Path("crews/crew-output/logs") / f"{output_dir}_{{time}}.log",
             rotation="500 MB",
             level="INFO"
         )
         
-        # Initialize OpenAI (using 3.5 for testing)
-        self.llm = ChatOpenAI(
-            model="gpt-3.5-turbo",
-            temperature=0.7,
-            api_key=os.getenv('OPENAI_API_KEY')
-        )
-        
-        # Initialize tools
-        self.search = DuckDuckGoSearchRun()
-        self.tools = [
-            Tool(
-                name="Search",
-                func=self.search.run,
-                description="Search for information"
-            )
-        ]
-        
-        # Add ecosystem visualization agent
-        self.ecosystem_visualizer = Agent(
+        logger.info(f"Initialized {self.__class__.__name__}")
+
+    @property
+    def llm(self):
+        return shared_llm(self.model, self.temperature)
+
+    @property
+    def tools(self) -> List[Tool]:
+        return [shared_tool("Search", self.search_description)]
+
+    @property
+    def ecosystem_visualizer(self) -> Agent:
+        return shared_agent(('ecosystem-visualizer', self.model, self.temperature), lambda: Agent(
             role='Ecosystem Visualizer',
             goal='Create system relationship diagrams',
             backstory="""You create clear Mermaid diagrams showing how 
             different systems and APIs interact.""",
             llm=self.llm,
-            tools=self.tools,
+            tools=[shared_tool("Search", "Search for information")],
             verbose=True
-        )
-        
-        logger.info(f"Initialized {self.__class__.__name__}")
+        ))
 
     def save_output(self, content: str, filename: str) -> Path:
         """Save output with timestamp"""
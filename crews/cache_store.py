@@ -0,0 +1,114 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS {table} (
+    key TEXT PRIMARY KEY,
+    label TEXT NOT NULL,
+    value TEXT NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS ix_{table}_accessed ON {table} (accessed);
+"""
+
+
+class TTLStore:
+    """String values in a SQLite table with expiry and LRU eviction.
+
+    Entries expire ``ttl`` seconds after they were written; once more than
+    ``max_entries`` are stored the least recently used are evicted. The
+    database runs in WAL mode so threads and processes can share it.
+    ``label`` is stored alongside for inspecting the table by hand.
+    """
+
+    def __init__(self, path, table, ttl, max_entries):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.table = table
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(SCHEMA.format(table=table))
+
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def get(self, key):
+        """The stored value, or None if missing or expired"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, created FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl and now - row[1] > self.ttl:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self.expired += 1
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                f"UPDATE {self.table} SET accessed = ?, hits = hits + 1 WHERE key = ?", (now, key)
+            )
+            self.hits += 1
+            return row[0]
+
+    def put(self, key, value, label=''):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, label, value, created, accessed) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, label, value, now, now)
+            )
+            self._evict()
+
+    def _evict(self):
+        """Drop the least recently used entries beyond ``max_entries``"""
+        if not self.max_entries:
+            return
+        excess = self._conn.execute(f"SELECT count(*) FROM {self.table}").fetchone()[0] - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN "
+                f"(SELECT key FROM {self.table} ORDER BY accessed LIMIT ?)", (excess,)
+            )
+            self.evicted += excess
+
+    def purge_expired(self):
+        """Delete every expired entry; returns how many were removed"""
+        if not self.ttl:
+            return 0
+        with self._lock:
+            removed = self._conn.execute(
+                f"DELETE FROM {self.table} WHERE created < ?", (time.time() - self.ttl,)
+            ).rowcount
+        self.expired += removed
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+
+    def stats(self):
+        with self._lock:
+            entries = self._conn.execute(f"SELECT count(*) FROM {self.table}").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': entries,
+            'expired': self.expired,
+            'evicted': self.evicted,
+        }
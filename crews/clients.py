@@ -0,0 +1,179 @@
+import asyncio
+import json
+import os
+import httpx
+from crewai.llms.base_llm import BaseLLM
+from langchain_openai import ChatOpenAI
+from crews.rate_limit import get_limiter, rate_limited, estimate_tokens
+from crews.llm_cache import get_llm_cache
+from crews.search_cache import cached_search
+
+DEFAULT_MODEL = os.getenv('OPENAI_MODEL_NAME', 'gpt-3.5-turbo')
+
+# Completion tokens charged up front when a call doesn't set max_tokens
+COMPLETION_ESTIMATE = 500
+
+# Marks "no cache argument" apart from an explicit cache=False
+_DEFAULT = object()
+
+
+def _estimate_request(request):
+    """Prompt plus expected completion tokens for an OpenAI API request"""
+    try:
+        body = json.loads(request.content or b'{}')
+    except ValueError:
+        return COMPLETION_ESTIMATE
+    text = ''.join(str(message.get('content') or '') for message in body.get('messages', []))
+    text += str(body.get('prompt') or body.get('input') or '')
+    return estimate_tokens(text) + (body.get('max_tokens') or COMPLETION_ESTIMATE)
+
+
+def _is_stream(request):
+    return b'"stream":true' in (request.content or b'').replace(b' ', b'')
+
+
+def _retry_after(response):
+    if 'retry-after-ms' in response.headers:
+        return float(response.headers['retry-after-ms']) / 1000
+    try:
+        return float(response.headers.get('retry-after', 0))
+    except ValueError:
+        return 0.0
+
+
+class _RateLimit:
+    """Shared by the sync and async transports"""
+
+    def __init__(self, key, limiter=None):
+        self.key = key
+        self.limiter = limiter
+
+    @property
+    def active(self):
+        return self.limiter or get_limiter()
+
+    def settle(self, request, response, estimate):
+        if response.status_code == 429:
+            self.active.backoff(self.key, _retry_after(response))
+            return
+        if response.status_code >= 400:
+            return
+        self.active.success(self.key)
+        if _is_stream(request):
+            return  # Usage isn't known until the stream is consumed
+        try:
+            usage = json.loads(response.content).get('usage') or {}
+        except ValueError:
+            return
+        self.active.record(self.key, estimate, usage.get('total_tokens'))
+
+
+class RateLimitedTransport(httpx.HTTPTransport):
+    """HTTP transport that spends the limiter's budget on every real API request.
+
+    Limiting at this level counts the OpenAI client's own retries, sees 429
+    responses with their Retry-After headers, and never charges for
+    responses answered from the LLM cache.
+    """
+
+    def __init__(self, key, limiter=None, **kwargs):
+        super().__init__(**kwargs)
+        self.rate_limit = _RateLimit(key, limiter)
+
+    def handle_request(self, request):
+        estimate = _estimate_request(request)
+        self.rate_limit.active.acquire(self.rate_limit.key, estimate)
+        response = super().handle_request(request)
+        if response.status_code < 400 and not _is_stream(request):
+            response.read()
+        self.rate_limit.settle(request, response, estimate)
+        return response
+
+
+class AsyncRateLimitedTransport(httpx.AsyncHTTPTransport):
+    def __init__(self, key, limiter=None, **kwargs):
+        super().__init__(**kwargs)
+        self.rate_limit = _RateLimit(key, limiter)
+
+    async def handle_async_request(self, request):
+        estimate = _estimate_request(request)
+        # Waiting for the bucket must not block the event loop
+        await asyncio.to_thread(self.rate_limit.active.acquire, self.rate_limit.key, estimate)
+        response = await super().handle_async_request(request)
+        if response.status_code < 400 and not _is_stream(request):
+            await response.aread()
+        self.rate_limit.settle(request, response, estimate)
+        return response
+
+
+class CrewLLM(BaseLLM):
+    """crewai LLM that makes every call through a LangChain chat model.
+
+    crewai rebuilds any other LLM object as its own provider client, which
+    drops the LangChain response cache and the rate-limited HTTP client.
+    A BaseLLM is used as-is, so agents' calls keep both.
+    """
+
+    llm_type: str = "langchain"
+
+    def __init__(self, chat_model, model, temperature=None):
+        # Older crewai BaseLLMs are plain classes that only take these two
+        super().__init__(model=model, temperature=temperature)
+        self._chat_model = chat_model
+
+    @property
+    def chat_model(self):
+        return self._chat_model
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None, response_model=None, **kwargs):
+        if isinstance(messages, str):
+            messages = [{'role': 'user', 'content': messages}]
+        # The agent executor sets per-call stop words ("\nObservation:")
+        stop = getattr(self, 'stop_sequences', self.stop) or None
+        message = self.chat_model.invoke(
+            [(message['role'], message['content']) for message in messages], stop=stop
+        )
+        usage = getattr(message, 'usage_metadata', None)
+        if usage and hasattr(self, '_track_token_usage_internal'):
+            self._track_token_usage_internal({
+                'prompt_tokens': usage.get('input_tokens', 0),
+                'completion_tokens': usage.get('output_tokens', 0),
+                'total_tokens': usage.get('total_tokens', 0),
+            })
+        return message.content
+
+
+def create_chat_model(model=DEFAULT_MODEL, temperature=0.7, limiter=None, cache=_DEFAULT, **kwargs):
+    """ChatOpenAI client behind the shared rate limiter and LLM response cache.
+
+    Pass ``cache=False`` to always call the API.
+    """
+    key = f"openai/{model}"
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        api_key=os.getenv('OPENAI_API_KEY'),
+        cache=(get_llm_cache() or False) if cache is _DEFAULT else cache,
+        http_client=httpx.Client(transport=RateLimitedTransport(key, limiter)),
+        http_async_client=httpx.AsyncClient(transport=AsyncRateLimitedTransport(key, limiter)),
+        **kwargs
+    )
+
+
+def create_llm(model=DEFAULT_MODEL, temperature=0.7, limiter=None, cache=_DEFAULT, **kwargs):
+    """LLM for crewai agents, rate limited and cached (see ``create_chat_model``)"""
+    return CrewLLM(
+        create_chat_model(model, temperature, limiter, cache, **kwargs),
+        model=model,
+        temperature=temperature
+    )
+
+
+def limited_search(run, backend, limiter=None):
+    """Search function behind the shared result cache and ``backend``'s rate limit.
+
+    Cache hits never touch the rate limiter.
+    """
+    return cached_search(rate_limited(run, f"{backend}/search", limiter), backend)
+
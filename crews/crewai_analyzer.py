@@ -3,10 +3,11 @@ import sys
 import pendulum
 from pathlib import Path
 from crewai import Agent, Task, Crew
-from langchain_community.tools import DuckDuckGoSearchRun
+from langchain.tools import Tool
 from typing import Optional, Dict, Any
 from dotenv import load_dotenv
 from loguru import logger
+from crews.registry import shared_llm, shared_search, add_log_sink
 import json
 import shutil
 
@@ -27,15 +28,20 @@ class CrewAIAnalyzer:
         load_dotenv(self.root_dir / '.env')
         
         # Setup logging
-        logger.add(
+        add_log_sink(
             self.output_dir / "crewai_analyzer.log",
             rotation="1 day",
             retention="30 days",
             level="INFO"
         )
         
-        # Initialize DuckDuckGo search
-        self.search_tool = DuckDuckGoSearchRun()
+        # DuckDuckGo search and the LLM, rate limited and shared with other crews
+        self.search_tool = Tool(
+            name="duckduckgo_search",
+            func=shared_search("duckduckgo"),
+            description="Search DuckDuckGo. Input should be a search query."
+        )
+        self.llm = shared_llm()
         
         # System info for context
         self.system_info = self.get_system_info()
@@ -78,6 +84,7 @@ class CrewAIAnalyzer:
             goal='Monitor and analyze CrewAI documentation for latest patterns',
             backstory=f"""You are an expert at analyzing CrewAI documentation and 
             identifying best practices and new features. {system_context}""",
+            llm=self.llm,
             tools=[self.search_tool],
             verbose=True
         )
@@ -88,6 +95,7 @@ class CrewAIAnalyzer:
             goal='Design optimal CrewAI implementation patterns',
             backstory=f"""You specialize in designing robust CrewAI implementations
             that follow best practices. {system_context}""",
+            llm=self.llm,
             tools=[self.search_tool],
             verbose=True
         )
@@ -98,6 +106,7 @@ class CrewAIAnalyzer:
             goal='Generate updated CrewAI implementation code',
             backstory=f"""You excel at generating clean, well-documented code that
             implements CrewAI best practices. {system_context}""",
+            llm=self.llm,
             tools=[self.search_tool],
             verbose=True
         )
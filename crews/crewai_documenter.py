@@ -2,10 +2,9 @@ import os
 from pathlib import Path
 from crewai import Agent, Task, Crew, Process
 from langchain.tools import Tool
-from langchain_community.tools import DuckDuckGoSearchRun
-from langchain_community.utilities import SerpAPIWrapper
 from dotenv import load_dotenv
 from loguru import logger
+from crews.registry import shared_llm, shared_search
 
 # Load environment
 root_dir = Path(__file__).parent.parent
@@ -15,9 +14,8 @@ class CrewAIDocumenter:
     """Documents CrewAI capabilities and integrates with our ecosystem"""
     
     def __init__(self):
-        # Initialize search tools
-        self.search = DuckDuckGoSearchRun()
-        self.serp = SerpAPIWrapper()
+        # Initialize search tools and the LLM
+        self.llm = shared_llm()
         
         # Documentation researcher
         self.researcher = Agent(
@@ -28,15 +26,16 @@ class CrewAIDocumenter:
             tools=[
                 Tool(
                     name="Search",
-                    func=self.search.run,
+                    func=shared_search("duckduckgo"),
                     description="Search for CrewAI documentation"
                 ),
                 Tool(
                     name="Deep Search",
-                    func=self.serp.run,
+                    func=shared_search("serpapi"),
                     description="Detailed search of CrewAI capabilities"
                 )
             ],
+            llm=self.llm,
             verbose=True
         )
 
@@ -49,10 +48,11 @@ class CrewAIDocumenter:
             tools=[
                 Tool(
                     name="Search",
-                    func=self.search.run,
+                    func=shared_search("duckduckgo"),
                     description="Research integration patterns"
                 )
             ],
+            llm=self.llm,
             verbose=True
         )
 
@@ -65,10 +65,11 @@ class CrewAIDocumenter:
             tools=[
                 Tool(
                     name="Search",
-                    func=self.search.run,
+                    func=shared_search("duckduckgo"),
                     description="Research documentation best practices"
                 )
             ],
+            llm=self.llm,
             verbose=True
         )
 
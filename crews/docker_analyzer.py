@@ -2,11 +2,10 @@ import os
 from pathlib import Path
 from crewai import Agent, Task, Crew
 from langchain.tools import BaseTool, StructuredTool, Tool
-from langchain_community.tools import DuckDuckGoSearchRun
-from langchain_community.utilities import SerpAPIWrapper
 from typing import Optional
 from dotenv import load_dotenv
 from loguru import logger
+from crews.registry import shared_llm, shared_search
 
 # Load environment
 root_dir = Path(__file__).parent.parent
@@ -17,13 +16,13 @@ class DockerAnalyzer:
     
     def __init__(self):
         # Initialize tools properly
-        self.search = DuckDuckGoSearchRun()
+        self.llm = shared_llm()
         
         # Define tools using proper structure
         self.tools = [
             Tool(
                 name="Web Search",
-                func=self.search.run,
+                func=shared_search("duckduckgo"),
                 description="""Use this tool to search for Docker documentation, 
                 best practices, and configuration examples."""
             )
@@ -35,6 +34,7 @@ class DockerAnalyzer:
             goal='Analyze Docker services and provide best practices',
             backstory="""You are a Docker expert who analyzes container setups 
             and provides detailed configuration advice.""",
+            llm=self.llm,
             tools=self.tools,
             verbose=True,
             allow_delegation=True  # New feature in latest CrewAI
@@ -46,6 +46,7 @@ class DockerAnalyzer:
             goal='Design secure and efficient Docker service integrations',
             backstory="""You specialize in creating robust Docker service 
             architectures with security and performance in mind.""",
+            llm=self.llm,
             tools=self.tools,
             verbose=True,
             allow_delegation=True
@@ -1,13 +1,15 @@
 from crews.base_crew import BaseCrew
+from crews.registry import shared_agent
 from crewai import Agent, Task, Crew
 from loguru import logger
 
 class DockerHubAnalyzer(BaseCrew):
     def __init__(self):
         super().__init__("docker-analysis")
-        
-        # Create Research Agent
-        self.researcher = Agent(
+
+    @property
+    def researcher(self) -> Agent:
+        return shared_agent(('docker-researcher', self.model, self.temperature), lambda: Agent(
             role='Docker Researcher',
             goal='Research Docker images and create visual diagrams',
             backstory="""You are a technical researcher who creates clear
@@ -15,10 +17,11 @@ class DockerHubAnalyzer(BaseCrew):
             llm=self.llm,
             tools=self.tools,
             verbose=True
-        )
+        ))
 
-        # Create Visualization Expert
-        self.visualizer = Agent(
+    @property
+    def visualizer(self) -> Agent:
+        return shared_agent(('docker-visualizer', self.model, self.temperature), lambda: Agent(
             role='Visualization Expert',
             goal='Create clear diagrams of Docker architectures',
             backstory="""You excel at creating Mermaid diagrams to visualize
@@ -26,7 +29,7 @@ class DockerHubAnalyzer(BaseCrew):
             llm=self.llm,
             tools=self.tools,
             verbose=True
-        )
+        ))
 
     def run(self):
         """Run the analysis with visualization"""
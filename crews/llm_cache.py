@@ -0,0 +1,86 @@
+import hashlib
+import json
+import os
+import threading
+import warnings
+from loguru import logger
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+from crews.cache_store import TTLStore
+
+DEFAULT_PATH = 'crews/crew-output/cache/llm_cache.db'
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 20000
+
+
+def cache_key(prompt: str, llm_string: str) -> str:
+    """Hash of the model, its parameters and the prompt"""
+    return hashlib.sha256(f"{llm_string}\0{prompt}".encode()).hexdigest()
+
+
+class LLMCache(BaseCache):
+    """Disk-backed LangChain cache for LLM responses, in SQLite.
+
+    ``llm_string`` (model name and call parameters, as LangChain serialises
+    them) and the prompt are hashed into the key, so changing the model or
+    temperature never returns a stale answer. Expiry, LRU eviction and the
+    hit/miss counters come from ``TTLStore``.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        self.store = TTLStore(path, 'llm_responses', ttl, max_entries)
+
+    def lookup(self, prompt, llm_string):
+        value = self.store.get(cache_key(prompt, llm_string))
+        if value is None:
+            return None
+        try:
+            with warnings.catch_warnings():
+                # loads() is marked beta; these are our own dumps() of generations
+                warnings.simplefilter('ignore')
+                return [loads(generation) for generation in json.loads(value)]
+        except Exception as e:
+            logger.warning(f"Discarding unreadable LLM cache entry: {str(e)}")
+            return None
+
+    def update(self, prompt, llm_string, return_val):
+        try:
+            value = json.dumps([dumps(generation) for generation in return_val])
+        except Exception as e:
+            logger.warning(f"Not caching LLM response: {str(e)}")
+            return
+        self.store.put(cache_key(prompt, llm_string), value, label=llm_string)
+
+    def purge_expired(self):
+        return self.store.purge_expired()
+
+    def clear(self, **kwargs):
+        self.store.clear()
+
+    def stats(self):
+        return self.store.stats()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache():
+    """The process-wide LLM cache, or None when CREW_LLM_CACHE=0.
+
+    CREW_LLM_CACHE may also name the database file; CREW_LLM_CACHE_TTL
+    (seconds) and CREW_LLM_CACHE_MAX_ENTRIES tune expiry and eviction.
+    """
+    global _cache
+    setting = os.getenv('CREW_LLM_CACHE', '1')
+    if setting.lower() in ('0', 'false', 'no', 'off'):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMCache(
+                path=DEFAULT_PATH if setting.lower() in ('1', 'true', 'yes', 'on') else setting,
+                ttl=float(os.getenv('CREW_LLM_CACHE_TTL', DEFAULT_TTL)),
+                max_entries=int(os.getenv('CREW_LLM_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES))
+            )
+            _cache.purge_expired()
+        return _cache
@@ -0,0 +1,247 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from loguru import logger
+
+try:
+    import fcntl
+except ImportError:  # Windows: buckets are shared between threads only
+    fcntl = None
+
+# Per-minute limits by "provider/model"; CREW_RATE_LIMITS (JSON with the same
+# shape) overrides them, e.g. {"openai/gpt-4o": {"rpm": 500, "tpm": 30000}}
+DEFAULT_LIMITS = {
+    'openai/gpt-3.5-turbo': {'rpm': 3500, 'tpm': 160000},
+    'openai/gpt-4o-mini': {'rpm': 500, 'tpm': 200000},
+    'openai/gpt-4o': {'rpm': 500, 'tpm': 30000},
+    'openai/*': {'rpm': 500, 'tpm': 30000},
+    'duckduckgo/search': {'rpm': 20, 'tpm': None},
+    'serpapi/search': {'rpm': 60, 'tpm': None},
+}
+
+# Adaptive backoff: each 429 halves a key's rate (down to MIN_SCALE) and
+# every success wins back RECOVERY of it
+MIN_SCALE = 0.1
+RECOVERY = 0.05
+BASE_BACKOFF = 2.0
+MAX_BACKOFF = 120.0
+
+DEFAULT_SHARED_PATH = 'crews/crew-output/ratelimit/buckets.json'
+
+
+def retry_after(error):
+    """Seconds to wait if ``error`` is a provider rate limit (HTTP 429), else None.
+
+    Honours a Retry-After header when the client exposes the response;
+    returns 0 for a rate limit without one.
+    """
+    status = getattr(error, 'status_code', None) or getattr(getattr(error, 'response', None), 'status_code', None)
+    if status != 429 and 'ratelimit' not in type(error).__name__.lower() \
+            and 'rate limit' not in str(error).lower():
+        return None
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    try:
+        return float(headers.get('retry-after', 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+class _LocalState:
+    """Bucket state shared by the threads of this process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = {}
+
+    @contextmanager
+    def transaction(self):
+        with self._lock:
+            yield self._state
+
+
+class _FileState:
+    """Bucket state in a JSON file, serialised across processes with flock"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def transaction(self):
+        with self._lock, open(self.path.with_suffix('.lock'), 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                try:
+                    state = json.loads(self.path.read_text())
+                except (OSError, ValueError):
+                    state = {}
+                yield state
+                tmp = self.path.with_suffix('.tmp')
+                tmp.write_text(json.dumps(state))
+                os.replace(tmp, self.path)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+class RateLimiter:
+    """Token buckets for requests/min and tokens/min, keyed by "provider/model".
+
+    ``acquire`` blocks until the key has a request and the estimated tokens
+    available. Actual usage reported afterwards corrects the token bucket,
+    so an underestimate is paid back before the next call. A rate-limit
+    response pauses the key (Retry-After, else exponential backoff) and
+    halves its rate until calls succeed again.
+
+    With ``shared_path`` the buckets live in a file locked with ``flock``,
+    so every crew process on the machine draws from the same budget.
+    """
+
+    def __init__(self, limits=None, shared_path=None):
+        self.limits = dict(DEFAULT_LIMITS)
+        self.limits.update(limits or {})
+        if shared_path and fcntl is None:
+            logger.warning("File-shared rate limits need fcntl; limiting per process")
+            shared_path = None
+        self.shared_path = shared_path
+        self._state = _FileState(shared_path) if shared_path else _LocalState()
+
+        self.waited = 0.0
+        self.throttled = 0
+
+    def limits_for(self, key):
+        provider = key.split('/', 1)[0]
+        return self.limits.get(key) or self.limits.get(f"{provider}/*") or {'rpm': None, 'tpm': None}
+
+    def _bucket(self, state, key, now):
+        limits = self.limits_for(key)
+        bucket = state.get(key)
+        if bucket is None:
+            bucket = state[key] = {
+                'requests': limits['rpm'] or 0, 'tokens': limits['tpm'] or 0,
+                'updated': now, 'paused_until': 0.0, 'scale': 1.0, 'strikes': 0,
+            }
+        elapsed = max(0.0, now - bucket['updated'])
+        for name, limit in (('requests', limits['rpm']), ('tokens', limits['tpm'])):
+            if limit:
+                capacity = limit * bucket['scale']
+                bucket[name] = min(capacity, bucket[name] + elapsed * capacity / 60)
+        bucket['updated'] = now
+        return bucket, limits
+
+    def acquire(self, key, tokens=0):
+        """Block until ``key`` may make one request using about ``tokens`` tokens"""
+        started = time.monotonic()
+        while True:
+            with self._state.transaction() as state:
+                now = time.time()
+                bucket, limits = self._bucket(state, key, now)
+                wait = bucket['paused_until'] - now
+                if wait <= 0:
+                    wait = 0.0
+                    needs = (('requests', 1, limits['rpm']), ('tokens', tokens, limits['tpm']))
+                    for name, amount, limit in needs:
+                        if not limit:
+                            continue
+                        # A request larger than the whole bucket waits for a full one
+                        amount = min(amount, limit * bucket['scale'])
+                        if bucket[name] < amount:
+                            wait = max(wait, (amount - bucket[name]) * 60 / (limit * bucket['scale']))
+                    if wait == 0.0:
+                        for name, amount, limit in needs:
+                            if limit:
+                                bucket[name] -= min(amount, limit * bucket['scale'])
+                        break
+            time.sleep(min(wait, 5.0))
+
+        waited = time.monotonic() - started
+        if waited > 0.01:
+            self.waited += waited
+            self.throttled += 1
+            logger.debug(f"Rate limiter held {key} for {waited:.2f}s")
+        return waited
+
+    def record(self, key, estimated, actual):
+        """Correct the token bucket once a call reports its real usage"""
+        if actual is None or not self.limits_for(key)['tpm']:
+            return
+        with self._state.transaction() as state:
+            bucket, _ = self._bucket(state, key, time.time())
+            bucket['tokens'] -= actual - estimated
+
+    def success(self, key):
+        with self._state.transaction() as state:
+            bucket, _ = self._bucket(state, key, time.time())
+            bucket['scale'] = min(1.0, bucket['scale'] + RECOVERY)
+            bucket['strikes'] = 0
+
+    def backoff(self, key, delay=None):
+        """Pause ``key`` after a rate-limit response and halve its rate"""
+        with self._state.transaction() as state:
+            now = time.time()
+            bucket, _ = self._bucket(state, key, now)
+            bucket['strikes'] += 1
+            if not delay:
+                delay = min(BASE_BACKOFF * 2 ** (bucket['strikes'] - 1), MAX_BACKOFF)
+            bucket['paused_until'] = max(bucket['paused_until'], now + delay)
+            bucket['scale'] = max(MIN_SCALE, bucket['scale'] / 2)
+            bucket['requests'] = min(bucket['requests'], 0)
+            bucket['tokens'] = min(bucket['tokens'], 0)
+        logger.warning(f"Rate limited on {key}; pausing {delay:.1f}s and halving its rate")
+
+    def stats(self):
+        return {'throttled': self.throttled, 'waited': round(self.waited, 1)}
+
+
+def rate_limited(func, key, limiter=None, retries=2):
+    """Wrap a tool function so each call waits for ``key``'s bucket.
+
+    Rate-limit errors back the key off and the call is retried (after the
+    pause) up to ``retries`` times.
+    """
+    def call(*args, **kwargs):
+        active = limiter or get_limiter()
+        for attempt in range(retries + 1):
+            active.acquire(key)
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                delay = retry_after(e)
+                if delay is None or attempt == retries:
+                    raise
+                active.backoff(key, delay)
+                continue
+            active.success(key)
+            return result
+
+    call.__name__ = getattr(func, '__name__', 'rate_limited')
+    call.__doc__ = getattr(func, '__doc__', None)
+    return call
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_limiter():
+    """The process-wide limiter.
+
+    Limits come from ``CREW_RATE_LIMITS``; ``CREW_RATE_LIMIT_SHARED=1`` (or a
+    file path) shares the buckets with other processes.
+    """
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            limits = json.loads(os.getenv('CREW_RATE_LIMITS', '{}'))
+            shared = os.getenv('CREW_RATE_LIMIT_SHARED')
+            if shared in ('1', 'true', 'yes'):
+                shared = DEFAULT_SHARED_PATH
+            _limiter = RateLimiter(limits, shared_path=shared or None)
+        return _limiter
@@ -0,0 +1,97 @@
+import threading
+from pathlib import Path
+from loguru import logger
+from langchain.tools import Tool
+from langchain_community.tools import DuckDuckGoSearchRun
+from langchain_community.utilities import SerpAPIWrapper
+from crews.clients import create_llm, limited_search, DEFAULT_MODEL
+
+
+class Registry:
+    """Process-wide store of lazily built, shared crew components.
+
+    ``get`` builds a component the first time its (kind, key) is asked for
+    and returns the same object afterwards, so ten crews using the same
+    model share one LLM client instead of building ten. Components built
+    ``per_thread`` are shared only within a thread: crewai agents keep
+    per-run state, so crews running concurrently on the scheduler's
+    threads each get their own.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._shared = {}
+        self._local = threading.local()
+        self.built = 0
+        self.reused = 0
+
+    def get(self, kind, key, factory, per_thread=False):
+        if per_thread:
+            store = self._local.__dict__.setdefault('components', {})
+        else:
+            store = self._shared
+        with self._lock:
+            component = store.get((kind, key))
+            if component is None:
+                component = store[(kind, key)] = factory()
+                self.built += 1
+                logger.debug(f"Built shared {kind} {key}")
+            else:
+                self.reused += 1
+            return component
+
+    def clear(self):
+        with self._lock:
+            self._shared.clear()
+            self._local = threading.local()
+
+    def stats(self):
+        return {'built': self.built, 'reused': self.reused, 'shared': len(self._shared)}
+
+
+registry = Registry()
+
+# Search clients by backend name; SerpAPI needs SERPAPI_API_KEY when built
+SEARCH_BACKENDS = {
+    'duckduckgo': DuckDuckGoSearchRun,
+    'serpapi': SerpAPIWrapper,
+}
+
+
+def shared_llm(model=None, temperature=0.7, **kwargs):
+    """One rate-limited, cached LLM client per model and parameters"""
+    model = model or DEFAULT_MODEL
+    key = (model, temperature, tuple(sorted(kwargs.items())))
+    return registry.get('llm', key, lambda: create_llm(model=model, temperature=temperature, **kwargs))
+
+
+def shared_search(backend='duckduckgo'):
+    """Cached, rate-limited search function for ``backend``"""
+    return registry.get(
+        'search', backend,
+        lambda: limited_search(registry.get('search-backend', backend, SEARCH_BACKENDS[backend]).run, backend)
+    )
+
+
+def shared_tool(name, description, backend='duckduckgo'):
+    """A LangChain search tool; tools with the same name and description are shared"""
+    return registry.get(
+        'tool', (backend, name, description),
+        lambda: Tool(name=name, func=shared_search(backend), description=description)
+    )
+
+
+def shared_agent(key, factory):
+    """An agent built on first use and reused by later crews on the same thread"""
+    return registry.get('agent', key, factory, per_thread=True)
+
+
+def add_log_sink(path, **options):
+    """Add a loguru file sink once per process, however many crews ask for it.
+
+    Returns the sink id.
+    """
+    def add():
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        return logger.add(path, **options)
+    return registry.get('log-sink', str(path), add)
@@ -1,95 +1,141 @@
 from pathlib import Path
 from loguru import logger
 import asyncio
+import argparse
 from typing import List
 import importlib
 import inspect
 from crews.base_crew import BaseCrew
+from crews.scheduler import CrewScheduler, EXECUTORS, merge_stats
+from crews.llm_cache import get_llm_cache
+from crews.search_cache import get_search_cache
+from crews.rate_limit import get_limiter
+from crews.registry import registry, add_log_sink
 from datetime import datetime
 
+def usage_stats():
+    """Cache, rate-limit and registry counters for this process"""
+    stats = {}
+    cache = get_llm_cache()
+    if cache is not None:
+        llm = cache.stats()
+        stats.update(llm_hits=llm['hits'], llm_misses=llm['misses'])
+    search = get_search_cache()
+    if search is not None:
+        found = search.stats()
+        stats.update(search_hits=found['hits'], search_coalesced=found['coalesced'],
+                     searches=found['searches'])
+    limits = get_limiter().stats()
+    stats.update(throttled=limits['throttled'], waited=limits['waited'])
+    shared = registry.stats()
+    stats.update(built=shared['built'], reused=shared['reused'])
+    return stats
+
 class CrewRunner:
     def __init__(self):
         self.output_dir = Path("crews/crew-output/runs")
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
         # Configure logging
-        logger.add(
+        add_log_sink(
             self.output_dir / "crew_runner_{time}.log",
             rotation="500 MB",
             level="INFO"
         )
 
-    async def run_crew_with_delay(self, crew: BaseCrew, delay: int = 30):
-        """Run a single crew with delay and monitoring"""
-        try:
-            start_time = datetime.now()
-            crew_name = crew.__class__.__name__
-            
-            logger.info(f"Starting {crew_name} at {start_time}")
-            
-            # Run the crew
-            result = await crew.run()
-            
-            # Calculate runtime
-            end_time = datetime.now()
-            runtime = end_time - start_time
-            
-            # Log completion
-            logger.success(f"""
-                Crew: {crew_name}
-                Runtime: {runtime}
-                Completed at: {end_time}
-            """)
-            
-            # Add delay before next crew
-            logger.info(f"Waiting {delay} seconds before next crew...")
-            await asyncio.sleep(delay)
-            
-            return result
+    def discover_crews(self) -> List[type]:
+        """Crew classes defined in crews/*_crew.py"""
+        crews_dir = Path(__file__).parent
+        crews = []
+        for file in sorted(crews_dir.glob("*_crew.py")):
+            if file.stem == "base_crew":
+                continue
+                
+            # Import the module using absolute import
+            module_name = f"crews.{file.stem}"
+            module = importlib.import_module(module_name)
             
-        except Exception as e:
-            logger.error(f"Failed to run {crew.__class__.__name__}: {str(e)}")
-            raise
+            # Find crew class in module
+            for name, obj in inspect.getmembers(module):
+                if (inspect.isclass(obj) and 
+                    issubclass(obj, BaseCrew) and 
+                    obj != BaseCrew):
+                    crews.append(obj)
+                    break
+        return crews
 
-    async def run_all_crews(self, delay_between_crews: int = 30):
-        """Run all crews with delay between each"""
+    async def run_all_crews(self, max_in_flight: int = 3, executor: str = 'thread',
+                            start_interval: float = 1.0):
+        """Run all crews concurrently, at most ``max_in_flight`` at a time"""
         try:
-            # Get all crew files
-            crews_dir = Path(__file__).parent
-            crew_files = crews_dir.glob("*_crew.py")
-            
-            # Load all crew classes
-            crews = []
-            for file in crew_files:
-                if file.stem == "base_crew":
-                    continue
-                    
-                # Import the module using absolute import
-                module_name = f"crews.{file.stem}"
-                module = importlib.import_module(module_name)
-                
-                # Find crew class in module
-                for name, obj in inspect.getmembers(module):
-                    if (inspect.isclass(obj) and 
-                        issubclass(obj, BaseCrew) and 
-                        obj != BaseCrew):
-                        crews.append(obj())
-                        break
-            
-            logger.info(f"Found {len(crews)} crews to run")
+            crews = self.discover_crews()
+            logger.info(f"Found {len(crews)} crews to run ({max_in_flight} at a time, {executor} pool)")
             
-            # Run each crew with delay
-            for i, crew in enumerate(crews, 1):
-                logger.info(f"Running crew {i} of {len(crews)}: {crew.__class__.__name__}")
-                await self.run_crew_with_delay(crew, delay_between_crews)
+            # Crews are built and run in the pool, so a slow constructor or a
+            # blocking run() never stalls the others
+            scheduler = CrewScheduler(
+                max_in_flight=max_in_flight,
+                executor=executor,
+                start_interval=start_interval,
+                stats=usage_stats
+            )
+            started = datetime.now()
+            results = await scheduler.run(crews)
             
-            logger.success("All crews completed")
+            self.log_summary(results, datetime.now() - started)
+            failed = [r['crew'] for r in results if r['status'] != 'completed']
+            if failed:
+                logger.warning(f"{len(failed)} crews failed: {', '.join(failed)}")
+            else:
+                logger.success("All crews completed")
+            return results
             
         except Exception as e:
             logger.error(f"Failed to run crews: {str(e)}")
             raise
 
-if __name__ == "__main__":
+    def log_summary(self, results, wall_time):
+        lines = [f"Run summary ({len(results)} crews, wall time {wall_time}):"]
+        for r in results:
+            line = f"  {r['crew']}: {r['status']} in {r['runtime']:.1f}s"
+            if r['attempts'] > 1:
+                line += f" after {r['attempts']} attempts"
+            if r['error']:
+                line += f" ({r['error']})"
+            lines.append(line)
+        # Process workers report their own counters; threads share ours
+        stats = merge_stats(results) or usage_stats()
+        if 'llm_hits' in stats:
+            lookups = stats['llm_hits'] + stats['llm_misses']
+            lines.append(
+                f"  LLM cache: {stats['llm_hits']} hits, {stats['llm_misses']} misses "
+                f"({stats['llm_hits'] / lookups if lookups else 0:.0%}), "
+                f"{get_llm_cache().stats()['entries']} entries"
+            )
+        if 'search_hits' in stats:
+            lookups = stats['search_hits'] + stats['search_coalesced'] + stats['searches']
+            served = stats['search_hits'] + stats['search_coalesced']
+            lines.append(
+                f"  Search cache: {stats['search_hits']} hits, {stats['search_coalesced']} coalesced, "
+                f"{stats['searches']} searches ({served / lookups if lookups else 0:.0%} served without a search)"
+            )
+        lines.append(f"  Rate limiter: {stats['throttled']} calls held for {round(stats['waited'], 1)}s")
+        lines.append(f"  Shared components: {stats['built']} built, {stats['reused']} reused")
+        logger.info('\n'.join(lines))
+
+def main():
+    parser = argparse.ArgumentParser(description="Run every crew in crews/*_crew.py")
+    parser.add_argument('--max-in-flight', type=int, default=3, help='Crews running at once')
+    parser.add_argument('--executor', choices=EXECUTORS, default='thread', help='Worker pool type')
+    parser.add_argument('--start-interval', type=float, default=1.0, help='Minimum seconds between crew starts')
+    args = parser.parse_args()
+    
     runner = CrewRunner()
-    # Run with 30 second delay between crews
-    asyncio.run(runner.run_all_crews(delay_between_crews=30)) 
\ No newline at end of file
+    asyncio.run(runner.run_all_crews(
+        max_in_flight=args.max_in_flight,
+        executor=args.executor,
+        start_interval=args.start_interval
+    ))
+
+if __name__ == "__main__":
+    main()
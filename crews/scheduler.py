@@ -0,0 +1,147 @@
+import asyncio
+import inspect
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from datetime import datetime
+from loguru import logger
+from crews.rate_limit import retry_after
+
+EXECUTORS = ('thread', 'process')
+
+
+def crew_name(crew) -> str:
+    return crew.__name__ if inspect.isclass(crew) else crew.__class__.__name__
+
+
+def run_crew(crew, stats=None):
+    """Build (if given a class) and run one crew in a pool worker.
+
+    Crews are usually synchronous and block for minutes on LLM calls, so
+    they never run on the event loop. An async ``run`` gets its own loop in
+    the worker. Returns ``(result, counters)``: with a ``stats`` callable,
+    how much each of its counters grew while this crew ran.
+    """
+    before = stats() if stats else None
+    if inspect.isclass(crew):
+        crew = crew()
+    result = crew.run()
+    if inspect.isawaitable(result):
+        result = asyncio.run(result)
+    if stats is None:
+        return result, None
+    after = stats()
+    return result, {key: after[key] - before.get(key, 0) for key in after}
+
+
+def merge_stats(results):
+    """Sum the per-crew counters of scheduler results (None if none carry any)"""
+    counters = [r['stats'] for r in results if r.get('stats')]
+    if not counters:
+        return None
+    totals = {}
+    for stats in counters:
+        for key, value in stats.items():
+            totals[key] = totals.get(key, 0) + value
+    return totals
+
+
+class CrewScheduler:
+    """Runs independent crews concurrently on a bounded worker pool.
+
+    At most ``max_in_flight`` crews run at once. Starts are spaced at least
+    ``start_interval`` seconds apart so a batch doesn't hit the LLM provider
+    in the same instant. A crew that fails on a rate limit is retried up to
+    ``max_retries`` times; the backoff (Retry-After, else exponential from
+    ``backoff``) also pauses every crew that hasn't started yet, instead of
+    sleeping a fixed time after each crew.
+
+    ``executor='process'`` runs crews in separate processes; crews must
+    then be passed as classes, which are built in the worker. Counters
+    such as cache hits live in those processes, so ``stats`` (a picklable
+    callable returning a dict of counters) is sampled in the worker around
+    each crew and the difference is returned in the result's ``stats``.
+    """
+
+    def __init__(self, max_in_flight=3, executor='thread', start_interval=1.0,
+                 max_retries=2, backoff=30.0, max_backoff=300.0, stats=None):
+        if executor not in EXECUTORS:
+            raise ValueError(f"Unknown executor: {executor}")
+        self.max_in_flight = max_in_flight
+        self.executor = executor
+        self.start_interval = start_interval
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        # Threads share this process's counters, which the caller can read directly
+        self.stats = stats if executor == 'process' else None
+
+        self._pool = None
+        self._slots = None
+        self._pace_lock = None
+        self._next_start = 0.0
+        self._paused_until = 0.0
+
+    async def run(self, crews):
+        """Run ``crews`` (classes or instances); returns one result dict per crew, in order"""
+        if self.executor == 'process' and not all(inspect.isclass(crew) for crew in crews):
+            raise ValueError("The process executor needs crew classes, not instances")
+        pool_type = ProcessPoolExecutor if self.executor == 'process' else ThreadPoolExecutor
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._pace_lock = asyncio.Lock()
+        with pool_type(max_workers=self.max_in_flight) as self._pool:
+            results = await asyncio.gather(*(self._run_one(crew) for crew in crews))
+        self._pool = None
+        return results
+
+    async def _pace(self):
+        """Wait for this crew's start slot, honouring any rate-limit pause"""
+        async with self._pace_lock:
+            while True:
+                wait = max(self._next_start, self._paused_until) - time.monotonic()
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+            self._next_start = time.monotonic() + self.start_interval
+
+    async def _run_one(self, crew):
+        name = crew_name(crew)
+        loop = asyncio.get_running_loop()
+        attempts = 0
+        started = None
+        while True:
+            attempts += 1
+            async with self._slots:
+                await self._pace()
+                started = started or time.monotonic()
+                logger.info(f"Starting {name} at {datetime.now()} (attempt {attempts})")
+                try:
+                    result, stats = await loop.run_in_executor(self._pool, run_crew, crew, self.stats)
+                except Exception as e:
+                    delay = retry_after(e)
+                    if delay is None or attempts > self.max_retries:
+                        logger.error(f"Failed to run {name}: {str(e)}")
+                        return self._result(name, 'failed', started, attempts, error=str(e))
+                    delay = min(max(delay, self.backoff * 2 ** (attempts - 1)), self.max_backoff)
+                    self._paused_until = max(self._paused_until, time.monotonic() + delay)
+                    logger.warning(f"{name} hit a rate limit; pausing crew starts for {delay:.0f}s")
+                    continue
+
+            runtime = time.monotonic() - started
+            logger.success(f"""
+                Crew: {name}
+                Runtime: {runtime:.1f}s
+                Completed at: {datetime.now()}
+            """)
+            return self._result(name, 'completed', started, attempts, result=result, stats=stats)
+
+    @staticmethod
+    def _result(name, status, started, attempts, result=None, error=None, stats=None):
+        return {
+            'crew': name,
+            'status': status,
+            'runtime': time.monotonic() - started,
+            'attempts': attempts,
+            'result': result,
+            'error': error,
+            'stats': stats,
+        }
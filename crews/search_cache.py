@@ -0,0 +1,114 @@
+import hashlib
+import os
+import threading
+from concurrent.futures import Future
+from loguru import logger
+from crews.cache_store import TTLStore
+
+DEFAULT_PATH = 'crews/crew-output/cache/search_cache.db'
+DEFAULT_TTL = 24 * 3600
+DEFAULT_MAX_ENTRIES = 5000
+
+
+def normalize_query(query: str) -> str:
+    """Case, whitespace and surrounding quotes/punctuation don't change results"""
+    return ' '.join(str(query).lower().split()).strip(' "\'.,;:!?')
+
+
+class SearchCache:
+    """Shared cache for web search results (DuckDuckGo, SerpAPI).
+
+    Results are keyed by backend and normalised query and kept in SQLite
+    for ``ttl`` seconds, bounded by ``max_entries`` with LRU eviction, so
+    repeated research is answered locally within a run and across runs.
+    Concurrent callers asking for the same uncached query wait for one
+    outbound search instead of each making their own. Errors are never
+    cached.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        self.store = TTLStore(path, 'search_results', ttl, max_entries)
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self.coalesced = 0
+
+    def search(self, backend, query, run):
+        """Cached result of ``run(query)`` for ``backend``"""
+        normalized = normalize_query(query)
+        key = hashlib.sha256(f"{backend}\0{normalized}".encode()).hexdigest()
+        with self._lock:
+            cached = self.store.get(key)
+            if cached is not None:
+                return cached
+            pending = self._inflight.get(key)
+            if pending is None:
+                pending = self._inflight[key] = Future()
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+        if not leader:
+            return pending.result()
+
+        try:
+            result = run(query)
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        else:
+            if isinstance(result, str):
+                self.store.put(key, result, label=f"{backend}: {normalized}")
+            pending.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def stats(self):
+        """Hit rate counts coalesced callers too: neither made an outbound search"""
+        stats = self.store.stats()
+        lookups = stats['hits'] + stats['misses']
+        stats['coalesced'] = self.coalesced
+        stats['searches'] = stats['misses'] - self.coalesced
+        stats['hit_rate'] = (stats['hits'] + self.coalesced) / lookups if lookups else 0.0
+        return stats
+
+
+def cached_search(run, backend, cache=None):
+    """Wrap a search function (``DuckDuckGoSearchRun().run``, ``SerpAPIWrapper().run``)"""
+    def search(query, *args, **kwargs):
+        active = cache or get_search_cache()
+        if active is None or args or kwargs:
+            return run(query, *args, **kwargs)
+        return active.search(backend, query, run)
+
+    search.__name__ = getattr(run, '__name__', 'search')
+    search.__doc__ = getattr(run, '__doc__', None)
+    return search
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_search_cache():
+    """The process-wide search cache, or None when CREW_SEARCH_CACHE=0.
+
+    CREW_SEARCH_CACHE may also name the database file; CREW_SEARCH_CACHE_TTL
+    (seconds) and CREW_SEARCH_CACHE_MAX_ENTRIES tune expiry and eviction.
+    """
+    global _cache
+    setting = os.getenv('CREW_SEARCH_CACHE', '1')
+    if setting.lower() in ('0', 'false', 'no', 'off'):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = SearchCache(
+                path=DEFAULT_PATH if setting.lower() in ('1', 'true', 'yes', 'on') else setting,
+                ttl=float(os.getenv('CREW_SEARCH_CACHE_TTL', DEFAULT_TTL)),
+                max_entries=int(os.getenv('CREW_SEARCH_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES))
+            )
+            removed = _cache.store.purge_expired()
+            if removed:
+                logger.debug(f"Purged {removed} expired search results")
+        return _cache
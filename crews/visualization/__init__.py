@@ -1,6 +1,15 @@
 """
 Visualization server and utilities
 """
-from .server import app
+import importlib
 
-__all__ = ['app'] 
\ No newline at end of file
+__all__ = ['app']
+
+
+def __getattr__(name):
+    # The crew visualization server needs crewai; the dev docs server doesn't
+    if name == 'app':
+        value = importlib.import_module('.server', __name__).app
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,30 +1,81 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request, Depends
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from pathlib import Path
 from loguru import logger
-import markdown
 import uvicorn
 from jinja2 import Template
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import select, or_, and_
+from sqlalchemy.orm import sessionmaker, Session
 import json
+import base64
+from datetime import datetime
+from contextlib import asynccontextmanager
+from typing import Optional
 from timeline.models import TimelineEvent
+from timeline.db import create_timeline_engine
+from timeline.search import search_events, highlight, SearchUnavailable
+from timeline.partitions import iter_sources, add_months
+from crews.visualization.doc_cache import DocCache, watch_docs
+from crews.visualization.http_cache import conditional_html, add_compression
+from crews.visualization.log_tail import read_tail, follow, sse_event
+from crews.visualization.metrics import MetricsSampler
+import html
+import os
 from fastapi.middleware.cors import CORSMiddleware
 import sys
-from timeline.logs.config import setup_logging
-import requests
-import psutil
+from timeline.log_config import setup_logging
 
 # Setup logging
 setup_logging("dev_docs")
 
+TIMELINE_DB = Path("timeline/data/timeline.db")
+LOGS_DIR = Path("timeline/logs")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the timeline engine, metrics sampler and doc watcher for the life of the server"""
+    engine = create_timeline_engine(f'sqlite:///{TIMELINE_DB}')
+    app.state.timeline_engine = engine
+    app.state.timeline_sessions = sessionmaker(bind=engine, expire_on_commit=False)
+    logger.info(f"Opened timeline database pool for {TIMELINE_DB}")
+    
+    # Dashboard stats are sampled in the background, never per request
+    app.state.metrics = MetricsSampler(app.state.timeline_sessions, TIMELINE_DB, LOGS_DIR)
+    app.state.metrics.start()
+    
+    # Keep rendered docs cached and invalidate them as DEV-MAN changes
+    try:
+        docs_observer = watch_docs(doc_cache)
+    except Exception as e:
+        logger.warning(f"Doc watcher unavailable, validating cache by mtime: {str(e)}")
+        docs_observer = None
+    try:
+        yield
+    finally:
+        await app.state.metrics.stop()
+        if docs_observer is not None:
+            docs_observer.stop()
+            docs_observer.join()
+            doc_cache.watching = False
+        engine.dispose()
+        logger.info("Closed timeline database pool")
+
+def get_db(request: Request):
+    """FastAPI dependency yielding a timeline session that is always closed"""
+    session = request.app.state.timeline_sessions()
+    try:
+        yield session
+    finally:
+        session.close()
+
 # Create FastAPI app with /dev prefix
 app = FastAPI(
     title="Development Documentation",
     docs_url="/dev/docs",
     openapi_url="/dev/openapi.json",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -36,7 +87,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Mount static files under /dev prefix
+# Compress pages, JSON and static files (brotli when available, else gzip)
+add_compression(app)
+
+# Mount static files under /dev prefix (StaticFiles sends its own ETag/Last-Modified)
 app.mount("/dev/static", StaticFiles(directory="DEV-MAN"), name="static")
 app.mount("/dev/diagrams", StaticFiles(directory="DEV-MAN/diagrams"), name="diagrams")
 
@@ -166,21 +220,15 @@ PAGE_TEMPLATE = """
 </html>
 """
 
+# Compiled once; every page renders through this
+PAGE = Template(PAGE_TEMPLATE)
+
+DOCS_ROOT = Path("DEV-MAN")
+doc_cache = DocCache(DOCS_ROOT)
+
 def get_documentation_tree():
     """Get all documentation files"""
-    dev_man = Path("DEV-MAN")
-    docs = []
-    
-    # Get all markdown files
-    for md_file in dev_man.rglob("*.md"):
-        if md_file.is_file():
-            docs.append({
-                'path': md_file,
-                'relative_path': md_file.relative_to(dev_man),
-                'title': md_file.stem.replace('_', ' ').title()
-            })
-    
-    return docs
+    return doc_cache.tree()
 
 def build_navigation(docs):
     """Build navigation HTML"""
@@ -190,11 +238,17 @@ def build_navigation(docs):
     nav.append('</ul>')
     return '\n'.join(nav)
 
+def docs_navigation():
+    """Cached sidebar for the full documentation tree"""
+    return doc_cache.navigation(build_navigation)
+
 @app.get("/dev", response_class=HTMLResponse)
-async def index():
+async def index(request: Request):
     """Main documentation page"""
+    return conditional_html(request, doc_cache.page("index", [], render_index))
+
+def render_index():
     docs = get_documentation_tree()
-    template = Template(PAGE_TEMPLATE)
     
     # Count different types of docs
     doc_counts = {
@@ -270,153 +324,319 @@ async def index():
     </div>
     """
     
-    return template.render(
+    return PAGE.render(
         title="Development Documentation",
-        navigation=build_navigation(docs),
+        navigation=docs_navigation(),
         content=content
     )
 
 @app.get("/dev/docs/{path:path}", response_class=HTMLResponse)
-async def get_doc(path: str):
+async def get_doc(request: Request, path: str):
     """Get specific documentation page"""
     try:
-        file_path = Path("DEV-MAN") / path
-        if not file_path.exists():
+        file_path = Path(os.path.normpath(DOCS_ROOT / path))
+        if DOCS_ROOT not in file_path.parents or not file_path.is_file():
             raise HTTPException(status_code=404, detail="Document not found")
-            
-        # Read and convert markdown
-        content = file_path.read_text()
-        html_content = markdown.markdown(
-            content,
-            extensions=['fenced_code', 'tables', 'toc']
-        )
         
-        # Get all docs for navigation
-        docs = get_documentation_tree()
-        template = Template(PAGE_TEMPLATE)
-        
-        return template.render(
-            title=file_path.stem.replace('_', ' ').title(),
-            navigation=build_navigation(docs),
-            content=html_content
-        )
+        page = doc_cache.page(str(file_path), [file_path], lambda: render_doc(file_path))
+        return conditional_html(request, page)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to serve document: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def render_doc(file_path: Path):
+    # Deferred: only rendering a page needs markdown, and pages are cached
+    import markdown
+    # Read and convert markdown
+    content = file_path.read_text()
+    html_content = markdown.markdown(
+        content,
+        extensions=['fenced_code', 'tables', 'toc']
+    )
+    
+    return PAGE.render(
+        title=file_path.stem.replace('_', ' ').title(),
+        navigation=docs_navigation(),
+        content=html_content
+    )
+
 @app.get("/dev/diagrams", response_class=HTMLResponse)
-async def view_diagrams():
+async def view_diagrams(request: Request):
     """View all diagrams"""
     try:
-        diagrams_dir = Path("DEV-MAN/diagrams")
-        template = Template(PAGE_TEMPLATE)
-        
-        # Get all diagrams
-        diagrams_content = []
-        for file in diagrams_dir.glob("*.md"):
-            if "viewer" not in file.name:
-                content = file.read_text()
-                if "```mermaid" in content:
-                    diagrams_content.append({
-                        'title': file.stem.replace('_', ' ').title(),
-                        'content': content
-                    })
-        
-        # Build content
-        content = ['<div class="diagrams">']
-        for diagram in diagrams_content:
-            content.append(f'''
-                <div class="diagram-container">
-                    <h3>{diagram['title']}</h3>
-                    {diagram['content']}
-                </div>
-            ''')
-        content.append('</div>')
-        
-        docs = get_documentation_tree()
-        return template.render(
-            title="Project Diagrams",
-            navigation=build_navigation(docs),
-            content='\n'.join(content)
+        diagrams = sorted(
+            file for file in (DOCS_ROOT / "diagrams").glob("*.md")
+            if "viewer" not in file.name
         )
+        page = doc_cache.page("diagrams", diagrams, lambda: render_diagrams(diagrams))
+        return conditional_html(request, page)
         
     except Exception as e:
         logger.error(f"Failed to generate diagrams: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/dev/timeline", response_class=HTMLResponse)
-async def timeline_feed():
-    """View activity timeline feed"""
+def render_diagrams(diagram_files):
+    # Get all diagrams
+    diagrams_content = []
+    for file in diagram_files:
+        content = file.read_text()
+        if "```mermaid" in content:
+            diagrams_content.append({
+                'title': file.stem.replace('_', ' ').title(),
+                'content': content
+            })
+    
+    # Build content
+    content = ['<div class="diagrams">']
+    for diagram in diagrams_content:
+        content.append(f'''
+            <div class="diagram-container">
+                <h3>{diagram['title']}</h3>
+                {diagram['content']}
+            </div>
+        ''')
+    content.append('</div>')
+    
+    return PAGE.render(
+        title="Project Diagrams",
+        navigation=docs_navigation(),
+        content='\n'.join(content)
+    )
+
+# Columns returned by the timeline API unless content is requested
+TIMELINE_SUMMARY_COLUMNS = [
+    TimelineEvent.id,
+    TimelineEvent.timestamp,
+    TimelineEvent.event_type,
+    TimelineEvent.source,
+    TimelineEvent.action,
+    TimelineEvent.details,
+    TimelineEvent.cursor_event_type,
+    TimelineEvent.content_digest,
+]
+TIMELINE_CONTENT_COLUMNS = [
+    TimelineEvent.content,
+    TimelineEvent.user_input,
+    TimelineEvent.ai_response,
+]
+
+def encode_cursor(timestamp: datetime, event_id: int) -> str:
+    """Opaque keyset cursor for the last event on a page"""
+    raw = f"{timestamp.isoformat()}|{event_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+def decode_cursor(cursor: str):
     try:
-        db_path = Path("timeline/data/timeline.db")
-        if not db_path.exists():
-            logger.error(f"Database not found at {db_path}")
-            return template.render(
-                title="Activity Timeline",
-                navigation=build_navigation([]),
-                content="<div class='alert alert-danger'>Database not found. Please run timeline watch first.</div>"
-            )
-            
-        engine = create_engine(f'sqlite:///{db_path}')
-        Session = sessionmaker(bind=engine)
-        session = Session()
-        
-        # Get recent events
-        events = session.query(TimelineEvent)\
-            .order_by(TimelineEvent.timestamp.desc())\
-            .limit(50)\
-            .all()
-            
-        template = Template(PAGE_TEMPLATE)
-        
-        if not events:
-            return template.render(
-                title="Activity Timeline",
-                navigation=build_navigation([]),
-                content="<div class='alert alert-info'>No events recorded yet. Start making changes to see them here!</div>"
-            )
-            
-        # Build timeline feed content
-        content = ['<div class="timeline-feed">']
-        for event in events:
-            # Create card for each event
-            content.append(f'''
-                <div class="card mb-3">
-                    <div class="card-header">
-                        <i class="bi bi-clock"></i> {event.timestamp.strftime('%Y-%m-%d %H:%M:%S')}
-                        <span class="badge bg-primary">{event.event_type}</span>
-                    </div>
-                    <div class="card-body">
-                        <h5 class="card-title">{event.source}</h5>
-                        <h6 class="card-subtitle mb-2 text-muted">{event.action}</h6>
-                        
-                        {f'<pre class="code-preview">{event.content[:200]}...</pre>' if event.content else ''}
-                        
-                        {f'<div class="details mt-2"><small>{json.dumps(event.details, indent=2)}</small></div>' if event.details else ''}
-                        
-                        {f'<div class="ai-interaction mt-2"><strong>AI Response:</strong><br>{event.ai_response[:200]}...</div>' if event.ai_response else ''}
-                    </div>
-                </div>
-            ''')
-        content.append('</div>')
-        
-        return template.render(
-            title="Activity Timeline",
-            navigation=build_navigation([]),
-            content='\n'.join(content)
-        )
-        
-    except Exception as e:
-        logger.error(f"Failed to generate timeline: {str(e)}")
-        return template.render(
-            title="Activity Timeline",
-            navigation=build_navigation([]),
-            content=f"<div class='alert alert-danger'>Error: {str(e)}</div>"
+        timestamp, event_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(timestamp), int(event_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def query_timeline(session, limit=50, cursor=None, event_type=None, source=None,
+                   since=None, until=None, include_content=False):
+    """One page of events, newest first, using (timestamp, id) keyset pagination.
+
+    Pages continue from the main database into the monthly archives left
+    by `timeline compact`; archives wholly older than a full page are
+    never opened.
+    """
+    columns = TIMELINE_SUMMARY_COLUMNS + (TIMELINE_CONTENT_COLUMNS if include_content else [])
+    query = select(*columns)
+    if event_type:
+        query = query.where(TimelineEvent.event_type == event_type)
+    if source:
+        query = query.where(TimelineEvent.source.like(f"%{source}%"))
+    if since:
+        query = query.where(TimelineEvent.timestamp >= since)
+    if until:
+        query = query.where(TimelineEvent.timestamp < until)
+    archive_until = until
+    if cursor:
+        timestamp, event_id = decode_cursor(cursor)
+        query = query.where(or_(
+            TimelineEvent.timestamp < timestamp,
+            and_(TimelineEvent.timestamp == timestamp, TimelineEvent.id < event_id)
+        ))
+        archive_until = min(until, timestamp) if until else timestamp
+    query = query.order_by(TimelineEvent.timestamp.desc(), TimelineEvent.id.desc())\
+        .limit(limit + 1)
+
+    rows = []
+    sources = iter_sources(session, since, archive_until, newest_first=True)
+    try:
+        for month, source_session in sources:
+            # Archives hold whole months, so once a full page is newer than
+            # this month's end no older archive can contribute
+            if month is not None and len(rows) > limit and rows[limit].timestamp is not None \
+                    and rows[limit].timestamp >= add_months(month, 1):
+                break
+            rows.extend(source_session.execute(query).all())
+            rows.sort(key=lambda row: (row.timestamp or datetime.min, row.id), reverse=True)
+            rows = rows[:limit + 1]
+    finally:
+        sources.close()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    events = []
+    for row in rows:
+        event = dict(row._mapping)
+        event['timestamp'] = event['timestamp'].isoformat() if event['timestamp'] else None
+        if event['cursor_event_type'] is not None:
+            event['cursor_event_type'] = event['cursor_event_type'].value
+        events.append(event)
+
+    next_cursor = None
+    if has_more and rows:
+        next_cursor = encode_cursor(rows[-1].timestamp, rows[-1].id)
+    return {'events': events, 'next_cursor': next_cursor}
+
+@app.get("/dev/api/timeline")
+def timeline_api(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    type: Optional[str] = None,
+    source: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    include_content: bool = False,
+    session: Session = Depends(get_db),
+):
+    """Timeline events as JSON, paginated with an opaque `next_cursor`"""
+    if not TIMELINE_DB.exists():
+        raise HTTPException(status_code=404, detail="Database not found. Please run timeline watch first.")
+    # Rows are already JSON-safe; skip FastAPI's per-field jsonable_encoder pass
+    return JSONResponse(query_timeline(
+        session, limit=limit, cursor=cursor, event_type=type, source=source,
+        since=since, until=until, include_content=include_content
+    ))
+
+@app.get("/dev/api/timeline/search")
+def timeline_search_api(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=200),
+    type: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    raw: bool = False,
+    session: Session = Depends(get_db),
+):
+    """Full-text search ranked by bm25, with matches wrapped in <mark> in `snippet_html`"""
+    if not TIMELINE_DB.exists():
+        raise HTTPException(status_code=404, detail="Database not found. Please run timeline watch first.")
+    try:
+        results = search_events(
+            session, q, limit=limit, event_type=type,
+            since=since, until=until, raw=raw
         )
+    except SearchUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    for result in results:
+        result['timestamp'] = result['timestamp'].isoformat() if result['timestamp'] else None
+        result['snippet_html'] = highlight(result.pop('snippet') or '', '<mark>', '</mark>', escape=html.escape)
+    return JSONResponse({'query': q, 'results': results})
+
+TIMELINE_FEED = """
+<div class="timeline-feed">
+    <form id="timeline-filters" class="row g-2 mb-3">
+        <div class="col"><input class="form-control" name="type" placeholder="Type"></div>
+        <div class="col"><input class="form-control" name="source" placeholder="Source"></div>
+        <div class="col"><input class="form-control" type="datetime-local" name="since" title="Since"></div>
+        <div class="col"><input class="form-control" type="datetime-local" name="until" title="Until"></div>
+        <div class="col-auto"><button class="btn btn-primary" type="submit">Filter</button></div>
+    </form>
+    <div id="timeline-events"></div>
+    <div id="timeline-sentinel" class="text-center text-muted p-3">Loading...</div>
+</div>
+<script>
+(function() {
+    const list = document.getElementById('timeline-events');
+    const sentinel = document.getElementById('timeline-sentinel');
+    const form = document.getElementById('timeline-filters');
+    let cursor = null, done = false, loading = false;
+
+    function element(tag, className, text) {
+        const el = document.createElement(tag);
+        if (className) el.className = className;
+        if (text !== undefined && text !== null) el.textContent = text;
+        return el;
+    }
+
+    function renderEvent(event) {
+        const card = element('div', 'card mb-3');
+        const header = element('div', 'card-header');
+        header.append(element('i', 'bi bi-clock'), ' ' + (event.timestamp || '').replace('T', ' ').slice(0, 19));
+        header.append(element('span', 'badge bg-primary', event.event_type));
+        const body = element('div', 'card-body');
+        body.append(element('h5', 'card-title', event.source));
+        body.append(element('h6', 'card-subtitle mb-2 text-muted', event.action));
+        if (event.content) body.append(element('pre', 'code-preview', event.content.slice(0, 2000)));
+        if (event.details) body.append(element('div', 'details mt-2', JSON.stringify(event.details)));
+        if (event.ai_response) {
+            const ai = element('div', 'ai-interaction mt-2');
+            ai.append(element('strong', null, 'AI Response:'), element('div', null, event.ai_response.slice(0, 200)));
+            body.append(ai);
+        }
+        card.append(header, body);
+        return card;
+    }
+
+    async function loadMore() {
+        if (loading || done) return;
+        loading = true;
+        const params = new URLSearchParams({limit: 50, include_content: true});
+        for (const [key, value] of new FormData(form)) if (value) params.set(key, value);
+        if (cursor) params.set('cursor', cursor);
+        try {
+            const response = await fetch('/dev/api/timeline?' + params);
+            if (!response.ok) throw new Error((await response.json()).detail || response.statusText);
+            const page = await response.json();
+            page.events.forEach(event => list.append(renderEvent(event)));
+            cursor = page.next_cursor;
+            done = !cursor;
+            if (done) sentinel.textContent = list.children.length ? 'No more events' : 'No events recorded yet. Start making changes to see them here!';
+        } catch (error) {
+            done = true;
+            sentinel.className = 'alert alert-danger';
+            sentinel.textContent = 'Error: ' + error.message;
+        } finally {
+            loading = false;
+        }
+    }
+
+    form.addEventListener('submit', event => {
+        event.preventDefault();
+        list.replaceChildren();
+        cursor = null; done = false;
+        sentinel.className = 'text-center text-muted p-3';
+        sentinel.textContent = 'Loading...';
+        loadMore();
+    });
+
+    new IntersectionObserver(entries => {
+        if (entries.some(entry => entry.isIntersecting)) loadMore();
+    }, {rootMargin: '400px'}).observe(sentinel);
+})();
+</script>
+"""
+
+@app.get("/dev/timeline", response_class=HTMLResponse)
+async def timeline_feed(request: Request):
+    """View activity timeline feed (rows are streamed in from /dev/api/timeline)"""
+    return conditional_html(request, PAGE.render(
+        title="Activity Timeline",
+        navigation=build_navigation([]),
+        content=TIMELINE_FEED
+    ))
 
 @app.get("/dev/health")
-async def health_check():
+async def health_check(request: Request):
     """Health check endpoint"""
     try:
         # Check if we can read docs
@@ -426,10 +646,12 @@ async def health_check():
         if not db_path.exists():
             return {"status": "warning", "message": "Database not found"}
             
+        metrics = request.app.state.metrics.latest
         return {
             "status": "healthy",
             "docs_count": len(docs),
-            "database": "connected" if db_path.exists() else "missing"
+            "database": "connected" if db_path.exists() else "missing",
+            "events": metrics["database"]["events"] if metrics and metrics["database"] else None
         }
     except Exception as e:
         logger.error(f"Health check failed: {str(e)}")
@@ -465,87 +687,162 @@ async def log_frontend_error(error: dict):
     logger.error(f"Frontend error: {error}")
     return {"status": "logged"}
 
+def get_log_file(name: str) -> Path:
+    """Resolve a log name from the URL to a file in LOGS_DIR, or 404"""
+    log_file = LOGS_DIR / name
+    if Path(name).name != name or not name.endswith(".log") or not log_file.is_file():
+        raise HTTPException(status_code=404, detail="Log not found")
+    return log_file
+
+@app.get("/dev/api/logs/{name}")
+def log_lines(
+    name: str,
+    before: Optional[int] = Query(None, ge=0, description="Byte offset to read back from"),
+    lines: int = Query(200, ge=1, le=5000),
+):
+    """Lines ending at byte offset `before` (default: end of file), newest last"""
+    log_file = get_log_file(name)
+    chunk, start = read_tail(log_file, lines=lines, before=before)
+    return {
+        "name": name,
+        "lines": chunk,
+        "start": start,
+        "has_more": start > 0,
+    }
+
+@app.get("/dev/api/logs/{name}/stream")
+async def stream_log(request: Request, name: str, offset: Optional[int] = Query(None, ge=0)):
+    """Server-sent events for lines appended to a log after `offset`"""
+    log_file = get_log_file(name)
+    last_event_id = request.headers.get("last-event-id")
+    if last_event_id and last_event_id.isdigit():
+        offset = int(last_event_id)
+
+    async def events():
+        async for line, end in follow(log_file, offset):
+            if await request.is_disconnected():
+                break
+            yield sse_event(line, end)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+LOGS_SCRIPT = """
+<script>
+document.querySelectorAll('.log-viewer').forEach(viewer => {
+    const name = viewer.dataset.name;
+    const pre = viewer.querySelector('pre');
+    const older = viewer.querySelector('.load-older');
+    let start = Number(viewer.dataset.start);
+    older.hidden = start === 0;
+
+    older.addEventListener('click', async () => {
+        const response = await fetch(`/dev/api/logs/${encodeURIComponent(name)}?before=${start}&lines=1000`);
+        const page = await response.json();
+        pre.prepend(document.createTextNode(page.lines.join('\\n') + '\\n'));
+        start = page.start;
+        older.hidden = !page.has_more;
+    });
+
+    const stream = new EventSource(`/dev/api/logs/${encodeURIComponent(name)}/stream?offset=${viewer.dataset.end}`);
+    stream.onmessage = event => {
+        const atBottom = pre.scrollTop + pre.clientHeight >= pre.scrollHeight - 5;
+        pre.append(document.createTextNode(event.data + '\\n'));
+        if (atBottom) pre.scrollTop = pre.scrollHeight;
+    };
+});
+</script>
+"""
+
 @app.get("/dev/logs", response_class=HTMLResponse)
-async def view_logs():
-    """View application logs"""
+async def view_logs(request: Request):
+    """View application logs (last 1000 lines each, older pages and new lines on demand)"""
     try:
-        logs_dir = Path("timeline/logs")
-        logs = []
-        
-        for log_file in logs_dir.glob("*.log"):
-            with open(log_file) as f:
-                logs.append({
-                    'name': log_file.name,
-                    'content': f.read().splitlines()[-1000:]  # Last 1000 lines
-                })
-        
-        template = Template(PAGE_TEMPLATE)
         content = ['<div class="logs-viewer">']
         
-        for log in logs:
-            content.append(fr'''
-                <div class="card mb-4">
+        for log_file in sorted(LOGS_DIR.glob("*.log")):
+            size = log_file.stat().st_size
+            lines, start = read_tail(log_file, lines=1000, before=size)
+            content.append(f'''
+                <div class="card mb-4 log-viewer" data-name="{html.escape(log_file.name)}" data-start="{start}" data-end="{size}">
                     <div class="card-header">
-                        <h5>{log['name']}</h5>
+                        <h5>{html.escape(log_file.name)}</h5>
+                        <button class="btn btn-sm btn-outline-secondary load-older">Load older</button>
                     </div>
                     <div class="card-body">
-                        <pre class="log-content">{chr(10).join(log['content'])}</pre>
+                        <pre class="log-content" style="max-height: 600px; overflow-y: auto">{html.escape(chr(10).join(lines))}
+</pre>
                     </div>
                 </div>
             ''')
         
         content.append('</div>')
+        content.append(LOGS_SCRIPT)
         
-        return template.render(
+        return conditional_html(request, PAGE.render(
             title="Application Logs",
             navigation=build_navigation([]),
             content='\n'.join(content)
-        )
+        ))
         
     except Exception as e:
         logger.error(f"Failed to display logs: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/dev/api/metrics")
+async def metrics_api(request: Request, limit: int = Query(60, ge=1, le=1000)):
+    """Latest sampler snapshot plus up to `limit` entries of history (oldest first)"""
+    sampler = request.app.state.metrics
+    history = list(sampler.history)[-limit:]
+    return {"interval": sampler.interval, "latest": sampler.latest, "history": history}
+
 @app.get("/dev/dashboard", response_class=HTMLResponse)
-async def dashboard():
-    """System monitoring dashboard"""
+async def dashboard(request: Request):
+    """System monitoring dashboard (rendered from the metrics sampler's last snapshot)"""
     try:
-        # Get system stats
-        import psutil
+        snapshot = request.app.state.metrics.latest
+        if snapshot is None:
+            content = """
+            <div class="dashboard">
+              <div id="dashboard-body">
+                <div class="alert alert-info">Collecting metrics, refresh in a few seconds.</div>
+              </div>
+            </div>
+            """
+            return conditional_html(request, PAGE.render(
+                title="System Dashboard",
+                navigation=build_navigation([]),
+                content=content
+            ))
         
-        # Get service status
-        services = [
-            {"name": "Timeline Watcher", "port": None},
-            {"name": "Dev Docs Server", "port": 8010},
-        ]
+        def section(name, render):
+            """Card body for a snapshot section, or why it is missing"""
+            if snapshot.get(name) is None:
+                reason = html.escape(snapshot.get("unavailable", {}).get(name, ""))
+                return f'<p class="text-muted" title="{reason}">Unavailable</p>'
+            return render(snapshot[name])
         
-        for service in services:
-            if service["port"]:
-                try:
-                    response = requests.get(f"http://localhost:{service['port']}/dev/health")
-                    service["status"] = "🟢 Running" if response.status_code == 200 else "🔴 Error"
-                except:
-                    service["status"] = "🔴 Not Responding"
-            else:
-                service["status"] = "⚪️ Unknown"
+        system = section("system", lambda system: f"""
+                            <p>CPU: {system['cpu_percent']}%</p>
+                            <p>Memory: {system['memory_percent']}%</p>
+                            <p>Disk: {system['disk_percent']}%</p>""")
+        services = section("services", lambda services: ''.join(
+            f"<p>{s['name']}: {s['status']}</p>" for s in services
+        ))
+        database = section("database", lambda database: f"""
+                            <p>Events Recorded: {database['events']}</p>
+                            <p>Database Size: {database['size_bytes'] / 1024:.1f} KB</p>""")
+        logs = section("logs", lambda logs: ''.join(
+            f"<p>{name}: {size / 1024:.1f} KB</p>" for name, size in logs.items()
+        ))
         
-        # Get database stats
-        db_path = Path("timeline/data/timeline.db")
-        if db_path.exists():
-            engine = create_engine(f'sqlite:///{db_path}')
-            with engine.connect() as conn:
-                event_count = conn.execute("SELECT COUNT(*) FROM timeline_events").scalar()
-        else:
-            event_count = 0
-            
-        # Get log stats
-        logs_dir = Path("timeline/logs")
-        log_files = list(logs_dir.glob("*.log"))
-        log_sizes = {log.name: f"{log.stat().st_size / 1024:.1f} KB" for log in log_files}
-        
-        template = Template(PAGE_TEMPLATE)
         content = f"""
         <div class="dashboard">
+          <div id="dashboard-body">
+            <p class="text-muted">Sampled at {snapshot['timestamp']}</p>
             <div class="row">
                 <div class="col-md-6">
                     <div class="card">
@@ -553,20 +850,17 @@ async def dashboard():
                             <h5>System Status</h5>
                         </div>
                         <div class="card-body">
-                            <p>CPU: {psutil.cpu_percent()}%</p>
-                            <p>Memory: {psutil.virtual_memory().percent}%</p>
-                            <p>Disk: {psutil.disk_usage('/').percent}%</p>
+                            {system}
                         </div>
                     </div>
                 </div>
-                
                 <div class="col-md-6">
                     <div class="card">
                         <div class="card-header">
                             <h5>Services</h5>
                         </div>
                         <div class="card-body">
-                            {''.join(f"<p>{s['name']}: {s['status']}</p>" for s in services)}
+                            {services}
                         </div>
                     </div>
                 </div>
@@ -579,8 +873,7 @@ async def dashboard():
                             <h5>Database</h5>
                         </div>
                         <div class="card-body">
-                            <p>Events Recorded: {event_count}</p>
-                            <p>Database Size: {db_path.stat().st_size / 1024:.1f} KB</p>
+                            {database}
                         </div>
                     </div>
                 </div>
@@ -591,24 +884,38 @@ async def dashboard():
                             <h5>Logs</h5>
                         </div>
                         <div class="card-body">
-                            {''.join(f"<p>{name}: {size}</p>" for name, size in log_sizes.items())}
+                            {logs}
                         </div>
                     </div>
                 </div>
             </div>
+          </div>
             
             <script>
-                // Auto-refresh every 30 seconds
-                setTimeout(() => location.reload(), 30000);
+                // Revalidate every 30 seconds; a 304 costs only headers
+                (function() {{
+                    let etag = null;
+                    setInterval(async () => {{
+                        const response = await fetch(location.href, {{
+                            cache: 'no-store',
+                            headers: etag ? {{'If-None-Match': etag}} : {{}}
+                        }});
+                        if (response.status !== 200) return;
+                        etag = response.headers.get('ETag');
+                        const page = new DOMParser().parseFromString(await response.text(), 'text/html');
+                        const body = page.getElementById('dashboard-body');
+                        if (body) document.getElementById('dashboard-body').replaceWith(body);
+                    }}, 30000);
+                }})();
             </script>
         </div>
         """
         
-        return template.render(
+        return conditional_html(request, PAGE.render(
             title="System Dashboard",
             navigation=build_navigation([]),
             content=content
-        )
+        ))
         
     except Exception as e:
         logger.error(f"Failed to generate dashboard: {str(e)}")
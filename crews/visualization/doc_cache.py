@@ -0,0 +1,165 @@
+from pathlib import Path
+from typing import NamedTuple, Optional
+import hashlib
+import os
+import threading
+from loguru import logger
+from watchdog.observers import Observer
+from watchdog.events import FileSystemEventHandler
+
+
+class CachedPage(NamedTuple):
+    html: str
+    etag: str                      # Weak validator over the rendered HTML
+    last_modified: Optional[float] # Newest source mtime, if the page has sources
+
+
+def make_page(html, sources=(), stamp=None):
+    """Wrap rendered HTML with its validators.
+
+    The ETag is weak: the same HTML is served gzip-, brotli- or
+    identity-encoded, and those bytes differ.
+    """
+    etag = 'W/"' + hashlib.sha256(html.encode()).hexdigest()[:32] + '"'
+    if stamp is None:
+        stamp = DocCache.stamp(sources)
+    last_modified = max((mtime_ns for _, mtime_ns, _ in stamp), default=None)
+    return CachedPage(html, etag, last_modified / 1e9 if last_modified else None)
+
+
+class DocCache:
+    """In-process cache for the DEV-MAN documentation tree and rendered pages.
+
+    Pages are stored with the (path, mtime, size) stamp of the files they
+    were built from, plus an ETag over the rendered HTML. While the
+    invalidator is watching DEV-MAN a cached page is served without
+    touching the filesystem; without it, stamps are re-checked on every
+    lookup. A page whose render overlapped an invalidation is returned but
+    not stored, so it can't outlive the change.
+    """
+
+    def __init__(self, root="DEV-MAN"):
+        self.root = Path(root)
+        self.watching = False
+        self._lock = threading.Lock()
+        self._tree = None
+        self._navigation = None
+        self._pages = {}  # key -> (sources, stamp, html)
+        self._generation = 0  # Bumped by every invalidation
+        self.hits = 0
+        self.misses = 0
+
+    def tree(self):
+        """All markdown files under the root, scanned once per change"""
+        tree = self._tree
+        if tree is None or not self.watching:
+            generation = self._generation
+            tree = []
+            for md_file in sorted(self.root.rglob("*.md")):
+                if md_file.is_file():
+                    tree.append({
+                        'path': md_file,
+                        'relative_path': md_file.relative_to(self.root),
+                        'title': md_file.stem.replace('_', ' ').title()
+                    })
+            with self._lock:
+                if self._generation == generation:
+                    self._tree = tree
+        return tree
+
+    def navigation(self, build):
+        """Sidebar HTML for the current tree, built once per change"""
+        navigation = self._navigation
+        if navigation is None or not self.watching:
+            generation = self._generation
+            navigation = build(self.tree())
+            with self._lock:
+                if self._generation == generation:
+                    self._navigation = navigation
+        return navigation
+
+    @staticmethod
+    def stamp(sources):
+        stamp = []
+        for source in sources:
+            stat = source.stat()
+            stamp.append((str(source), stat.st_mtime_ns, stat.st_size))
+        return tuple(stamp)
+
+    def page(self, key, sources, build) -> CachedPage:
+        """Return the cached page for ``key``, rebuilding it when a source changed"""
+        sources = list(sources)
+        if not self.watching and not sources:
+            return make_page(build())
+
+        generation = self._generation
+        entry = self._pages.get(key)
+        if entry is not None:
+            if self.watching:
+                self.hits += 1
+                return entry[2]
+            stamp = self.stamp(sources)
+            if entry[1] == stamp:
+                self.hits += 1
+                return entry[2]
+        else:
+            stamp = self.stamp(sources)
+
+        self.misses += 1
+        page = make_page(build(), stamp=stamp)
+        with self._lock:
+            if self._generation == generation:
+                self._pages[key] = (frozenset(str(s) for s in sources), stamp, page)
+        return page
+
+    def invalidate(self, path=None, structure=False):
+        """Drop pages built from ``path``; ``structure`` also drops the tree and nav"""
+        with self._lock:
+            self._generation += 1
+            if structure or path is None:
+                self._tree = None
+                self._navigation = None
+                self._pages.clear()
+                return
+            path = str(path)
+            stale = [k for k, (sources, _, _) in self._pages.items() if path in sources]
+            for key in stale:
+                del self._pages[key]
+
+    def stats(self):
+        return {'pages': len(self._pages), 'hits': self.hits, 'misses': self.misses}
+
+
+class DocCacheInvalidator(FileSystemEventHandler):
+    """Keeps a DocCache fresh as files under DEV-MAN change"""
+
+    def __init__(self, cache: DocCache):
+        self.cache = cache
+
+    def on_modified(self, event):
+        if event.is_directory or not event.src_path.endswith('.md'):
+            return
+        logger.debug(f"Doc changed, invalidating: {event.src_path}")
+        self.cache.invalidate(Path(os.path.normpath(event.src_path)))
+
+    def on_created(self, event):
+        if event.is_directory or event.src_path.endswith('.md'):
+            logger.debug(f"Doc added, invalidating tree: {event.src_path}")
+            self.cache.invalidate(structure=True)
+
+    def on_deleted(self, event):
+        self.on_created(event)
+
+    def on_moved(self, event):
+        self.cache.invalidate(structure=True)
+
+
+def watch_docs(cache: DocCache):
+    """Start an observer that invalidates ``cache``; returns it for stopping"""
+    observer = Observer()
+    observer.schedule(DocCacheInvalidator(cache), str(cache.root), recursive=True)
+    observer.start()
+    cache.invalidate(structure=True)
+    cache.watching = True
+    logger.info(f"Watching {cache.root} for documentation changes")
+    return observer
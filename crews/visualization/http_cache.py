@@ -0,0 +1,91 @@
+from email.utils import formatdate, parsedate_to_datetime
+from fastapi import Request
+from fastapi.responses import HTMLResponse, Response
+from starlette.datastructures import MutableHeaders
+from starlette.middleware.gzip import GZipMiddleware
+from loguru import logger
+from .doc_cache import CachedPage, make_page
+
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:  # brotli is optional; gzip covers every browser
+    BrotliMiddleware = None
+
+
+def not_modified(request: Request, page: CachedPage) -> bool:
+    """True if the client's validators still match ``page``"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # Weak comparison, as RFC 9110 requires for If-None-Match
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or page.etag.removeprefix("W/") in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and page.last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(page.last_modified) <= since
+    return False
+
+
+def conditional_html(request: Request, page) -> Response:
+    """Serve a page as HTML, or 304 when the client already has it.
+
+    ``page`` is a CachedPage or plain HTML (validated by its content hash).
+    Pages are marked ``no-cache`` so browsers always revalidate, which costs
+    a header-only round trip when nothing changed.
+    """
+    if isinstance(page, str):
+        page = make_page(page)
+    headers = {"ETag": page.etag, "Cache-Control": "no-cache"}
+    if page.last_modified is not None:
+        headers["Last-Modified"] = formatdate(page.last_modified, usegmt=True)
+    if not_modified(request, page):
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(page.html, headers=headers)
+
+
+class VaryAcceptEncoding:
+    """Marks every response as varying by Accept-Encoding.
+
+    The compression middleware only adds ``Vary`` to responses it
+    compresses, so an identity response (or a 304) could otherwise be
+    cached and served to a client that asked for gzip. Strong ETags on
+    compressed responses (StaticFiles sends them) are weakened, since they
+    describe the uncompressed bytes.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_vary(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                vary = [value.strip().lower() for value in headers.get("vary", "").split(",")]
+                if "accept-encoding" not in vary:
+                    headers.add_vary_header("Accept-Encoding")
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/") and headers.get("content-encoding"):
+                    headers["etag"] = "W/" + etag
+            await send(message)
+
+        await self.app(scope, receive, send_with_vary)
+
+
+def add_compression(app, minimum_size=1024):
+    """Compress responses (pages, JSON and the static DEV-MAN mounts)"""
+    if BrotliMiddleware is not None:
+        # Falls back to gzip for clients without brotli support
+        app.add_middleware(BrotliMiddleware, minimum_size=minimum_size)
+        logger.debug("Brotli compression enabled")
+    else:
+        app.add_middleware(GZipMiddleware, minimum_size=minimum_size)
+    # Added last so it wraps the compression middleware and sees its headers
+    app.add_middleware(VaryAcceptEncoding)
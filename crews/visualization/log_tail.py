@@ -0,0 +1,77 @@
+import asyncio
+import os
+import re
+from pathlib import Path
+
+# Any of these ends an SSE field, so none may appear inside one
+SSE_LINE_BREAK = re.compile(r'\r\n|\r|\n')
+
+
+def read_tail(path: Path, lines=1000, before=None, block_size=64 * 1024):
+    """Read the last ``lines`` lines of a file ending at byte offset ``before``.
+
+    Seeks backwards in blocks, so the cost is proportional to the lines
+    returned, not the file size. Returns ``(lines, start)`` where ``start``
+    is the byte offset of the first returned line; pass it back as
+    ``before`` to page further back.
+    """
+    with open(path, 'rb') as f:
+        end = f.seek(0, os.SEEK_END) if before is None else min(before, f.seek(0, os.SEEK_END))
+        position = end
+        buffer = b''
+        # One extra newline so the first (possibly partial) line is complete
+        while position > 0 and buffer.count(b'\n') <= lines:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            buffer = f.read(step) + buffer
+
+    chunks = buffer.split(b'\n')
+    if chunks and chunks[-1] == b'':
+        chunks.pop()  # trailing newline at ``end``
+    if len(chunks) > lines:
+        # Drop everything before the last ``lines`` lines, tracking the offset
+        position += sum(len(chunk) + 1 for chunk in chunks[:-lines])
+        chunks = chunks[-lines:]
+    return [chunk.rstrip(b'\r').decode('utf-8', errors='replace') for chunk in chunks], position
+
+
+async def follow(path: Path, offset=None, poll_interval=0.5):
+    """Yield ``(line, end_offset)`` for lines appended after ``offset``.
+
+    Starts at the current end of file when ``offset`` is None and starts over
+    from the beginning if the file is truncated or rotated.
+    """
+    if offset is None:
+        offset = path.stat().st_size
+    partial = b''
+    while True:
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if size < offset:
+            offset, partial = 0, b''
+        if size > offset:
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                data = f.read(size - offset)
+            end = offset - len(partial)
+            offset += len(data)
+            *complete, partial = (partial + data).split(b'\n')
+            for line in complete:
+                end += len(line) + 1
+                yield line.rstrip(b'\r').decode('utf-8', errors='replace'), end
+        else:
+            await asyncio.sleep(poll_interval)
+
+
+def sse_event(data: str, event_id=None) -> str:
+    """Format one server-sent event, giving each line of ``data`` its own ``data:`` field.
+
+    A bare ``\r`` (progress bars, Windows line endings) would otherwise end
+    the field early; the browser joins the fields back with ``\n``.
+    """
+    fields = [f"id: {event_id}"] if event_id is not None else []
+    fields.extend(f"data: {piece}" for piece in SSE_LINE_BREAK.split(data))
+    return '\n'.join(fields) + '\n\n'
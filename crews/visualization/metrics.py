@@ -0,0 +1,125 @@
+import asyncio
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from loguru import logger
+from timeline.counters import event_totals
+
+DEFAULT_SERVICES = [
+    {"name": "Timeline Watcher", "port": None},
+    {"name": "Dev Docs Server", "port": 8010},
+]
+
+
+class MetricsSampler:
+    """Background sampler for the dashboard.
+
+    Every ``interval`` seconds it collects system, service-health, database
+    and log stats on a worker thread and appends the snapshot to a ring
+    buffer of ``history`` entries. Request handlers only read ``latest`` and
+    ``history``; they never touch psutil, the network or the database.
+    """
+
+    def __init__(self, session_factory, db_path: Path, logs_dir: Path,
+                 services=None, interval=10.0, history=360):
+        self.session_factory = session_factory
+        self.db_path = db_path
+        self.logs_dir = logs_dir
+        self.services = services or DEFAULT_SERVICES
+        self.interval = interval
+        self.history = deque(maxlen=history)
+        self._task = None
+        self._primed = False
+        self._failures = {}
+
+    @property
+    def latest(self):
+        return self.history[-1] if self.history else None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="metrics-sampler")
+        return self._task
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                self.history.append(await asyncio.to_thread(self.sample))
+            except Exception as e:
+                logger.error(f"Metrics sample failed: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    def sample(self):
+        """Collect one snapshot (blocking; runs off the event loop)
+
+        Each section is collected on its own. One that fails is None in
+        the snapshot, with its error under ``unavailable``, so the rest of
+        the dashboard still updates.
+        """
+        snapshot = {"timestamp": datetime.now().isoformat(timespec="seconds"), "unavailable": {}}
+        sections = (
+            ("system", self._system_stats),
+            ("services", lambda: [self._service_status(service) for service in self.services]),
+            ("database", self._database_stats),
+            ("logs", self._log_sizes),
+        )
+        for name, collect in sections:
+            try:
+                snapshot[name] = collect()
+            except Exception as e:
+                snapshot[name] = None
+                snapshot["unavailable"][name] = str(e)
+                # Log each distinct failure once, not every interval
+                if self._failures.get(name) != str(e):
+                    logger.warning(f"Metrics section {name} unavailable: {str(e)}")
+            self._failures[name] = snapshot["unavailable"].get(name)
+        return snapshot
+
+    def _system_stats(self):
+        # Imported here so loading the dashboard module stays cheap
+        import psutil
+        if not self._primed:
+            # The first cpu_percent() call only primes the counters
+            psutil.cpu_percent(interval=None)
+            self._primed = True
+        return {
+            "cpu_percent": psutil.cpu_percent(interval=None),
+            "memory_percent": psutil.virtual_memory().percent,
+            "disk_percent": psutil.disk_usage('/').percent,
+        }
+
+    def _log_sizes(self):
+        return {log.name: log.stat().st_size for log in sorted(self.logs_dir.glob("*.log"))}
+
+    def _service_status(self, service):
+        import requests
+        status = "⚪️ Unknown"
+        if service["port"]:
+            try:
+                response = requests.get(
+                    f"http://localhost:{service['port']}/dev/health", timeout=2
+                )
+                status = "🟢 Running" if response.status_code == 200 else "🔴 Error"
+            except requests.RequestException:
+                status = "🔴 Not Responding"
+        return {"name": service["name"], "status": status}
+
+    def _database_stats(self):
+        if not self.db_path.exists():
+            return {"events": 0, "size_bytes": 0}
+        with self.session_factory() as session:
+            totals = event_totals(session)
+        return {
+            "events": totals["total"],
+            "by_type": totals["by_type"],
+            "size_bytes": self.db_path.stat().st_size,
+        }
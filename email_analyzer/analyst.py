@@ -1,10 +1,12 @@
 from crewai import Agent, Task, Crew
 from email_analyzer.database import SessionLocal, Email
 from typing import List
+from crews.registry import shared_llm
 
 class EmailAnalyst:
     def __init__(self):
         self.session = SessionLocal()
+        self.llm = shared_llm()
 
     def analyze_emails(self, limit: int = 10) -> List[dict]:
         # Get unanalyzed emails
@@ -14,13 +16,15 @@ class EmailAnalyst:
         researcher = Agent(
             role='Email Researcher',
             goal='Analyze email content for key information and patterns',
-            backstory='Expert at analyzing email communications and extracting insights'
+            backstory='Expert at analyzing email communications and extracting insights',
+            llm=self.llm
         )
         
         summarizer = Agent(
             role='Email Summarizer',
             goal='Create concise summaries of email analysis',
-            backstory='Specialist in creating actionable summaries from complex data'
+            backstory='Specialist in creating actionable summaries from complex data',
+            llm=self.llm
         )
 
         # Create tasks
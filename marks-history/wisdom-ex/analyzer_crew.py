@@ -5,6 +5,11 @@ from loguru import logger
 import json
 import re
 
+try:
+    from crews.registry import shared_llm
+except ImportError:  # Run outside the workstation repo: crewai's default LLM, unthrottled
+    shared_llm = None
+
 # Configure logger
 logger.add(
     "wisdom-ex/logs/analyzer.log",
@@ -19,6 +24,8 @@ class WisdomAnalyzerCrew:
         self.wisdom_dir = Path(wisdom_dir)
         self.metadata_file = self.wisdom_dir / "metadata.json"
         self.wisdom_file = self.wisdom_dir / "wisdom.md"
+        # Share the workstation's rate-limited LLM when it is importable
+        self.agent_options = {'llm': shared_llm()} if shared_llm else {}
         
         # Initialize agents with logging
         logger.debug("Creating Research Analyst agent")
@@ -29,7 +36,8 @@ class WisdomAnalyzerCrew:
             identifying core themes. You specialize in understanding AI and 
             programming tutorials.""",
             tools=[self._create_read_file_tool()],
-            verbose=True
+            verbose=True,
+            **self.agent_options
         )
         
         logger.debug("Creating Metadata Specialist agent")
@@ -39,7 +47,8 @@ class WisdomAnalyzerCrew:
             backstory="""You ensure metadata accuracy and completeness. You extract 
             key information from content and maintain proper JSON structure.""",
             tools=[self._create_update_metadata_tool()],
-            verbose=True
+            verbose=True,
+            **self.agent_options
         )
         
         logger.debug("Creating API Designer agent")
@@ -49,7 +58,8 @@ class WisdomAnalyzerCrew:
             backstory="""You transform unstructured content into well-organized 
             API formats. You excel at creating clear, hierarchical JSON structures.""",
             tools=[self._create_create_api_tool()],
-            verbose=True
+            verbose=True,
+            **self.agent_options
         )
 
     def _create_read_file_tool(self):
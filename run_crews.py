@@ -3,4 +3,4 @@ import asyncio
 
 if __name__ == "__main__":
     runner = CrewRunner()
-    asyncio.run(runner.run_all_crews(delay_between_crews=30)) 
\ No newline at end of file
+    asyncio.run(runner.run_all_crews()) 
\ No newline at end of file
@@ -0,0 +1,146 @@
+"""
+Benchmark the timeline read paths with and without the timeline_events indexes.
+
+Seeds a throwaway SQLite database with synthetic events, then times the
+queries issued by `timeline logs` (TimelineLogger) and the /dev/timeline page
+before and after creating the indexes declared on TimelineEvent. Run it
+from the repository root so the timeline package is importable:
+
+    python -m scripts.benchmark_timeline_queries --events 5000000
+
+`timeline logs --source` filters with LIKE '%x%', which cannot use the
+(source, timestamp) index: SQLite walks the timestamp index newest first
+and tests every row, so that query only speeds up when matches are recent.
+"""
+import argparse
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from loguru import logger
+from rich.console import Console
+from rich.table import Table
+from sqlalchemy import create_engine, desc
+from sqlalchemy.orm import sessionmaker
+
+from timeline.models import Base, TimelineEvent
+
+console = Console()
+
+EVENT_TYPES = ['file_change', 'cursor', 'terminal', 'crew']
+ACTIONS = ['modified', 'chat', 'command', 'edit']
+
+
+def seed(db_path: Path, count: int, chunk: int = 100_000):
+    """Bulk-load synthetic events straight through sqlite3"""
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(engine)
+    for index in TimelineEvent.__table__.indexes:
+        index.drop(engine)
+    engine.dispose()
+
+    sources = [f"crews/module_{i}.py" for i in range(200)] + \
+              [f"timeline/file_{i}.py" for i in range(200)] + ['shell', 'cursor']
+    start = datetime(2024, 1, 1)
+    rng = random.Random(42)
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+    inserted = 0
+    while inserted < count:
+        n = min(chunk, count - inserted)
+        rows = [
+            (
+                (start + timedelta(seconds=(inserted + i) * 6)).isoformat(sep=' '),
+                rng.choice(EVENT_TYPES),
+                rng.choice(sources),
+                rng.choice(ACTIONS),
+                '{"size": 1024}',
+            )
+            for i in range(n)
+        ]
+        conn.executemany(
+            "INSERT INTO timeline_events (timestamp, event_type, source, action, details) "
+            "VALUES (?, ?, ?, ?, ?)",
+            rows
+        )
+        conn.commit()
+        inserted += n
+        logger.info(f"Seeded {inserted:,}/{count:,} events")
+    conn.close()
+
+
+def build_queries(session):
+    """The same statements TimelineLogger and /dev/timeline issue"""
+    return {
+        'timeline logs': lambda: session.query(TimelineEvent)
+            .order_by(desc(TimelineEvent.timestamp)).limit(100).all(),
+        'timeline logs --type terminal': lambda: session.query(TimelineEvent)
+            .filter(TimelineEvent.event_type == 'terminal')
+            .order_by(desc(TimelineEvent.timestamp)).limit(100).all(),
+        # Substring match: served by the timestamp index, not (source, timestamp)
+        'timeline logs --source crews/': lambda: session.query(TimelineEvent)
+            .filter(TimelineEvent.source.like('%crews/%'))
+            .order_by(desc(TimelineEvent.timestamp)).limit(100).all(),
+        '/dev/timeline': lambda: session.query(TimelineEvent)
+            .order_by(TimelineEvent.timestamp.desc()).limit(50).all(),
+    }
+
+
+def time_queries(engine, repeat: int):
+    session = sessionmaker(bind=engine)()
+    results = {}
+    for name, query in build_queries(session).items():
+        samples = []
+        for _ in range(repeat):
+            session.expunge_all()
+            started = time.perf_counter()
+            query()
+            samples.append((time.perf_counter() - started) * 1000)
+        results[name] = statistics.median(samples)
+    session.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--events', type=int, default=5_000_000, help='Events to seed')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per query (median is reported)')
+    parser.add_argument('--db', type=Path, help='Reuse/keep the database at this path')
+    args = parser.parse_args()
+
+    db_path = args.db or Path(tempfile.mkdtemp()) / "timeline_bench.db"
+    if not db_path.exists():
+        seed(db_path, args.events)
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    for index in TimelineEvent.__table__.indexes:
+        index.drop(engine, checkfirst=True)
+    before = time_queries(engine, args.repeat)
+
+    started = time.perf_counter()
+    for index in TimelineEvent.__table__.indexes:
+        index.create(engine)
+    index_build = time.perf_counter() - started
+    after = time_queries(engine, args.repeat)
+    engine.dispose()
+
+    table = Table(title=f"Timeline query latency ({args.events:,} events, median of {args.repeat})")
+    table.add_column("Query", style="cyan")
+    table.add_column("No indexes (ms)", justify="right")
+    table.add_column("Indexed (ms)", justify="right", style="green")
+    table.add_column("Speedup", justify="right", style="magenta")
+    for name in before:
+        speedup = before[name] / after[name] if after[name] else float('inf')
+        table.add_row(name, f"{before[name]:.1f}", f"{after[name]:.1f}", f"{speedup:.0f}x")
+    console.print(table)
+    console.print(f"Index build time: {index_build:.1f}s  |  Database: {db_path}")
+
+
+if __name__ == "__main__":
+    main()
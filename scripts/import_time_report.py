@@ -0,0 +1,168 @@
+"""
+Report how long the timeline and dev-docs entry points take to import.
+
+Each module is imported in a fresh interpreter under ``python -X importtime``
+and the per-module timings are parsed into a report: the module's own
+cumulative time, the slowest top-level dependencies, and whether any heavy
+module that should stay lazy (crewai, langchain, ...) was loaded.
+
+    python scripts/import_time_report.py
+    python scripts/import_time_report.py timeline.cli --top 20 --runs 5
+
+Exits with status 1 if a module goes over its budget or imports a heavy
+module. tests/test_import_time.py enforces the same budgets.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+
+console = Console()
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Cumulative import time allowed per entry point, in milliseconds
+BUDGETS_MS = {
+    'timeline': 150,
+    'timeline.cli': 1500,
+    'crews.visualization.metrics': 1000,
+    'crews.visualization.dev_docs_server': 2500,
+}
+
+# Modules that only the commands actually using them may import
+HEAVY_MODULES = (
+    'crewai', 'langchain', 'langchain_openai', 'langchain_community',
+    'openai', 'pyarrow', 'psutil', 'requests', 'markdown',
+)
+
+
+def parse_importtime(stderr: str):
+    """Parse ``-X importtime`` output into (module, self_us, cumulative_us, depth) rows"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # The column header
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(fields[0]), int(fields[1]), depth))
+    return rows
+
+
+def measure(module: str):
+    """Import ``module`` in a fresh interpreter and return its timing report"""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    rows = parse_importtime(result.stderr)
+    imported = {name for name, _, _, _ in rows}
+    error = None
+    if result.returncode != 0:
+        traceback = [line for line in result.stderr.splitlines()
+                     if line.strip() and not line.startswith('import time:')]
+        error = traceback[-1] if traceback else 'import failed'
+
+    # The target is the last top-level entry; everything above it in the
+    # nesting belongs to its import
+    total = next((cumulative for name, _, cumulative, depth in reversed(rows)
+                  if name == module and depth == 0), None)
+    return {
+        'module': module,
+        'total_ms': total / 1000 if total is not None else None,
+        'error': error,
+        'heavy': sorted(m for m in HEAVY_MODULES if m in imported),
+        'modules': len(imported),
+        'rows': rows,
+    }
+
+
+def slowest_dependencies(report, top=10):
+    """Slowest direct children of the measured module"""
+    rows = report['rows']
+    end = max((i for i, row in enumerate(rows) if row[0] == report['module'] and row[3] == 0), default=None)
+    if end is None:
+        return []
+    # Children are printed before their parent; walk back until the previous top-level entry
+    children = []
+    for name, _, cumulative, depth in reversed(rows[:end]):
+        if depth == 0:
+            break
+        if depth == 1:
+            children.append((name, cumulative / 1000))
+    return sorted(children, key=lambda child: child[1], reverse=True)[:top]
+
+
+def check(report, budget_ms=None):
+    """Problems with a report: import errors, heavy modules, budget overruns"""
+    budget_ms = budget_ms if budget_ms is not None else BUDGETS_MS.get(report['module'])
+    problems = []
+    if report['error']:
+        problems.append(f"import failed: {report['error']}")
+    if report['heavy']:
+        problems.append(f"imports {', '.join(report['heavy'])}")
+    if budget_ms is not None and report['total_ms'] is not None and report['total_ms'] > budget_ms:
+        problems.append(f"{report['total_ms']:.0f} ms over the {budget_ms} ms budget")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('modules', nargs='*', default=list(BUDGETS_MS), help='Modules to import')
+    parser.add_argument('--runs', type=int, default=3, help='Imports per module; the median is reported')
+    parser.add_argument('--top', type=int, default=8, help='Slowest dependencies to list per module')
+    args = parser.parse_args()
+
+    summary = Table(title="Import time")
+    summary.add_column("Module")
+    summary.add_column("Median ms", justify="right")
+    summary.add_column("Budget ms", justify="right")
+    summary.add_column("Modules", justify="right")
+    summary.add_column("Status")
+
+    failed = False
+    details = []
+    for module in args.modules:
+        reports = [measure(module) for _ in range(args.runs)]
+        timings = [r['total_ms'] for r in reports if r['total_ms'] is not None]
+        report = reports[-1]
+        if timings:
+            report['total_ms'] = statistics.median(timings)
+        problems = check(report)
+        failed = failed or bool(problems)
+        budget = BUDGETS_MS.get(module)
+        summary.add_row(
+            module,
+            f"{report['total_ms']:.0f}" if report['total_ms'] is not None else "-",
+            str(budget) if budget is not None else "-",
+            str(report['modules']),
+            "[red]" + escape('; '.join(problems)) + "[/red]" if problems else "[green]ok[/green]"
+        )
+        details.append(report)
+
+    console.print(summary)
+    for report in details:
+        children = slowest_dependencies(report, args.top)
+        if not children:
+            continue
+        table = Table(title=f"Slowest imports under {report['module']}")
+        table.add_column("Module")
+        table.add_column("Cumulative ms", justify="right")
+        for name, ms in children:
+            table.add_row(name, f"{ms:.1f}")
+        console.print(table)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
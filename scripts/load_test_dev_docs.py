@@ -0,0 +1,101 @@
+"""
+Load test a running dev docs server.
+
+Fires concurrent requests at a set of endpoints for a fixed duration and
+reports requests/second and latency percentiles per endpoint. Requires httpx.
+The generator competes with the server for CPU, so on a small machine
+compare runs against each other rather than reading absolute figures.
+
+    dev-docs &
+    python scripts/load_test_dev_docs.py --url http://localhost:8010 --concurrency 32 --duration 20
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from collections import defaultdict
+
+import httpx
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+DEFAULT_PATHS = [
+    "/dev/api/timeline?limit=50",
+    "/dev/api/timeline?limit=50&include_content=true",
+    "/dev/health",
+]
+
+
+async def worker(client, paths, deadline, latencies, errors, offset):
+    i = offset
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        started = time.perf_counter()
+        try:
+            response = await client.get(path)
+            if response.status_code >= 400:
+                errors[path] += 1
+                continue
+        except httpx.HTTPError:
+            errors[path] += 1
+            continue
+        latencies[path].append((time.perf_counter() - started) * 1000)
+
+
+async def run(url, paths, concurrency, duration):
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(
+            worker(client, paths, deadline, latencies, errors, n)
+            for n in range(concurrency)
+        ))
+    return latencies, errors
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8010")
+    parser.add_argument("--path", action="append", dest="paths", help="Endpoint to hit (repeatable)")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds to run")
+    args = parser.parse_args()
+
+    paths = args.paths or DEFAULT_PATHS
+    latencies, errors = asyncio.run(run(args.url, paths, args.concurrency, args.duration))
+
+    table = Table(title=f"{args.url}  ({args.concurrency} concurrent, {args.duration:.0f}s)")
+    table.add_column("Endpoint", style="cyan")
+    table.add_column("Req/s", justify="right", style="green")
+    table.add_column("p50 ms", justify="right")
+    table.add_column("p95 ms", justify="right")
+    table.add_column("Errors", justify="right", style="red")
+    total = 0
+    for path in paths:
+        samples = latencies[path]
+        total += len(samples)
+        table.add_row(
+            path,
+            f"{len(samples) / args.duration:.1f}",
+            f"{statistics.median(samples) if samples else 0:.1f}",
+            f"{percentile(samples, 95):.1f}",
+            str(errors[path]),
+        )
+    console.print(table)
+    console.print(f"Total: {total / args.duration:.1f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,7 +11,7 @@ import select
 from rich.console import Console
 from rich.table import Table
 from scripts.verify_server import verify_server
-from timeline.logs.config import setup_logging
+from timeline.log_config import setup_logging
 import threading
 
 console = Console()
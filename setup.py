@@ -5,9 +5,9 @@ setup(
     version="0.1",
     packages=find_packages(),
     install_requires=[
-        "crewai==0.10.0",
-        "langchain-openai==0.0.2",
-        "langchain-community==0.0.24",
+        "crewai>=0.114.0",
+        "langchain-openai>=0.2.9",
+        "langchain-community>=0.3.8",
         "python-dotenv",
         "loguru==0.6.0",
         "duckduckgo-search",
@@ -0,0 +1,58 @@
+"""BlobStore: content addressing, deduplication and round trips."""
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from timeline.blobs import BlobStore, zstandard
+from timeline.db import create_timeline_engine
+from timeline.models import Base, TimelineBlob
+
+
+@pytest.fixture
+def session(tmp_path):
+    engine = create_timeline_engine(f"sqlite:///{tmp_path / 'timeline.db'}")
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as session:
+        yield session
+
+
+def test_put_and_get_round_trip(session):
+    store = BlobStore(codec='zlib')
+    data = b'print("hello")\n' * 100
+    digest = store.put(session, data)
+    session.commit()
+
+    assert digest == BlobStore.digest(data)
+    assert store.get(session, digest) == data
+    blob = session.get(TimelineBlob, digest)
+    assert blob.codec == 'zlib'
+    assert blob.size == len(data)
+    assert len(blob.data) < len(data)
+
+
+def test_identical_snapshots_are_stored_once(session):
+    store = BlobStore(codec='zlib')
+    first = store.put_many(session, {BlobStore.digest(b'a'): b'a', BlobStore.digest(b'b'): b'b'})
+    second = store.put_many(session, {BlobStore.digest(b'a'): b'a', BlobStore.digest(b'c'): b'c'})
+    session.commit()
+
+    assert (first, second) == (2, 1)
+    assert session.query(TimelineBlob).count() == 3
+
+
+def test_put_many_checks_existing_digests_in_chunks(session):
+    store = BlobStore(codec='zlib')
+    blobs = {BlobStore.digest(str(i).encode()): str(i).encode() for i in range(1200)}
+    assert store.put_many(session, blobs) == 1200
+    assert store.put_many(session, blobs) == 0
+
+
+def test_unknown_digest_returns_none(session):
+    assert BlobStore().get(session, '0' * 64) is None
+
+
+def test_zstd_requires_zstandard():
+    if zstandard is not None:
+        pytest.skip("zstandard is installed")
+    with pytest.raises(ValueError):
+        BlobStore(codec='zstd')
+    assert BlobStore().codec == 'zlib'
@@ -0,0 +1,86 @@
+"""TTLStore expiry, LRU eviction and counters."""
+import pytest
+
+from crews import cache_store
+from crews.cache_store import TTLStore
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_store.time, 'time', clock)
+    return clock
+
+
+def make_store(tmp_path, ttl=60, max_entries=3):
+    return TTLStore(tmp_path / 'cache.db', 'entries', ttl, max_entries)
+
+
+def test_round_trip_and_counters(tmp_path, clock):
+    store = make_store(tmp_path)
+    assert store.get('a') is None
+    store.put('a', 'alpha', label='first')
+
+    assert store.get('a') == 'alpha'
+    stats = store.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (1, 1, 1)
+    assert stats['hit_rate'] == 0.5
+
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    store = make_store(tmp_path)
+    store.put('a', 'alpha')
+    clock.now += 59
+    assert store.get('a') == 'alpha'
+
+    clock.now += 2
+    assert store.get('a') is None
+    assert store.stats()['expired'] == 1
+    assert store.stats()['entries'] == 0
+
+
+def test_purge_expired(tmp_path, clock):
+    store = make_store(tmp_path, max_entries=0)
+    store.put('old', '1')
+    clock.now += 30
+    store.put('new', '2')
+    clock.now += 40
+
+    assert store.purge_expired() == 1
+    assert store.get('new') == '2'
+
+
+def test_zero_ttl_never_expires(tmp_path, clock):
+    store = make_store(tmp_path, ttl=0)
+    store.put('a', 'alpha')
+    clock.now += 10 ** 9
+    assert store.get('a') == 'alpha'
+    assert store.purge_expired() == 0
+
+
+def test_least_recently_used_are_evicted(tmp_path, clock):
+    store = make_store(tmp_path, max_entries=3)
+    for key in 'abc':
+        clock.now += 1
+        store.put(key, key)
+    clock.now += 1
+    store.get('a')  # b is now the least recently used
+    clock.now += 1
+    store.put('d', 'd')
+
+    assert store.get('b') is None
+    assert [store.get(key) for key in 'acd'] == ['a', 'c', 'd']
+    assert store.stats()['evicted'] == 1
+
+
+def test_shared_between_connections(tmp_path, clock):
+    make_store(tmp_path).put('a', 'alpha')
+    assert make_store(tmp_path).get('a') == 'alpha'
@@ -0,0 +1,164 @@
+"""Bounded timeline digest for the analyzer crew."""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import Session, sessionmaker
+
+from timeline.blobs import BlobStore
+from timeline.context import build_context, estimate_tokens, render_context, timeline_digest
+from timeline.db import create_timeline_engine
+from timeline.models import Base
+from timeline.partitions import compact
+from timeline.writer import write_rows
+
+START = datetime(2026, 10, 12, 9)
+
+
+def file_change(at, source, added, removed, content=None, keyframe=False, coalesced=1):
+    diff = {'added': added, 'removed': removed, 'keyframe': keyframe}
+    return {'timestamp': at, 'event_type': 'file_change', 'source': source, 'action': 'modified',
+            'details': {'diff': diff, 'coalesced': coalesced}, 'content': content}
+
+
+def command(at, text, exit_status=0, duration=0.5):
+    return {'timestamp': at, 'event_type': 'terminal', 'source': 'shell', 'action': 'command',
+            'details': {'command': text, 'exit_status': exit_status, 'duration': duration}}
+
+
+def chat(at, has_code_changes=False):
+    return {'timestamp': at, 'event_type': 'cursor', 'source': 'cursor', 'action': 'chat',
+            'details': {'has_code_changes': has_code_changes}}
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_timeline_engine(f"sqlite:///{tmp_path / 'timeline.db'}")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def write(engine, rows):
+    assert write_rows(sessionmaker(bind=engine), rows, BlobStore())
+
+
+@pytest.fixture
+def week(engine):
+    write(engine, [
+        file_change(START, 'src/a.py', 5, 1, '+a\n' * 5, coalesced=3),
+        file_change(START + timedelta(hours=1), 'src/a.py', 2, 2, '+b\n-c\n'),
+        file_change(START + timedelta(days=1), 'src/a.py', 0, 0, 'full text', keyframe=True),
+        file_change(START + timedelta(days=1, hours=2), 'src/b.py', 1, 0, '+d\n'),
+        command(START, 'pytest -q tests', exit_status=1, duration=12.0),
+        command(START + timedelta(minutes=5), 'pytest -q', duration=9.0),
+        command(START + timedelta(minutes=6), 'git status', duration=0.1),
+        chat(START + timedelta(hours=3), has_code_changes=True),
+        chat(START + timedelta(hours=4)),
+        # Outside the window
+        file_change(START - timedelta(days=10), 'src/old.py', 9, 9, '+old\n'),
+    ])
+    return engine
+
+
+def test_aggregates(week):
+    with Session(week) as session:
+        context = build_context(session, START)
+
+    assert context['total'] == 9
+    assert context['by_type'] == {'file_change': 4, 'terminal': 3, 'cursor': 2}
+    assert context['hot_files'] == [
+        {'source': 'src/a.py', 'edits': 5, 'added': 7, 'removed': 3},
+        {'source': 'src/b.py', 'edits': 1, 'added': 1, 'removed': 0},
+    ]
+    assert context['diff_totals'] == {'added': 8, 'removed': 3, 'keyframes': 1, 'diffs': 3}
+    assert context['commands'] == [
+        {'program': 'pytest', 'runs': 2, 'failures': 1},
+        {'program': 'git', 'runs': 1, 'failures': 0},
+    ]
+    assert context['slowest_commands'][0] == (12.0, 'pytest -q tests')
+    assert context['ai_actions'] == {'chat': 2}
+    assert context['ai_with_code_changes'] == 1
+
+
+def test_histograms_come_from_the_hourly_counters(week):
+    with Session(week) as session:
+        context = build_context(session, START, until=START + timedelta(days=1))
+        assert context['per_day'] == [(START.date(), 7)]
+        assert context['by_hour'] == [(9, 4), (10, 1), (12, 1), (13, 1)]
+
+        text = render_context(session, context)
+    assert "Events per day: 10-12 7" in text
+    assert "Events by hour of day (UTC): 09h 4, 10h 1, 12h 1, 13h 1" in text
+
+
+def test_render_includes_sampled_diffs(week):
+    with Session(week) as session:
+        text = timeline_digest(session, START)
+
+    assert text.startswith("Window: 2026-10-12 09:00 to now (9 events")
+    assert "src/a.py: 5 (+7/-3)" in text
+    assert "Commands (runs, failures): pytest 2 (1), git 1 (0)" in text
+    assert "Representative diffs:" in text
+    # The latest change to src/a.py is a keyframe, so the latest with content is shown
+    assert "full text" in text
+    assert "src/old.py" not in text
+
+
+def test_diffs_are_truncated_to_the_token_budget(engine):
+    write(engine, [file_change(START + timedelta(minutes=i), f'src/{i}.py', 400, 0, f'+line {i}\n' * 400)
+                   for i in range(5)])
+    with Session(engine) as session:
+        text = timeline_digest(session, START, token_budget=600)
+        assert estimate_tokens(text) <= 650
+        assert "[...truncated]" in text
+
+        # A budget the summary already fills leaves no room for diffs
+        assert "Representative diffs" not in timeline_digest(session, START, token_budget=20)
+
+
+def test_archived_months_are_aggregated_and_sampled(engine, tmp_path):
+    old = datetime(2026, 6, 10, 9)
+    write(engine, [
+        file_change(old, 'src/archived.py', 50, 0, '+archived change\n' * 50),
+        file_change(START, 'src/a.py', 1, 0, '+a\n'),
+    ])
+    compact(engine, keep_months=3, retention_months=0, now=datetime(2026, 10, 15))
+
+    with Session(engine) as session:
+        context = build_context(session, datetime(2026, 6, 1))
+        assert context['total'] == 2
+        assert ('event', (datetime(2026, 6, 1), 1)) in context['diff_candidates']
+        assert context['per_day'][0] == (old.date(), 1)
+
+        text = render_context(session, context)
+    assert "src/archived.py (+50/-0)" in text
+    assert "+archived change" in text
+
+
+def test_analyzer_reads_the_database_without_a_context(week, tmp_path, monkeypatch):
+    pytest.importorskip('crewai')
+    pytest.importorskip('langchain_community')
+    from timeline import analyzer_crew
+
+    class FakeTask:
+        def __init__(self, description, agent):
+            self.description = description
+
+    class FakeCrew:
+        def __init__(self, agents, tasks, verbose):
+            self.tasks = tasks
+
+        def kickoff(self):
+            return self.tasks[0].description
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(analyzer_crew, 'Task', FakeTask)
+    monkeypatch.setattr(analyzer_crew, 'Crew', FakeCrew)
+    for name in ('pattern_analyzer', 'code_reviewer', 'doc_expert'):
+        monkeypatch.setattr(analyzer_crew.TimelineAnalyzerCrew, name, None)
+
+    prompt = analyzer_crew.TimelineAnalyzerCrew().analyze_timeline(
+        days_back=3650, db_url=str(week.url)
+    )
+    assert "No timeline events recorded" not in prompt
+    assert "src/a.py: 5 (+7/-3)" in prompt
@@ -0,0 +1,63 @@
+"""Hourly event counters kept alongside timeline_events."""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from timeline.counters import UPSERT_CHUNK, event_totals, hourly_activity, record_counts, source_dir
+from timeline.db import create_timeline_engine
+from timeline.models import Base
+
+START = datetime(2026, 10, 1, 9, 15)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_timeline_engine(f"sqlite:///{tmp_path / 'timeline.db'}")
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def test_source_dir():
+    assert source_dir('src/app/main.py') == 'src/app'
+    assert source_dir('shell') == 'shell'
+    assert source_dir(None) == ''
+
+
+def test_record_counts_accumulates(engine):
+    rows = [
+        {'event_type': 'file_change', 'source': 'src/a.py', 'timestamp': START},
+        {'event_type': 'file_change', 'source': 'src/b.py', 'timestamp': START + timedelta(minutes=30)},
+        {'event_type': 'terminal', 'source': 'shell', 'timestamp': START + timedelta(hours=1)},
+    ]
+    with sessionmaker(bind=engine)() as session:
+        record_counts(session, rows)
+        record_counts(session, rows[:1])
+        session.commit()
+
+        assert event_totals(session) == {'total': 4, 'by_type': {'file_change': 3, 'terminal': 1}}
+        assert hourly_activity(session) == [
+            (START.replace(minute=0), 3),
+            (START.replace(minute=0) + timedelta(hours=1), 1),
+        ]
+        assert hourly_activity(session, event_type='terminal') == [(START.replace(minute=0) + timedelta(hours=1), 1)]
+        # Bounds are whole hours
+        assert hourly_activity(session, since=START + timedelta(minutes=40)) == hourly_activity(session)
+        assert hourly_activity(session, until=START.replace(minute=0) + timedelta(hours=1)) == [(START.replace(minute=0), 3)]
+
+
+def test_large_batches_stay_under_sqlite_variable_limit(engine):
+    statements = []
+    event.listen(engine, 'before_cursor_execute',
+                 lambda conn, cursor, statement, parameters, context, many: statements.append(parameters))
+    rows = [
+        {'event_type': 'file_change', 'source': f'dir{i}/f.py', 'timestamp': START}
+        for i in range(UPSERT_CHUNK * 2 + 1)
+    ]
+    with sessionmaker(bind=engine)() as session:
+        record_counts(session, rows)
+        session.commit()
+        assert event_totals(session)['total'] == len(rows)
+
+    assert max(len(parameters) for parameters in statements) <= 999
@@ -0,0 +1,104 @@
+"""Agent LLM calls go through the shared rate limiter and response cache.
+
+Runs a real crewai Agent against a local stand-in for the OpenAI API.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip('crewai')
+pytest.importorskip('langchain_openai')
+
+from crewai import Agent, Crew, Task  # noqa: E402
+
+from crews.clients import CrewLLM, create_llm  # noqa: E402
+from crews.llm_cache import LLMCache  # noqa: E402
+from crews.rate_limit import RateLimiter  # noqa: E402
+
+ANSWER = "Thought: I now know the final answer\nFinal Answer: Use a bounded queue."
+
+
+class FakeOpenAI(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.requests.append(body)
+        payload = json.dumps({
+            'id': f'chatcmpl-{len(self.requests)}', 'object': 'chat.completion', 'created': 0,
+            'model': body['model'],
+            'choices': [{'index': 0, 'finish_reason': 'stop',
+                         'message': {'role': 'assistant', 'content': ANSWER}}],
+            'usage': {'prompt_tokens': 50, 'completion_tokens': 10, 'total_tokens': 60},
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api(monkeypatch):
+    monkeypatch.setenv('OPENAI_API_KEY', 'sk-test')
+    monkeypatch.setenv('CREWAI_DISABLE_TELEMETRY', 'true')
+    monkeypatch.setenv('OTEL_SDK_DISABLED', 'true')
+    FakeOpenAI.requests = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeOpenAI)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_port}/v1'
+    server.shutdown()
+
+
+class CountingLimiter(RateLimiter):
+    def __init__(self):
+        super().__init__()
+        self.acquired = []
+
+    def acquire(self, key, tokens=0):
+        self.acquired.append(key)
+        return super().acquire(key, tokens)
+
+
+def run_agent(llm):
+    agent = Agent(role='Reviewer', goal='Review designs', backstory='A careful engineer.', llm=llm)
+    task = Task(description='How should the watcher buffer events?', expected_output='One sentence.',
+                agent=agent)
+    return str(Crew(agents=[agent], tasks=[task]).kickoff())
+
+
+def test_agent_keeps_our_llm(api):
+    llm = create_llm(base_url=api, cache=False)
+    agent = Agent(role='Reviewer', goal='Review designs', backstory='A careful engineer.', llm=llm)
+    assert isinstance(agent.llm, CrewLLM)
+    assert agent.llm.chat_model is llm.chat_model
+
+
+def test_agent_calls_are_rate_limited(api):
+    limiter = CountingLimiter()
+    result = run_agent(create_llm(base_url=api, limiter=limiter, cache=False))
+
+    assert 'bounded queue' in result
+    assert len(FakeOpenAI.requests) >= 1
+    assert limiter.acquired == ['openai/gpt-3.5-turbo'] * len(FakeOpenAI.requests)
+
+
+def test_repeated_agent_call_is_served_from_cache(api, tmp_path):
+    cache = LLMCache(path=tmp_path / 'llm_cache.db')
+    limiter = CountingLimiter()
+    llm = create_llm(base_url=api, limiter=limiter, cache=cache)
+
+    first = run_agent(llm)
+    calls = len(FakeOpenAI.requests)
+    second = run_agent(llm)
+
+    assert first == second
+    assert len(FakeOpenAI.requests) == calls
+    assert cache.stats()['hits'] >= 1
+    # Cache hits never spend rate-limit budget
+    assert len(limiter.acquired) == calls
@@ -0,0 +1,91 @@
+"""Unified diffs with periodic keyframes for file snapshots."""
+from timeline.blobs import BlobStore
+from timeline.diffs import DiffTracker
+
+BASE = ''.join(f'line {i}\n' for i in range(40)).encode()
+
+
+def edit(data, index, text):
+    lines = data.decode().splitlines(keepends=True)
+    lines[index] = text
+    return ''.join(lines).encode()
+
+
+def test_first_capture_is_a_keyframe():
+    result = DiffTracker().capture('a.py', BASE)
+    assert result['snapshot'] == BASE
+    assert result['content'] is None
+    assert result['diff'] == {'keyframe': True, 'base': BlobStore.digest(BASE), 'lines': 40}
+
+
+def test_small_change_is_a_diff_against_the_keyframe():
+    tracker = DiffTracker()
+    tracker.capture('a.py', BASE)
+    changed = edit(BASE, 10, 'line ten\nextra\n')
+    result = tracker.capture('a.py', changed)
+
+    assert result['snapshot'] is None
+    assert result['diff']['keyframe'] is False
+    assert result['diff']['base'] == BlobStore.digest(BASE)
+    assert (result['diff']['added'], result['diff']['removed']) == (2, 1)
+    assert result['diff']['bytes'] == len(result['content'])
+    assert '-line 10\n' in result['content'] and '+line ten\n' in result['content']
+
+
+def test_unchanged_save_has_no_diff_text():
+    tracker = DiffTracker()
+    tracker.capture('a.py', BASE)
+    result = tracker.capture('a.py', BASE)
+    assert result['content'] is None
+    assert (result['diff']['added'], result['diff']['removed']) == (0, 0)
+
+
+def test_keyframe_interval():
+    tracker = DiffTracker(keyframe_interval=3)
+    data = BASE
+    kinds = [tracker.capture('a.py', data)['diff']['keyframe']]
+    for i in range(6):
+        data = edit(data, i, f'edit {i}\n')
+        kinds.append(tracker.capture('a.py', data)['diff']['keyframe'])
+    assert kinds == [True, False, False, True, False, False, True]
+
+
+def test_large_diff_falls_back_to_a_keyframe():
+    tracker = DiffTracker()
+    tracker.capture('a.py', BASE)
+    rewritten = ''.join(f'other {i}\n' for i in range(40)).encode()
+    result = tracker.capture('a.py', rewritten)
+
+    assert result['diff']['keyframe'] is True
+    assert result['snapshot'] == rewritten
+    assert result['diff']['base'] == BlobStore.digest(rewritten)
+    # The diff is still recorded alongside the snapshot
+    assert (result['diff']['added'], result['diff']['removed']) == (40, 40)
+    assert result['content'].startswith('--- a.py')
+
+    # Later diffs descend from the new keyframe
+    later = tracker.capture('a.py', edit(rewritten, 0, 'first\n'))
+    assert later['diff']['base'] == BlobStore.digest(rewritten)
+
+
+def test_binary_and_undecodable_content_is_snapshotted():
+    tracker = DiffTracker(max_text_bytes=100)
+    tracker.capture('a.py', BASE[:50])
+    for data in (b'\x89PNG\0\0\0data', b'\xff\xfe not utf-8', b'x' * 101):
+        result = tracker.capture('a.py', data)
+        assert result == {'content': None, 'snapshot': data, 'diff': {'keyframe': True, 'binary': True}}
+
+    # History was dropped, so the next text version starts over with a keyframe
+    assert tracker.capture('a.py', BASE[:50])['diff']['keyframe'] is True
+
+
+def test_least_recently_changed_files_are_forgotten():
+    tracker = DiffTracker(max_files=2)
+    for name in ('a.py', 'b.py', 'c.py'):
+        tracker.capture(name, BASE)
+    assert list(tracker._last) == ['b.py', 'c.py']
+
+    tracker.capture('b.py', edit(BASE, 0, 'changed\n'))
+    tracker.capture('d.py', BASE)
+    assert list(tracker._last) == ['b.py', 'd.py']
+    assert tracker.capture('a.py', edit(BASE, 0, 'changed\n'))['diff']['keyframe'] is True
@@ -0,0 +1,67 @@
+"""DocCache: page reuse, stamps and invalidation."""
+from crews.visualization.doc_cache import DocCache
+
+
+def render(path, calls):
+    def build():
+        calls.append(path)
+        return f"<p>{path.read_text()}</p>"
+    return build
+
+
+def test_page_is_reused_until_its_source_changes(tmp_path):
+    doc = tmp_path / 'guide.md'
+    doc.write_text('one')
+    cache = DocCache(tmp_path)
+    calls = []
+
+    first = cache.page('guide', [doc], render(doc, calls))
+    assert cache.page('guide', [doc], render(doc, calls)) is first
+    doc.write_text('two, longer')
+    assert cache.page('guide', [doc], render(doc, calls)).html == '<p>two, longer</p>'
+    assert len(calls) == 2
+    assert cache.stats() == {'pages': 1, 'hits': 1, 'misses': 2}
+
+
+def test_watching_cache_serves_until_invalidated(tmp_path):
+    doc = tmp_path / 'guide.md'
+    doc.write_text('one')
+    cache = DocCache(tmp_path)
+    cache.watching = True
+    calls = []
+
+    cache.page('guide', [doc], render(doc, calls))
+    doc.write_text('two, longer')
+    assert cache.page('guide', [doc], render(doc, calls)).html == '<p>one</p>'
+    cache.invalidate(doc)
+    assert cache.page('guide', [doc], render(doc, calls)).html == '<p>two, longer</p>'
+
+
+def test_render_overlapping_an_invalidation_is_not_stored(tmp_path):
+    doc = tmp_path / 'guide.md'
+    doc.write_text('one')
+    cache = DocCache(tmp_path)
+    cache.watching = True
+
+    def racing_build():
+        html = f"<p>{doc.read_text()}</p>"
+        # The file changes (and the watcher fires) while this render runs
+        doc.write_text('two, longer')
+        cache.invalidate(doc)
+        return html
+
+    assert cache.page('guide', [doc], racing_build).html == '<p>one</p>'
+    assert cache.page('guide', [doc], render(doc, [])).html == '<p>two, longer</p>'
+
+
+def test_tree_and_navigation_rebuilt_after_structure_change(tmp_path):
+    (tmp_path / 'a_guide.md').write_text('a')
+    cache = DocCache(tmp_path)
+    cache.watching = True
+    build = lambda tree: ','.join(item['title'] for item in tree)
+
+    assert cache.navigation(build) == 'A Guide'
+    (tmp_path / 'b_notes.md').write_text('b')
+    assert cache.navigation(build) == 'A Guide'
+    cache.invalidate(structure=True)
+    assert cache.navigation(build) == 'A Guide,B Notes'
@@ -0,0 +1,129 @@
+"""Streaming export of timeline events to JSON Lines, Parquet and Arrow."""
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import Session
+
+from timeline.db import create_timeline_engine
+from timeline.export import export_events
+from timeline.models import Base, CursorEventType, TimelineEvent
+from timeline.partitions import compact
+
+START = datetime(2026, 10, 1, 9)
+
+
+def make_event(i):
+    # Every chunk of three brings new sources and actions, so the
+    # dictionaries keep growing from batch to batch
+    return TimelineEvent(
+        timestamp=START + timedelta(hours=i),
+        event_type='cursor' if i % 4 == 0 else 'file_change',
+        source=f'src/module_{i // 2}.py',
+        action=f'action_{i // 3}',
+        details={'n': i, 'nested': {'even': i % 2 == 0}},
+        content=f'content {i}' if i % 5 else None,
+        cursor_event_type=CursorEventType.CHAT if i % 4 == 0 else None,
+        code_changes=[{'line': i}] if i % 3 == 0 else None,
+    )
+
+
+def expected(i, id):
+    event = make_event(i)
+    return {
+        'id': id, 'timestamp': event.timestamp, 'event_type': event.event_type,
+        'source': event.source, 'action': event.action, 'details': event.details,
+        'content': event.content, 'content_digest': None,
+        'cursor_event_type': 'chat' if event.cursor_event_type else None,
+        'user_input': None, 'ai_response': None, 'code_changes': event.code_changes,
+    }
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_timeline_engine(f"sqlite:///{tmp_path / 'timeline.db'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all(make_event(i) for i in range(10))
+        session.commit()
+    yield engine
+    engine.dispose()
+
+
+def read_jsonl(path):
+    rows = [json.loads(line) for line in path.read_text().splitlines()]
+    for row in rows:
+        row['timestamp'] = datetime.fromisoformat(row['timestamp'])
+    return rows
+
+
+def read_arrow_table(path, format):
+    pyarrow = pytest.importorskip('pyarrow')
+    if format == 'parquet':
+        import pyarrow.parquet
+        table = pyarrow.parquet.read_table(path)
+    else:
+        import pyarrow.ipc
+        with pyarrow.ipc.open_file(path) as reader:
+            table = reader.read_all()
+    rows = table.to_pylist()
+    for row in rows:
+        for column in ('details', 'code_changes'):
+            row[column] = json.loads(row[column]) if row[column] is not None else None
+    return table, rows
+
+
+def export(engine, tmp_path, format, **bounds):
+    output = tmp_path / f'events.{format}'
+    with Session(engine) as session:
+        written = export_events(session, output, format=format, chunk_size=3, **bounds)
+    return written, output
+
+
+def test_jsonl_round_trip(engine, tmp_path):
+    written, output = export(engine, tmp_path, 'jsonl')
+    assert written == 10
+    assert read_jsonl(output) == [expected(i, i + 1) for i in range(10)]
+
+
+@pytest.mark.parametrize('format', ['parquet', 'arrow'])
+def test_columnar_round_trip(engine, tmp_path, format):
+    pytest.importorskip('pyarrow')
+    written, output = export(engine, tmp_path, format)
+    table, rows = read_arrow_table(output, format)
+
+    assert written == 10
+    assert rows == [expected(i, i + 1) for i in range(10)]
+    assert str(table.schema.field('source').type) == 'dictionary<values=string, indices=int32, ordered=0>'
+    # chunk_size=3: four batches, each adding to the dictionaries
+    assert len(table.to_batches()) == 4
+
+
+@pytest.mark.parametrize('format', ['jsonl', 'parquet', 'arrow'])
+def test_since_and_until_bound_the_export(engine, tmp_path, format):
+    if format != 'jsonl':
+        pytest.importorskip('pyarrow')
+    written, output = export(engine, tmp_path, format,
+                             since=START + timedelta(hours=2), until=START + timedelta(hours=7))
+    rows = read_jsonl(output) if format == 'jsonl' else read_arrow_table(output, format)[1]
+
+    assert written == 5
+    assert [row['id'] for row in rows] == [3, 4, 5, 6, 7]
+
+
+def test_archived_months_are_exported_in_order(engine, tmp_path):
+    with Session(engine) as session:
+        session.add(TimelineEvent(timestamp=datetime(2026, 5, 2), event_type='terminal', source='shell'))
+        session.commit()
+    compact(engine, keep_months=3, retention_months=0, now=datetime(2026, 10, 15))
+
+    written, output = export(engine, tmp_path, 'jsonl')
+    rows = read_jsonl(output)
+    assert written == 11
+    assert rows[0]['timestamp'] == datetime(2026, 5, 2)
+    assert [row['id'] for row in rows[1:]] == list(range(1, 11))
+
+
+def test_unknown_format(engine, tmp_path):
+    with Session(engine) as session, pytest.raises(ValueError, match="Unknown export format"):
+        export_events(session, tmp_path / 'out.csv', format='csv')
@@ -0,0 +1,47 @@
+"""Conditional requests and compression for dev docs pages."""
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from crews.visualization.doc_cache import make_page
+from crews.visualization.http_cache import add_compression, conditional_html
+
+PAGE = "<html><body>" + "<p>DEV-MAN</p>" * 500 + "</body></html>"
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+
+    @app.get("/page")
+    def page(request: Request):
+        return conditional_html(request, PAGE)
+
+    add_compression(app)
+    return TestClient(app)
+
+
+def test_etag_is_weak_and_shared_by_encodings(client):
+    gzipped = client.get("/page", headers={"Accept-Encoding": "gzip"})
+    identity = client.get("/page", headers={"Accept-Encoding": "identity"})
+
+    assert gzipped.headers["content-encoding"] in ("gzip", "br")
+    assert "content-encoding" not in identity.headers
+    assert gzipped.headers["etag"].startswith('W/"')
+    assert gzipped.headers["etag"] == identity.headers["etag"] == make_page(PAGE).etag
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "identity"])
+def test_every_response_varies_by_accept_encoding(client, encoding):
+    response = client.get("/page", headers={"Accept-Encoding": encoding})
+    assert [v.strip().lower() for v in response.headers["vary"].split(",")] == ["accept-encoding"]
+
+
+def test_revalidation_returns_304(client):
+    etag = client.get("/page").headers["etag"]
+    for tag in (etag, etag.removeprefix("W/")):
+        response = client.get("/page", headers={"If-None-Match": tag, "Accept-Encoding": "gzip"})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert "accept-encoding" in response.headers["vary"].lower()
+    assert client.get("/page", headers={"If-None-Match": 'W/"stale"'}).status_code == 200
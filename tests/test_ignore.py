@@ -0,0 +1,156 @@
+"""gitignore-compatible path matching for the file watcher."""
+import shutil
+import subprocess
+
+import pytest
+
+from timeline.ignore import DEFAULT_IGNORES, IgnoreMatcher
+
+PATTERNS = [
+    '# comment',
+    '',
+    '*.log',
+    '!keep.log',
+    'build/',
+    '/dist',
+    'docs/**/*.tmp',
+    '**/cache',
+    'secret?.txt',
+    'data[0-9].csv',
+    r'\#notes',
+    'trailing   ',
+]
+
+
+@pytest.fixture
+def matcher(tmp_path):
+    return IgnoreMatcher(tmp_path, PATTERNS)
+
+
+@pytest.mark.parametrize('path, ignored', [
+    ('app.log', True),
+    ('src/deep/app.log', True),
+    ('keep.log', False),
+    ('src/keep.log', False),
+    ('app.py', False),
+    ('dist', True),
+    ('src/dist', False),
+    ('docs/a.tmp', True),
+    ('docs/a/b/c.tmp', True),
+    ('src/docs/a.tmp', False),
+    ('secret1.txt', True),
+    ('secret12.txt', False),
+    ('data7.csv', True),
+    ('dataX.csv', False),
+    ('#notes', True),
+    ('trailing', True),
+])
+def test_files(matcher, path, ignored):
+    assert matcher.is_ignored(path) is ignored
+
+
+def test_dir_only_patterns(matcher):
+    assert matcher.is_ignored('build', is_dir=True)
+    assert not matcher.is_ignored('build')
+    assert matcher.is_ignored('src/build', is_dir=True)
+
+
+def test_paths_under_ignored_directories(matcher, tmp_path):
+    assert matcher.is_ignored('build/out.py')
+    assert matcher.is_ignored('a/cache/b/c.py')
+    # A negation can't re-include a file inside an ignored directory
+    assert matcher.is_ignored('build/keep.log')
+    assert matcher.is_ignored(tmp_path / 'dist' / 'bundle.js')
+
+
+def test_paths_outside_root_are_not_ignored(matcher, tmp_path):
+    assert not matcher.is_ignored(tmp_path.parent / 'app.log')
+    assert not matcher.is_ignored(tmp_path)
+
+
+def test_for_root_reads_ignore_files(tmp_path):
+    (tmp_path / '.gitignore').write_text('*.bak\n')
+    (tmp_path / '.timelineignore').write_text('!important.bak\nscratch/\n')
+    matcher = IgnoreMatcher.for_root(tmp_path)
+
+    assert matcher.is_ignored('old.bak')
+    assert not matcher.is_ignored('important.bak')
+    assert matcher.is_ignored('scratch', is_dir=True)
+    assert matcher.is_ignored('mod.pyc')
+    assert matcher.is_ignored('node_modules/pkg/index.js')
+    assert len(matcher.patterns) == len(DEFAULT_IGNORES) + 3
+
+
+def test_empty_matcher_ignores_nothing(tmp_path):
+    matcher = IgnoreMatcher(tmp_path)
+    assert not matcher.is_ignored('anything.pyc')
+    assert not matcher.is_ignored('dir', is_dir=True)
+
+
+@pytest.mark.skipif(shutil.which('git') is None, reason="needs git")
+def test_agrees_with_git(tmp_path):
+    subprocess.run(['git', 'init', '-q', str(tmp_path)], check=True)
+    (tmp_path / '.gitignore').write_text('\n'.join(PATTERNS) + '\n')
+    paths = [
+        'app.log', 'keep.log', 'src/keep.log', 'dist', 'src/dist', 'docs/x/y.tmp',
+        'src/docs/a.tmp', 'cache/a.py', 'secret1.txt', 'secret12.txt', 'data7.csv',
+        '#notes', 'trailing', 'build/out.py', 'build/keep.log', 'src/app.py',
+    ]
+    for path in paths:
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).touch()
+    result = subprocess.run(
+        ['git', 'check-ignore', '--no-index', *paths],
+        cwd=tmp_path, capture_output=True, text=True
+    )
+    git_ignored = set(result.stdout.splitlines())
+    assert 'app.log' in git_ignored and 'src/app.py' not in git_ignored
+
+    matcher = IgnoreMatcher.for_root(tmp_path, patterns=[])
+    assert {path for path in paths if matcher.is_ignored(path)} == git_ignored
+
+
+BRACKET_CASES = [
+    ('[]a]', ']', True),
+    ('[]a]', 'a', True),
+    ('[]a]', 'b', False),
+    ('[!]x]', 'y', True),
+    ('[!]x]', ']', False),
+    ('[!]x]', 'x', False),
+    ('[[]x', '[x', True),
+]
+
+# An unclosed class is a literal '[', as in fnmatch (git's wildmatch
+# instead never matches such a pattern)
+UNCLOSED_CASES = [
+    ('[]', '[]', True),
+    ('a[]b', 'a[]b', True),
+    ('a[]b', 'ab', False),
+    ('x[', 'x[', True),
+    ('[ab', '[ab', True),
+]
+
+
+@pytest.mark.parametrize('pattern, path, ignored', BRACKET_CASES + UNCLOSED_CASES)
+def test_bracket_edge_cases(tmp_path, pattern, path, ignored):
+    matcher = IgnoreMatcher(tmp_path, [pattern])
+    assert matcher.is_ignored(path) is ignored
+
+
+def test_ignore_file_with_odd_brackets_loads(tmp_path):
+    (tmp_path / '.gitignore').write_text('[]\na[]b\n[!]x]\nx[\n')
+    matcher = IgnoreMatcher.for_root(tmp_path, patterns=[])
+    assert matcher.is_ignored('a[]b')
+    assert not matcher.is_ignored('main.py')
+
+
+@pytest.mark.skipif(shutil.which('git') is None, reason="needs git")
+@pytest.mark.parametrize('pattern, path, ignored', BRACKET_CASES)
+def test_brackets_agree_with_git(tmp_path, pattern, path, ignored):
+    subprocess.run(['git', 'init', '-q', str(tmp_path)], check=True)
+    (tmp_path / '.gitignore').write_text(pattern + '\n')
+    (tmp_path / path).touch()
+    result = subprocess.run(
+        ['git', 'check-ignore', '--no-index', path], cwd=tmp_path, capture_output=True, text=True
+    )
+    assert (result.returncode == 0) is ignored
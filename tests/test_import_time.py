@@ -0,0 +1,37 @@
+"""Import-time budgets for the timeline and dev-docs entry points.
+
+Each check imports the module in a fresh interpreter under
+``python -X importtime`` (see scripts/import_time_report.py).
+"""
+import pytest
+
+from scripts.import_time_report import BUDGETS_MS, check, measure, parse_importtime
+
+ENTRY_POINTS = ['timeline', 'timeline.cli', 'crews.visualization.metrics',
+                'crews.visualization.dev_docs_server']
+
+
+def test_parse_importtime():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   json.decoder\n"
+        "import time:       300 |        420 | json\n"
+    )
+    assert parse_importtime(stderr) == [
+        ('json.decoder', 120, 120, 1),
+        ('json', 300, 420, 0),
+    ]
+
+
+@pytest.mark.parametrize('module', ENTRY_POINTS)
+def test_entry_point_import_budget(module):
+    report = measure(module)
+    assert check(report) == [], f"{module}: {'; '.join(check(report))}"
+    assert report['total_ms'] <= BUDGETS_MS[module]
+
+
+def test_timeline_exports_stay_lazy():
+    report = measure('timeline')
+    imported = {name for name, _, _, _ in report['rows']}
+    assert 'timeline.analyzer_crew' not in imported
+    assert not any(name.split('.')[0] in ('crewai', 'langchain') for name in imported)
@@ -0,0 +1,200 @@
+"""Ingest protocol: NDJSON encoding, the daemon, and the client's spool."""
+import asyncio
+import socket
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from timeline.db import create_timeline_engine
+from timeline import ingest
+from timeline.ingest import (
+    IngestClient, IngestServer, decode_event, encode_event, fcntl, parse_address, spool_lock
+)
+from timeline.models import Base, CursorEventType, TimelineBlob, TimelineEvent
+
+
+def event(i, **extra):
+    return {'timestamp': datetime(2026, 10, 1, 12) + timedelta(seconds=i), 'event_type': 'terminal',
+            'source': 'shell', 'action': 'command', 'content': f'echo {i}', **extra}
+
+
+@pytest.fixture
+def sessions(tmp_path):
+    engine = create_timeline_engine(f"sqlite:///{tmp_path / 'timeline.db'}")
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def test_parse_address():
+    assert parse_address('127.0.0.1:7070') == ('tcp', ('127.0.0.1', 7070))
+    assert parse_address('timeline/data/ingest.sock') == ('unix', 'timeline/data/ingest.sock')
+
+
+def test_encode_round_trip():
+    mapping = event(1, snapshot=b'\x00\xffdata', cursor_event_type=CursorEventType.CHAT)
+    line = encode_event(mapping)
+    assert line.endswith(b'\n') and line.count(b'\n') == 1
+    assert decode_event(line) == mapping
+
+
+def test_daemon_writes_events_and_replays_spool(tmp_path, sessions):
+    address = str(tmp_path / 'ingest.sock')
+    spool = tmp_path / 'ingest.spool'
+    # Spooled while the daemon was down
+    offline = IngestClient(address, spool_path=spool)
+    assert offline.send_many([event(0), event(1)])
+    assert (offline.sent, offline.spooled) == (0, 2)
+
+    async def scenario():
+        server = await IngestServer(sessions, address=address, spool_path=spool,
+                                    flush_interval=0.01).start()
+        client = IngestClient(address, spool_path=spool)
+        await asyncio.to_thread(client.send_many, [event(2, snapshot=b'print(1)\n'), event(3)])
+        await asyncio.sleep(0.1)
+        await server.stop()
+        client.close()
+        return server, client
+
+    server, client = asyncio.run(scenario())
+    assert client.sent == 2 and client.spooled == 0
+    assert server.written == 4
+    assert not spool.exists()
+    with sessions() as session:
+        assert sorted(e.content for e in session.query(TimelineEvent)) == [f'echo {i}' for i in range(4)]
+        assert session.query(TimelineBlob).count() == 1
+
+
+def test_failed_commit_is_spooled_and_retried(tmp_path, sessions, monkeypatch):
+    address = str(tmp_path / 'ingest.sock')
+    spool = tmp_path / 'ingest.spool'
+    attempts = []
+    write_rows = ingest.write_rows
+
+    def fail_once(session_factory, rows, blob_store):
+        attempts.append(len(rows))
+        if len(attempts) == 1:
+            rows[0].pop('snapshot')  # Like write_rows, before the commit fails
+            return False
+        return write_rows(session_factory, rows, blob_store)
+
+    monkeypatch.setattr(ingest, 'write_rows', fail_once)
+
+    async def scenario():
+        server = await IngestServer(sessions, address=address, spool_path=spool,
+                                    flush_interval=0.01).start()
+        client = IngestClient(address, spool_path=spool)
+        await asyncio.to_thread(client.send_many, [event(0, snapshot=b'print(1)\n'), event(1)])
+        await asyncio.sleep(0.1)
+        assert (server.written, server.respooled) == (0, 2)
+        await server.replay_spool()
+        await server.stop()
+        client.close()
+        return server
+
+    server = asyncio.run(scenario())
+    assert attempts == [2, 2]
+    assert (server.written, server.dropped) == (2, 0)
+    assert not spool.exists()
+    with sessions() as session:
+        assert session.query(TimelineEvent).count() == 2
+        assert session.query(TimelineBlob).count() == 1
+
+
+class FlakySocket:
+    """Accepts ``limit`` bytes, then fails as if the daemon died"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.received = b''
+
+    def send(self, data):
+        if len(self.received) >= self.limit:
+            raise BrokenPipeError("daemon went away")
+        chunk = bytes(data[:min(len(data), self.limit - len(self.received), 7)])
+        self.received += chunk
+        return len(chunk)
+
+
+def test_partial_send_spools_only_undelivered_lines(tmp_path, monkeypatch):
+    monkeypatch.setattr('timeline.ingest.select.select', lambda r, w, x, t: ([], w, []))
+    mappings = [event(i) for i in range(5)]
+    lines = [encode_event(m) for m in mappings]
+    flaky = FlakySocket(len(lines[0]) + len(lines[1]) + 3)
+    client = IngestClient(tmp_path / 'ingest.sock', spool_path=tmp_path / 'ingest.spool')
+    client._connect = lambda: flaky
+
+    assert client.send_many(mappings)
+    assert (client.sent, client.spooled) == (2, 3)
+    assert (tmp_path / 'ingest.spool').read_bytes() == b''.join(lines[2:])
+
+
+def test_backpressure_waits_instead_of_spooling(tmp_path):
+    daemon, producer = socket.socketpair()
+    producer.setblocking(False)
+    client = IngestClient(tmp_path / 'ingest.sock', spool_path=tmp_path / 'ingest.spool', timeout=0.05)
+    client._connect = lambda: producer
+    mappings = [event(i, content='x' * 4096) for i in range(200)]
+    expected = b''.join(encode_event(m) for m in mappings)
+
+    received = bytearray()
+
+    def slow_reader():
+        while len(received) < len(expected):
+            time.sleep(0.01)
+            received.extend(daemon.recv(4096))
+
+    reader = threading.Thread(target=slow_reader)
+    reader.start()
+    assert client.send_many(mappings)
+    reader.join(timeout=30)
+
+    assert client.spooled == 0
+    assert bytes(received) == expected
+    daemon.close()
+    producer.close()
+
+
+def test_stalled_daemon_spools_the_rest(tmp_path):
+    daemon, producer = socket.socketpair()
+    producer.setblocking(False)
+    client = IngestClient(tmp_path / 'ingest.sock', spool_path=tmp_path / 'ingest.spool',
+                          timeout=0.05, stall_timeout=0.2)
+    client._connect = lambda: producer
+    mappings = [event(i, content='x' * 4096) for i in range(500)]
+
+    assert client.send_many(mappings)
+    assert client.spooled > 0
+    assert client.sent + client.spooled == len(mappings)
+    spooled = (tmp_path / 'ingest.spool').read_bytes()
+    assert spooled.count(b'\n') == client.spooled
+    assert decode_event(spooled.split(b'\n')[0])['content'].startswith('xxx')
+    daemon.close()
+    producer.close()
+
+
+@pytest.mark.skipif(fcntl is None, reason="needs fcntl")
+def test_replay_waits_for_clients_appending_to_the_spool(tmp_path, sessions):
+    spool = tmp_path / 'ingest.spool'
+    spool.write_bytes(encode_event(event(0)))
+    server = IngestServer(sessions, address=str(tmp_path / 'ingest.sock'), spool_path=spool)
+
+    async def replay():
+        server.queue = asyncio.Queue()
+        return await server.replay_spool()
+
+    with spool_lock(spool):
+        replayer = threading.Thread(target=lambda: asyncio.run(replay()))
+        replayer.start()
+        time.sleep(0.2)
+        # A client holding the lock can still finish its append
+        assert spool.exists()
+        with open(spool, 'ab') as f:
+            f.write(encode_event(event(1)))
+    replayer.join(timeout=5)
+
+    assert not spool.exists()
+    assert server.queue.qsize() == 2
@@ -0,0 +1,55 @@
+"""LangChain LLM response cache."""
+import pytest
+
+pytest.importorskip('langchain_core')
+
+from langchain_core.messages import AIMessage  # noqa: E402
+from langchain_core.outputs import ChatGeneration, Generation  # noqa: E402
+
+from crews import llm_cache  # noqa: E402
+from crews.llm_cache import LLMCache, cache_key, get_llm_cache  # noqa: E402
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LLMCache(path=tmp_path / 'llm_cache.db')
+
+
+def test_key_covers_prompt_and_model_settings():
+    key = cache_key('prompt', 'gpt-3.5-turbo temperature=0.7')
+    assert key == cache_key('prompt', 'gpt-3.5-turbo temperature=0.7')
+    assert key != cache_key('prompt', 'gpt-3.5-turbo temperature=0.2')
+    assert key != cache_key('other prompt', 'gpt-3.5-turbo temperature=0.7')
+
+
+def test_generations_round_trip(cache):
+    generations = [ChatGeneration(message=AIMessage(content='Use a bounded queue.'))]
+    assert cache.lookup('prompt', 'llm') is None
+    cache.update('prompt', 'llm', generations)
+
+    cached = cache.lookup('prompt', 'llm')
+    assert cached[0].message.content == 'Use a bounded queue.'
+    assert cache.lookup('prompt', 'other llm') is None
+    assert cache.stats()['hits'] == 1
+
+
+def test_unreadable_entry_is_a_miss(cache):
+    cache.store.put(cache_key('prompt', 'llm'), 'not json')
+    assert cache.lookup('prompt', 'llm') is None
+
+
+def test_clear(cache):
+    cache.update('prompt', 'llm', [Generation(text='answer')])
+    cache.clear()
+    assert cache.lookup('prompt', 'llm') is None
+
+
+def test_process_cache_can_be_disabled(monkeypatch, tmp_path):
+    monkeypatch.setattr(llm_cache, '_cache', None)
+    monkeypatch.setenv('CREW_LLM_CACHE', 'off')
+    assert get_llm_cache() is None
+
+    monkeypatch.setenv('CREW_LLM_CACHE', str(tmp_path / 'shared.db'))
+    cache = get_llm_cache()
+    assert cache.store.path == tmp_path / 'shared.db'
+    assert get_llm_cache() is cache
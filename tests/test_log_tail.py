@@ -0,0 +1,53 @@
+"""Log tailing: backwards reads, following appends, and SSE framing."""
+import asyncio
+
+from crews.visualization.log_tail import follow, read_tail, sse_event
+
+
+def test_read_tail_pages_backwards(tmp_path):
+    log = tmp_path / 'app.log'
+    log.write_text(''.join(f'line {i}\n' for i in range(100)))
+
+    last, start = read_tail(log, lines=10, block_size=16)
+    assert last == [f'line {i}' for i in range(90, 100)]
+    earlier, start = read_tail(log, lines=95, before=start, block_size=16)
+    assert earlier == [f'line {i}' for i in range(90)]
+    assert start == 0
+
+
+def test_read_tail_strips_crlf(tmp_path):
+    log = tmp_path / 'app.log'
+    log.write_bytes(b'one\r\ntwo\r\n')
+    assert read_tail(log, lines=5)[0] == ['one', 'two']
+
+
+def test_follow_yields_appended_lines_and_restarts_after_truncation(tmp_path):
+    log = tmp_path / 'app.log'
+    log.write_text('old\n')
+
+    async def collect():
+        lines = []
+        stream = follow(log, offset=log.stat().st_size, poll_interval=0.01)
+
+        async def next_line():
+            return await asyncio.wait_for(stream.__anext__(), timeout=2)
+
+        with open(log, 'a') as f:
+            f.write('new\npart')
+        lines.append(await next_line())
+        with open(log, 'a') as f:
+            f.write('ial\r\n')
+        lines.append(await next_line())
+        log.write_text('rotated\n')
+        lines.append(await next_line())
+        await stream.aclose()
+        return lines
+
+    assert asyncio.run(collect()) == [('new', 8), ('partial', 17), ('rotated', 8)]
+
+
+def test_sse_event_keeps_carriage_returns_out_of_fields():
+    assert sse_event('plain', 42) == 'id: 42\ndata: plain\n\n'
+    assert sse_event('10%\r50%\r100%') == 'data: 10%\ndata: 50%\ndata: 100%\n\n'
+    assert sse_event('a\r\nb\nc') == 'data: a\ndata: b\ndata: c\n\n'
+    assert sse_event('') == 'data: \n\n'
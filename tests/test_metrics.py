@@ -0,0 +1,92 @@
+"""Background metrics sampler behind the dev dashboard."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from crews.visualization.metrics import MetricsSampler
+from timeline.db import create_timeline_engine
+from timeline.models import Base, TimelineEvent
+from timeline.writer import write_rows
+from timeline.blobs import BlobStore
+
+SERVICES = [{"name": "Watcher", "port": None}]
+
+
+@pytest.fixture
+def logs_dir(tmp_path):
+    logs = tmp_path / 'logs'
+    logs.mkdir()
+    (logs / 'dev_docs.log').write_text('x' * 2048)
+    return logs
+
+
+def make_sampler(tmp_path, logs_dir, create_tables=True):
+    db_path = tmp_path / 'timeline.db'
+    engine = create_timeline_engine(f"sqlite:///{db_path}")
+    if create_tables:
+        Base.metadata.create_all(engine)
+        write_rows(sessionmaker(bind=engine), [
+            {'event_type': 'terminal', 'source': 'shell', 'action': 'command'},
+            {'event_type': 'file_change', 'source': 'src/a.py', 'action': 'modified'},
+        ], BlobStore())
+    else:
+        # A database that predates the counters table
+        TimelineEvent.__table__.create(engine)
+    return MetricsSampler(sessionmaker(bind=engine), db_path, logs_dir, services=SERVICES)
+
+
+def test_sample_collects_every_section(tmp_path, logs_dir):
+    snapshot = make_sampler(tmp_path, logs_dir).sample()
+
+    assert snapshot['unavailable'] == {}
+    assert set(snapshot['system']) == {'cpu_percent', 'memory_percent', 'disk_percent'}
+    assert snapshot['services'] == [{'name': 'Watcher', 'status': '⚪️ Unknown'}]
+    assert snapshot['database']['events'] == 2
+    assert snapshot['database']['by_type'] == {'terminal': 1, 'file_change': 1}
+    assert snapshot['logs'] == {'dev_docs.log': 2048}
+
+
+def test_failing_section_does_not_lose_the_snapshot(tmp_path, logs_dir):
+    sampler = make_sampler(tmp_path, logs_dir, create_tables=False)
+    snapshot = sampler.sample()
+
+    assert snapshot['database'] is None
+    assert 'timeline_event_counts' in snapshot['unavailable']['database']
+    assert snapshot['system'] is not None
+    assert snapshot['logs'] == {'dev_docs.log': 2048}
+
+
+def test_missing_database_file_reads_as_empty(tmp_path, logs_dir):
+    sampler = MetricsSampler(None, tmp_path / 'missing.db', logs_dir, services=SERVICES)
+    assert sampler.sample()['database'] == {'events': 0, 'size_bytes': 0}
+
+
+def test_background_loop_keeps_sampling(tmp_path, logs_dir):
+    sampler = make_sampler(tmp_path, logs_dir, create_tables=False)
+    sampler.interval = 0.01
+
+    async def run():
+        sampler.start()
+        while len(sampler.history) < 3:
+            await asyncio.sleep(0.01)
+        await sampler.stop()
+
+    asyncio.run(asyncio.wait_for(run(), 10))
+    assert sampler.latest['database'] is None
+    assert sampler.latest['system'] is not None
+
+
+def test_dashboard_marks_unavailable_sections(tmp_path, logs_dir, monkeypatch):
+    from crews.visualization.dev_docs_server import app
+
+    snapshot = make_sampler(tmp_path, logs_dir, create_tables=False).sample()
+    monkeypatch.setattr(app.state, 'metrics', SimpleNamespace(latest=snapshot), raising=False)
+    page = TestClient(app).get('/dev/dashboard').text
+
+    assert 'Collecting metrics' not in page
+    assert 'Unavailable' in page
+    assert 'dev_docs.log: 2.0 KB' in page
+    assert 'CPU: ' in page
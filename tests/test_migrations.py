@@ -0,0 +1,59 @@
+"""Alembic migrations upgrade databases that init_db already created."""
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+from alembic import command
+from alembic.config import Config
+
+from timeline.db import create_timeline_engine
+from timeline.models import Base
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def upgrade(url, revision='head'):
+    config = Config(str(ROOT / 'alembic.ini'))
+    config.set_main_option('script_location', str(ROOT / 'alembic'))
+    config.set_main_option('sqlalchemy.url', url)
+    command.upgrade(config, revision)
+
+
+@pytest.fixture
+def db_url(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'timeline.db'}"
+    # alembic/env.py prefers this over the ini file
+    monkeypatch.setenv('TIMELINE_DATABASE_URL', url)
+    return url
+
+
+def test_upgrade_empty_database(db_url):
+    upgrade(db_url)
+    inspector = sa.inspect(sa.create_engine(db_url))
+    assert inspector.has_table('timeline_blobs')
+    assert 'content_digest' in {c['name'] for c in inspector.get_columns('timeline_events')}
+
+
+def test_upgrade_database_created_by_init_db(db_url):
+    Base.metadata.create_all(create_timeline_engine(db_url))
+    upgrade(db_url, '0003')
+    inspector = sa.inspect(sa.create_engine(db_url))
+    assert inspector.has_table('timeline_blobs')
+
+
+def test_upgrade_to_head_after_init_db(db_url):
+    engine = create_timeline_engine(db_url)
+    Base.metadata.create_all(engine)
+    upgrade(db_url)
+    assert sa.inspect(sa.create_engine(db_url)).has_table('timeline_event_counts')
+
+
+def test_indexes_created_by_0002(db_url):
+    upgrade(db_url, '0002')
+    indexes = {i['name']: i['column_names'] for i in
+               sa.inspect(sa.create_engine(db_url)).get_indexes('timeline_events')}
+    assert indexes == {
+        'ix_timeline_events_timestamp': ['timestamp'],
+        'ix_timeline_events_type_timestamp': ['event_type', 'timestamp'],
+        'ix_timeline_events_source_timestamp': ['source', 'timestamp'],
+    }
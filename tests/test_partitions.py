@@ -0,0 +1,85 @@
+"""Monthly archives from `timeline compact` and reads across them."""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import Session, sessionmaker
+
+from timeline.db import create_timeline_engine
+from timeline.models import Base, TimelineEvent
+from timeline.partitions import MonthPartitions, add_months, compact, iter_sources
+
+NOW = datetime(2026, 10, 15)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_timeline_engine(f"sqlite:///{tmp_path / 'timeline.db'}")
+    Base.metadata.create_all(engine)
+    # Ten events a month from May to October
+    with Session(engine) as session:
+        for months_ago in range(6):
+            month = add_months(datetime(2026, 10, 1), -months_ago)
+            for i in range(10):
+                session.add(TimelineEvent(
+                    timestamp=month + timedelta(days=i, hours=1), event_type='file_change',
+                    source=f'src/{months_ago}/{i}.py', action='modified'
+                ))
+        session.commit()
+    yield engine
+    engine.dispose()
+
+
+def test_add_months():
+    assert add_months(datetime(2026, 11, 1), 2) == datetime(2027, 1, 1)
+    assert add_months(datetime(2026, 1, 1), -1) == datetime(2025, 12, 1)
+
+
+def test_compact_moves_old_months_to_archives(engine, tmp_path):
+    result = compact(engine, keep_months=3, retention_months=0, now=NOW)
+
+    assert sorted(result['archived']) == [datetime(2026, 5, 1), datetime(2026, 6, 1)]
+    assert all(count == 10 for count in result['archived'].values())
+    partitions = MonthPartitions(tmp_path / 'timeline.db')
+    assert partitions.months() == [datetime(2026, 5, 1), datetime(2026, 6, 1)]
+    assert partitions.overlapping(since=datetime(2026, 6, 10)) == [datetime(2026, 6, 1)]
+    with Session(engine) as session:
+        assert session.query(TimelineEvent).count() == 40
+
+
+def test_retention_drops_old_archives(engine, tmp_path):
+    result = compact(engine, keep_months=3, retention_months=4, now=NOW)
+    assert result['dropped'] == [datetime(2026, 5, 1)]
+    assert MonthPartitions(tmp_path / 'timeline.db').months() == [datetime(2026, 6, 1)]
+
+
+def test_iter_sources_visits_archives_and_main(engine):
+    compact(engine, keep_months=3, retention_months=0, now=NOW)
+    with Session(engine) as session:
+        oldest_first = [month for month, _ in iter_sources(session)]
+        newest_first = [month for month, _ in iter_sources(session, newest_first=True)]
+        recent = [month for month, _ in iter_sources(session, since=datetime(2026, 9, 1))]
+
+    assert oldest_first == [datetime(2026, 5, 1), datetime(2026, 6, 1), None]
+    assert newest_first == [None, datetime(2026, 6, 1), datetime(2026, 5, 1)]
+    assert recent == [None]
+
+
+def test_timeline_pages_continue_into_archives(engine):
+    from crews.visualization.dev_docs_server import query_timeline
+
+    compact(engine, keep_months=3, retention_months=0, now=NOW)
+    seen = []
+    cursor = None
+    with sessionmaker(bind=engine)() as session:
+        while True:
+            page = query_timeline(session, limit=7, cursor=cursor)
+            seen.extend(page['events'])
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+
+    timestamps = [event['timestamp'] for event in seen]
+    assert len(seen) == 60
+    assert len({event['id'] for event in seen}) == 60
+    assert timestamps == sorted(timestamps, reverse=True)
+    assert timestamps[-1].startswith('2026-05-01')
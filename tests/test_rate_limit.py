@@ -0,0 +1,167 @@
+"""Token-bucket rate limiter shared by crew LLM and search calls."""
+import pytest
+
+from crews import rate_limit
+from crews.rate_limit import MIN_SCALE, RateLimiter, rate_limited, retry_after
+
+
+class FakeTime:
+    """Stands in for the time module; sleeping advances the clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        # Like a real sleep, always let some time pass: a leftover wait of
+        # 1e-15s is lost against the clock's float and would never end
+        self.slept.append(seconds)
+        self.now += max(seconds, 0.001)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeTime()
+    monkeypatch.setattr(rate_limit, 'time', clock)
+    return clock
+
+
+def make_limiter(**limits):
+    return RateLimiter({'test/model': {'rpm': 60, 'tpm': 600, **limits}})
+
+
+def test_acquire_waits_for_the_request_bucket(clock):
+    limiter = make_limiter(tpm=None)
+    for _ in range(60):
+        assert limiter.acquire('test/model') == 0
+    # 60 rpm refills one request a second
+    assert limiter.acquire('test/model') == pytest.approx(1.0)
+    assert limiter.stats() == {'throttled': 1, 'waited': 1.0}
+
+
+def test_acquire_waits_for_tokens(clock):
+    limiter = make_limiter()
+    limiter.acquire('test/model', 600)
+    assert limiter.acquire('test/model', 100) == pytest.approx(10.0)
+
+
+def test_oversized_request_waits_for_a_full_bucket(clock):
+    limiter = make_limiter()
+    limiter.acquire('test/model', 5000)
+    assert limiter.acquire('test/model', 5000) == pytest.approx(60.0)
+
+
+def test_unknown_keys_fall_back_to_provider_or_no_limit(clock):
+    limiter = RateLimiter()
+    assert limiter.limits_for('openai/some-new-model') == rate_limit.DEFAULT_LIMITS['openai/*']
+    assert limiter.limits_for('local/model') == {'rpm': None, 'tpm': None}
+    for _ in range(1000):
+        assert limiter.acquire('local/model', 10 ** 6) == 0
+
+
+def test_record_pays_back_an_underestimate(clock):
+    limiter = make_limiter()
+    limiter.acquire('test/model', 100)
+    limiter.record('test/model', 100, 600)
+    # The bucket is now empty, so the next call waits for its tokens
+    assert limiter.acquire('test/model', 60) == pytest.approx(6.0)
+
+
+def test_backoff_pauses_and_halves_the_rate(clock):
+    limiter = make_limiter(tpm=None)
+    limiter.backoff('test/model', 5)
+    assert limiter.acquire('test/model') == pytest.approx(5.0)
+
+    bucket = limiter._state._state['test/model']
+    assert bucket['scale'] == 0.5
+    for _ in range(3):
+        limiter.backoff('test/model', 1)
+    # 1/16 would be below the floor
+    assert bucket['scale'] == MIN_SCALE
+
+
+def test_backoff_without_retry_after_grows_exponentially(clock):
+    limiter = make_limiter()
+    for expected in (2.0, 4.0, 8.0):
+        limiter.backoff('test/model')
+        assert limiter._state._state['test/model']['paused_until'] == clock.now + expected
+
+    limiter.success('test/model')
+    bucket = limiter._state._state['test/model']
+    assert bucket['strikes'] == 0
+    assert bucket['scale'] == pytest.approx(0.125 + rate_limit.RECOVERY)
+
+
+class RateLimitError(Exception):
+    pass
+
+
+class Response:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class HTTPError(Exception):
+    def __init__(self, response):
+        super().__init__(f"HTTP {response.status_code}")
+        self.response = response
+
+
+def test_retry_after():
+    assert retry_after(ValueError('bad input')) is None
+    assert retry_after(HTTPError(Response(500))) is None
+    assert retry_after(RateLimitError('slow down')) == 0
+    assert retry_after(Exception('Rate limit reached for gpt-4o')) == 0
+    assert retry_after(HTTPError(Response(429, {'retry-after': '7'}))) == 7.0
+    assert retry_after(HTTPError(Response(429, {'retry-after': 'soon'}))) == 0.0
+
+
+def test_rate_limited_retries_after_backing_off(clock):
+    limiter = make_limiter()
+    calls = []
+
+    def search(query):
+        calls.append(query)
+        if len(calls) < 3:
+            raise HTTPError(Response(429, {'retry-after': '3'}))
+        return 'results'
+
+    assert rate_limited(search, 'test/model', limiter)('query') == 'results'
+    assert calls == ['query'] * 3
+    # The second pause outlasts Retry-After: at a quarter of 60 rpm the
+    # emptied request bucket takes 4s to refill
+    assert limiter.waited == pytest.approx(3.0 + 4.0)
+
+
+def test_rate_limited_gives_up_and_reraises(clock):
+    limiter = make_limiter()
+
+    def search(query):
+        raise RateLimitError('still limited')
+
+    with pytest.raises(RateLimitError):
+        rate_limited(search, 'test/model', limiter, retries=1)('query')
+
+    def broken(query):
+        raise ValueError('bad query')
+
+    with pytest.raises(ValueError):
+        rate_limited(broken, 'test/model', limiter)('query')
+    assert limiter._state._state['test/model']['strikes'] == 1
+
+
+@pytest.mark.skipif(rate_limit.fcntl is None, reason="needs fcntl")
+def test_shared_buckets_span_limiters(tmp_path, clock):
+    path = tmp_path / 'buckets.json'
+    first = RateLimiter({'test/model': {'rpm': 2, 'tpm': None}}, shared_path=path)
+    second = RateLimiter({'test/model': {'rpm': 2, 'tpm': None}}, shared_path=path)
+    first.acquire('test/model')
+    first.acquire('test/model')
+    assert second.acquire('test/model') == pytest.approx(30.0, abs=0.01)
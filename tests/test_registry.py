@@ -0,0 +1,102 @@
+"""Shared crew components built once per key."""
+import threading
+
+import pytest
+
+pytest.importorskip('crewai')
+pytest.importorskip('langchain_community')
+
+from crews import registry as registry_module  # noqa: E402
+from crews.registry import Registry, add_log_sink, registry, shared_agent, shared_llm, shared_search  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def clean_registry(monkeypatch):
+    monkeypatch.setenv('OPENAI_API_KEY', 'test')
+    # Keep shared_llm from opening the default cache under crews/crew-output
+    monkeypatch.setenv('CREW_LLM_CACHE', '0')
+    registry.clear()
+    yield
+    registry.clear()
+
+
+def test_components_are_built_once_per_key():
+    components = Registry()
+    built = []
+
+    def factory():
+        built.append(object())
+        return built[-1]
+
+    first = components.get('llm', 'a', factory)
+    assert components.get('llm', 'a', factory) is first
+    assert components.get('llm', 'b', factory) is not first
+    assert components.get('tool', 'a', factory) is not first
+    assert components.stats() == {'built': 3, 'reused': 1, 'shared': 3}
+
+    components.clear()
+    assert components.get('llm', 'a', factory) is not first
+
+
+def test_per_thread_components_are_not_shared_across_threads():
+    components = Registry()
+    mine = components.get('agent', 'a', object, per_thread=True)
+    assert components.get('agent', 'a', object, per_thread=True) is mine
+
+    theirs = []
+    thread = threading.Thread(target=lambda: theirs.append(components.get('agent', 'a', object, per_thread=True)))
+    thread.start()
+    thread.join()
+    assert theirs[0] is not mine
+
+
+def test_shared_llm_is_keyed_by_settings():
+    llm = shared_llm('gpt-4o-mini', 0.2)
+    assert shared_llm('gpt-4o-mini', 0.2) is llm
+    assert shared_llm('gpt-4o-mini', 0.7) is not llm
+    assert shared_llm('gpt-4o', 0.2) is not llm
+
+
+class FakeSearch:
+    created = 0
+
+    def __init__(self):
+        FakeSearch.created += 1
+
+    def run(self, query):
+        return f"results for {query}"
+
+
+def test_shared_search_builds_one_backend_client(monkeypatch):
+    monkeypatch.setenv('CREW_SEARCH_CACHE', '0')
+    monkeypatch.setitem(registry_module.SEARCH_BACKENDS, 'fake', FakeSearch)
+    FakeSearch.created = 0
+
+    search = shared_search('fake')
+    assert shared_search('fake') is search
+    assert search('query') == 'results for query'
+    assert FakeSearch.created == 1
+
+
+def test_shared_agent_is_per_thread():
+    agent = shared_agent('reviewer', object)
+    assert shared_agent('reviewer', object) is agent
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(shared_agent('reviewer', object)))
+    thread.start()
+    thread.join()
+    assert other[0] is not agent
+
+
+def test_log_sink_is_added_once(tmp_path):
+    from loguru import logger
+
+    path = tmp_path / 'logs' / 'crew.log'
+    sink = add_log_sink(path, level='INFO')
+    try:
+        assert add_log_sink(path, level='INFO') == sink
+        logger.info("registry test line")
+        assert path.read_text().count("registry test line") == 1
+    finally:
+        logger.remove(sink)
@@ -0,0 +1,100 @@
+"""CrewScheduler: bounded concurrency, rate-limit retries and worker stats."""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from crews.scheduler import CrewScheduler, merge_stats, run_crew
+
+RUNS = {'count': 0}
+
+
+def run_counter():
+    return {'runs': RUNS['count']}
+
+
+class CountingCrew:
+    def run(self):
+        RUNS['count'] += 1
+        return 'done'
+
+
+class AsyncCrew:
+    async def run(self):
+        await asyncio.sleep(0)
+        return 'async done'
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+def test_run_crew_builds_classes_and_reports_counter_growth():
+    assert run_crew(AsyncCrew) == ('async done', None)
+    result, stats = run_crew(CountingCrew, run_counter)
+    assert result == 'done'
+    assert stats == {'runs': 1}
+
+
+def test_concurrency_is_bounded():
+    lock = threading.Lock()
+    active = {'now': 0, 'peak': 0}
+
+    class SlowCrew:
+        def run(self):
+            with lock:
+                active['now'] += 1
+                active['peak'] = max(active['peak'], active['now'])
+            time.sleep(0.05)
+            with lock:
+                active['now'] -= 1
+
+    scheduler = CrewScheduler(max_in_flight=2, start_interval=0)
+    results = asyncio.run(scheduler.run([SlowCrew] * 6))
+    assert [r['status'] for r in results] == ['completed'] * 6
+    assert active['peak'] == 2
+
+
+def test_rate_limited_crew_is_retried_and_failures_reported():
+    attempts = []
+
+    class FlakyCrew:
+        def run(self):
+            attempts.append(time.monotonic())
+            if len(attempts) == 1:
+                raise RateLimitError("rate limit exceeded")
+            return 'ok'
+
+    class BrokenCrew:
+        def run(self):
+            raise RuntimeError("boom")
+
+    scheduler = CrewScheduler(start_interval=0, backoff=0.1, max_backoff=0.1)
+    flaky, broken = asyncio.run(scheduler.run([FlakyCrew, BrokenCrew]))
+    assert (flaky['status'], flaky['attempts'], flaky['result']) == ('completed', 2, 'ok')
+    assert attempts[1] - attempts[0] >= 0.1
+    assert (broken['status'], broken['error']) == ('failed', 'boom')
+
+
+def test_process_workers_return_their_counters():
+    before = RUNS['count']
+    scheduler = CrewScheduler(max_in_flight=2, executor='process', start_interval=0, stats=run_counter)
+    results = asyncio.run(scheduler.run([CountingCrew] * 3))
+
+    assert [r['stats'] for r in results] == [{'runs': 1}] * 3
+    assert merge_stats(results) == {'runs': 3}
+    # The workers' counters never reach this process
+    assert RUNS['count'] == before
+
+
+def test_thread_workers_share_counters():
+    scheduler = CrewScheduler(start_interval=0, stats=run_counter)
+    results = asyncio.run(scheduler.run([CountingCrew]))
+    assert results[0]['stats'] is None
+    assert merge_stats(results) is None
+
+
+def test_process_executor_needs_classes():
+    with pytest.raises(ValueError):
+        asyncio.run(CrewScheduler(executor='process').run([CountingCrew()]))
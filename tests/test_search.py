@@ -0,0 +1,126 @@
+"""Full-text timeline search and its dev docs API."""
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import Session, sessionmaker
+
+from timeline.db import create_timeline_engine
+from timeline.models import Base, TimelineEvent
+from timeline.partitions import compact
+from timeline.search import (
+    HIGHLIGHT_CLOSE, HIGHLIGHT_OPEN, SearchUnavailable, fts_query, highlight, search_events
+)
+
+
+def add(engine, *events):
+    with Session(engine) as session:
+        for timestamp, content in events:
+            session.add(TimelineEvent(timestamp=timestamp, event_type='file_change',
+                                      source='src/app.py', action='modified', content=content))
+        session.commit()
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_timeline_engine(f"sqlite:///{tmp_path / 'timeline.db'}")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_fts_query_quotes_each_word():
+    assert fts_query('src/app.py failed') == '"src/app.py" "failed"'
+    assert fts_query('say "hi"') == '"say" """hi"""'
+    assert fts_query('AND OR NEAR(') == '"AND" "OR" "NEAR("'
+    assert fts_query('   ') == ''
+
+
+def test_fts_query_keeps_trailing_star_as_prefix():
+    assert fts_query('pars* time') == '"pars"* "time"'
+    assert fts_query('*') == '"*"'
+    assert fts_query('a*b') == '"a*b"'
+
+
+def test_highlight_escapes_text_but_not_markup():
+    snippet = f"<b>x</b> {HIGHLIGHT_OPEN}needle{HIGHLIGHT_CLOSE} & more"
+    assert highlight(snippet, '<mark>', '</mark>', escape=lambda s: s.replace('<', '&lt;')) == \
+        "&lt;b>x&lt;/b> <mark>needle</mark> & more"
+    assert highlight(snippet, '[', ']') == "<b>x</b> [needle] & more"
+
+
+def test_search_ranks_and_highlights(engine):
+    add(engine,
+        (datetime(2026, 10, 1), 'def parse_config(): needle'),
+        (datetime(2026, 10, 2), 'needle needle needle in src/app.py'),
+        (datetime(2026, 10, 3), 'nothing to see'))
+    with Session(engine) as session:
+        results = search_events(session, 'needle')
+        assert [r['timestamp'].day for r in results] == [2, 1]
+        assert f"{HIGHLIGHT_OPEN}needle{HIGHLIGHT_CLOSE}" in results[0]['snippet']
+
+        assert [r['timestamp'].day for r in search_events(session, 'pars*')] == [1]
+        assert [r['timestamp'].day for r in search_events(session, 'src/app.py')] == [2]
+        assert search_events(session, 'needle', since=datetime(2026, 10, 2))[0]['timestamp'].day == 2
+        assert search_events(session, 'needle', event_type='terminal') == []
+
+
+def test_invalid_raw_query_is_a_value_error(engine):
+    with Session(engine) as session:
+        with pytest.raises(ValueError, match="Invalid search query"):
+            search_events(session, 'needle AND', raw=True)
+        # The same text is fine when quoted
+        assert search_events(session, 'needle AND') == []
+
+
+def test_missing_index_raises_search_unavailable(engine):
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE timeline_events_fts"))
+    with Session(engine) as session, pytest.raises(SearchUnavailable):
+        search_events(session, 'needle')
+
+
+def test_results_are_merged_across_archived_months(engine):
+    add(engine,
+        (datetime(2026, 5, 3), 'needle needle needle archived'),
+        (datetime(2026, 6, 3), 'needle archived'),
+        (datetime(2026, 10, 3), 'needle needle recent'))
+    compact(engine, keep_months=3, retention_months=0, now=datetime(2026, 10, 15))
+
+    with Session(engine) as session:
+        results = search_events(session, 'needle')
+        assert [r['timestamp'].month for r in results] == [5, 10, 6]
+        assert [r['timestamp'].month for r in search_events(session, 'needle', limit=2)] == [5, 10]
+        assert [r['timestamp'].month for r in search_events(session, 'needle', since=datetime(2026, 6, 1))] == [10, 6]
+
+
+@pytest.fixture
+def client(engine, tmp_path, monkeypatch):
+    from crews.visualization import dev_docs_server
+
+    monkeypatch.setattr(dev_docs_server, 'TIMELINE_DB', tmp_path / 'timeline.db')
+    monkeypatch.setattr(dev_docs_server.app.state, 'timeline_sessions', sessionmaker(bind=engine), raising=False)
+    return TestClient(dev_docs_server.app)
+
+
+def test_api_escapes_snippets(engine, client):
+    add(engine, (datetime(2026, 10, 1), '<script>alert(1)</script> needle'))
+    response = client.get('/dev/api/timeline/search', params={'q': 'needle'})
+
+    assert response.status_code == 200
+    result = response.json()['results'][0]
+    assert result['timestamp'] == '2026-10-01T00:00:00'
+    assert '<script>' not in result['snippet_html']
+    assert '&lt;script&gt;' in result['snippet_html']
+    assert '<mark>needle</mark>' in result['snippet_html']
+
+
+def test_api_error_statuses(engine, client):
+    response = client.get('/dev/api/timeline/search', params={'q': 'needle AND', 'raw': 'true'})
+    assert response.status_code == 400
+    assert 'Invalid search query' in response.json()['detail']
+
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE timeline_events_fts"))
+    assert client.get('/dev/api/timeline/search', params={'q': 'needle'}).status_code == 503
@@ -0,0 +1,96 @@
+"""Shared web search cache: normalisation, coalescing and errors."""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from crews import search_cache
+from crews.search_cache import SearchCache, cached_search, get_search_cache, normalize_query
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SearchCache(path=tmp_path / 'search_cache.db')
+
+
+def test_normalize_query():
+    assert normalize_query('  Docker   Hub RATE limits? ') == 'docker hub rate limits'
+    assert normalize_query('"sqlite wal"') == 'sqlite wal'
+    assert normalize_query('c++') == 'c++'
+
+
+def test_equivalent_queries_share_a_result(cache):
+    calls = []
+
+    def run(query):
+        calls.append(query)
+        return f"results for {query}"
+
+    assert cache.search('duckduckgo', 'SQLite WAL', run) == 'results for SQLite WAL'
+    assert cache.search('duckduckgo', ' sqlite  wal. ', run) == 'results for SQLite WAL'
+    assert calls == ['SQLite WAL']
+    # Each backend has its own results
+    cache.search('serpapi', 'sqlite wal', run)
+    assert len(calls) == 2
+
+
+def test_concurrent_callers_wait_for_one_search(cache):
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def run(query):
+        calls.append(query)
+        started.set()
+        release.wait(5)
+        return 'result'
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        leader = pool.submit(cache.search, 'duckduckgo', 'query', run)
+        assert started.wait(5)
+        followers = [pool.submit(cache.search, 'duckduckgo', 'Query', run) for _ in range(3)]
+        while cache.coalesced < 3:
+            time.sleep(0.01)
+        release.set()
+        results = [leader.result()] + [f.result() for f in followers]
+
+    assert results == ['result'] * 4
+    assert calls == ['query']
+    stats = cache.stats()
+    assert (stats['coalesced'], stats['searches']) == (3, 1)
+    assert stats['hit_rate'] == 0.75
+
+
+def test_errors_are_raised_and_not_cached(cache):
+    def failing(query):
+        raise RuntimeError('rate limited')
+
+    with pytest.raises(RuntimeError):
+        cache.search('duckduckgo', 'query', failing)
+    assert cache.search('duckduckgo', 'query', lambda query: 'ok') == 'ok'
+    assert not cache._inflight
+
+
+def test_cached_search_passes_extra_arguments_through(cache):
+    calls = []
+
+    def run(query, *args, **kwargs):
+        calls.append((query, args, kwargs))
+        return 'result'
+
+    search = cached_search(run, 'duckduckgo', cache)
+    search('query')
+    search('query')
+    search('query', max_results=5)
+    assert calls == [('query', (), {}), ('query', (), {'max_results': 5})]
+
+
+def test_process_cache_can_be_disabled(monkeypatch, tmp_path):
+    monkeypatch.setattr(search_cache, '_cache', None)
+    monkeypatch.setenv('CREW_SEARCH_CACHE', '0')
+    assert get_search_cache() is None
+    assert cached_search(lambda query: query.upper(), 'duckduckgo')('q') == 'Q'
+
+    monkeypatch.setenv('CREW_SEARCH_CACHE', str(tmp_path / 'shared.db'))
+    assert get_search_cache() is get_search_cache()
@@ -0,0 +1,112 @@
+"""CommandParser: prompt markers to one event per command."""
+import os
+import select
+import shutil
+import subprocess
+import time
+
+import pytest
+
+from timeline.terminal import BASH_HOOK, MARKER_END, MARKER_START, CommandParser
+
+
+def marker(status, cwd, history):
+    return MARKER_START + f"{status};{cwd};{history}".encode() + MARKER_END
+
+
+def run(parser, history, output=b'', status=0):
+    parser.feed_input(b'\r')
+    shown = parser.feed_output(output + marker(status, '/tmp', history))
+    return shown
+
+
+def test_one_event_per_command_and_marker_hidden():
+    events = []
+    parser = CommandParser(events.append)
+    shown = run(parser, '  12  ls -la', b'file.txt\r\n', status=2)
+
+    assert shown == b'file.txt\r\n'
+    assert len(events) == 1
+    event = events[0]
+    assert event['content'] == '$ ls -la\nfile.txt\n'
+    assert event['details']['command'] == 'ls -la'
+    assert event['details']['exit_status'] == 2
+    assert event['details']['cwd'] == '/tmp'
+    assert event['details']['history_id'] == '12'
+
+
+def test_empty_line_does_not_repeat_previous_command():
+    events = []
+    parser = CommandParser(events.append)
+    run(parser, '  12  ls')
+    run(parser, '  12  ls')
+    run(parser, '  13  ls')
+    assert [e['details']['history_id'] for e in events] == ['12', '13']
+
+
+def test_marker_split_across_reads():
+    events = []
+    parser = CommandParser(events.append)
+    parser.feed_input(b'\n')
+    data = b'out\r\n' + marker(0, '/tmp', '  7  pwd')
+    shown = b''.join(parser.feed_output(data[i:i + 3]) for i in range(0, len(data), 3))
+    assert shown == b'out\r\n'
+    assert events[0]['details']['command'] == 'pwd'
+
+
+def test_output_is_truncated():
+    events = []
+    parser = CommandParser(events.append, max_output=10)
+    run(parser, '  1  yes', b'y\r\n' * 100)
+    assert events[0]['details']['output_truncated']
+    assert len(events[0]['content']) <= len('$ yes\n') + 10
+
+
+def test_prompt_without_enter_is_ignored():
+    events = []
+    parser = CommandParser(events.append)
+    parser.feed_output(marker(0, '/tmp', '  1  ls'))
+    assert events == []
+
+
+class PromptCountingParser(CommandParser):
+    prompts = 0
+
+    def _marker(self, payload):
+        self.prompts += 1
+        super()._marker(payload)
+
+
+@pytest.mark.skipif(shutil.which('bash') is None, reason="needs bash")
+def test_repeated_command_recorded_with_ignoredups(tmp_path):
+    """The user's HISTCONTROL=ignoreboth must not drop a repeated command"""
+    (tmp_path / '.bashrc').write_text('HISTCONTROL=ignoreboth\nPS1="$ "\n')
+    rcfile = tmp_path / 'hook.sh'
+    rcfile.write_text(BASH_HOOK)
+    env = {'HOME': str(tmp_path), 'PATH': os.environ['PATH'], 'TERM': 'dumb'}
+
+    master, slave = os.openpty()
+    shell = subprocess.Popen(['bash', '--rcfile', str(rcfile), '-i'],
+                             stdin=slave, stdout=slave, stderr=slave, env=env, start_new_session=True)
+    os.close(slave)
+    events = []
+    parser = PromptCountingParser(events.append)
+
+    def wait_for_prompt(count):
+        deadline = time.monotonic() + 10
+        while parser.prompts < count and time.monotonic() < deadline:
+            if select.select([master], [], [], 0.5)[0]:
+                parser.feed_output(os.read(master, 4096))
+
+    try:
+        wait_for_prompt(1)
+        for i, line in enumerate([b'echo one\r', b'echo one\r', b'\r', b' echo secret\r'], start=2):
+            parser.feed_input(line)
+            os.write(master, line)
+            wait_for_prompt(i)
+    finally:
+        os.write(master, b'exit\r')
+        shell.wait(timeout=10)
+        os.close(master)
+
+    assert [e['details']['command'] for e in events] == ['echo one', 'echo one']
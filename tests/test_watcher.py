@@ -0,0 +1,165 @@
+"""Watch roots: config files, watch scheduling and per-root stats."""
+import json
+import os
+
+import pytest
+
+from timeline import watcher
+from timeline.watcher import TimelineEventHandler, WatchedRoot, load_watch_config, schedule_watches
+
+
+class ListSink:
+    def send_many(self, rows):
+        return True
+
+
+class RecordingObserver:
+    """Records (path, recursive) for each watch, relative to ``root`` if given."""
+
+    def __init__(self, root=None):
+        self.root = root
+        self.watches = []
+
+    def schedule(self, handler, path, recursive=False):
+        self.watches.append((os.path.relpath(path, self.root) if self.root else path, recursive))
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for directory in ('src/app', 'src/build/out', 'docs', 'node_modules/pkg', '.git/objects'):
+        (tmp_path / directory).mkdir(parents=True)
+    return tmp_path
+
+
+def make_handler(root, patterns=('node_modules', '.git', 'build/')):
+    return TimelineEventHandler(None, ignored_patterns=list(patterns), root=str(root))
+
+
+def scheduled(root, handler, **options):
+    observer = RecordingObserver(str(root))
+    count = schedule_watches(observer, handler, root, **options)
+    return count, sorted(observer.watches)
+
+
+def test_toml_config(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    (tmp_path / 'api').mkdir()
+    (tmp_path / 'monorepo').mkdir()
+    config = tmp_path / 'watch.toml'
+    config.write_text(f'''
+ignore = ["*.log"]
+
+[[root]]
+path = "~/api"
+
+[[root]]
+path = "{tmp_path / 'monorepo'}"
+ignore = ["dist/"]
+max_queue = 2000
+''')
+    assert load_watch_config(config) == [
+        {'path': str(tmp_path / 'api'), 'ignore': ['*.log'], 'max_queue': None},
+        {'path': str(tmp_path / 'monorepo'), 'ignore': ['*.log', 'dist/'], 'max_queue': 2000},
+    ]
+
+
+def test_json_config_accepts_plain_paths(tmp_path):
+    config = tmp_path / 'watch.json'
+    config.write_text(json.dumps({'root': [str(tmp_path), {'path': str(tmp_path), 'ignore': ['tmp/']}]}))
+    assert load_watch_config(config) == [
+        {'path': str(tmp_path), 'ignore': [], 'max_queue': None},
+        {'path': str(tmp_path), 'ignore': ['tmp/'], 'max_queue': None},
+    ]
+
+
+@pytest.mark.parametrize('config, message', [
+    ({'root': []}, 'no \\[\\[root\\]\\] entries'),
+    ({'root': [{'ignore': ['x']}]}, 'needs a path'),
+    ({'root': ['/does/not/exist']}, 'root /does/not/exist is not a directory'),
+])
+def test_invalid_configs(tmp_path, config, message):
+    path = tmp_path / 'watch.json'
+    path.write_text(json.dumps(config))
+    with pytest.raises(ValueError, match=message):
+        load_watch_config(path)
+
+
+def test_shared_and_per_root_ignores(tmp_path):
+    for name in ('a', 'b'):
+        (tmp_path / name).mkdir()
+    config = tmp_path / 'watch.json'
+    config.write_text(json.dumps({'ignore': ['*.log'], 'root': [
+        {'path': str(tmp_path / 'a'), 'ignore': ['dist/']},
+        {'path': str(tmp_path / 'b')},
+    ]}))
+    a, b = (WatchedRoot(entry['path'], None, ignored_patterns=entry['ignore'], sink=ListSink())
+            for entry in load_watch_config(config))
+
+    assert a.handler.should_ignore(str(tmp_path / 'a' / 'x.log'))
+    assert b.handler.should_ignore(str(tmp_path / 'b' / 'x.log'))
+    assert a.handler.should_ignore(str(tmp_path / 'a' / 'dist'), is_dir=True)
+    assert not b.handler.should_ignore(str(tmp_path / 'b' / 'dist'), is_dir=True)
+
+
+def test_ignored_directories_are_never_watched(tree):
+    handler = make_handler(tree)
+    count, watches = scheduled(tree, handler)
+
+    assert watches == [('.', False), ('docs', True), ('src', False), ('src/app', True)]
+    assert count == 4
+    assert handler.shallow_watches == {str(tree), str(tree / 'src')}
+
+
+def test_clean_tree_gets_one_recursive_watch(tree):
+    count, watches = scheduled(tree, make_handler(tree, patterns=()))
+    assert (count, watches) == (1, [('.', True)])
+
+
+def test_max_watches_falls_back_to_recursive_watches(tree):
+    count, watches = scheduled(tree, make_handler(tree), max_watches=3)
+    # Pruning src too would need a fifth watch, so it is watched recursively
+    assert watches == [('.', False), ('docs', True), ('src', True)]
+    assert count == 3
+
+    count, watches = scheduled(tree, make_handler(tree), max_watches=1)
+    assert (count, watches) == (1, [('.', True)])
+
+
+def test_new_directory_under_shallow_watch_is_scheduled(tree):
+    handler = make_handler(tree)
+    observer = RecordingObserver()
+    schedule_watches(observer, handler, tree)
+    observer.watches.clear()
+
+    class Created:
+        is_directory = True
+
+    for name in ('lib', 'node_modules2', 'build'):
+        (tree / name).mkdir()
+    for name in ('lib', 'build'):
+        event = Created()
+        event.src_path = str(tree / name)
+        handler.on_created(event)
+    assert observer.watches == [(str(tree / 'lib'), True)]
+
+
+def test_stats_report_rates_since_the_last_call(tmp_path, monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(watcher.time, 'monotonic', lambda: clock[0])
+    root = WatchedRoot(tmp_path, None, sink=ListSink(), max_queue=50)
+
+    for _ in range(20):
+        root.writer.add({'source': 'x'})
+    clock[0] += 2
+    stats = root.stats()
+    assert stats['path'] == str(tmp_path)
+    assert (stats['submitted'], stats['queued'], stats['max_queue']) == (20, 20, 50)
+    assert stats['events_per_sec'] == 10.0
+    assert stats['writes_per_sec'] == 0.0
+
+    root.writer.start()
+    root.writer.stop()
+    clock[0] += 4
+    stats = root.stats()
+    assert stats['events_per_sec'] == 0.0
+    assert stats['writes_per_sec'] == 5.0
@@ -0,0 +1,140 @@
+"""TimelineWriter debouncing, batching and flushing."""
+import threading
+from datetime import datetime
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from timeline.db import create_timeline_engine
+from timeline.models import Base, TimelineEvent
+from timeline.writer import TimelineWriter
+
+
+class ListSink:
+    def __init__(self):
+        self.batches = []
+
+    def send_many(self, rows):
+        self.batches.append(rows)
+        return True
+
+    @property
+    def rows(self):
+        return [row for batch in self.batches for row in batch]
+
+
+def change(name):
+    return lambda count: {'source': name, 'coalesced': count}
+
+
+def make_writer(**options):
+    sink = ListSink()
+    return TimelineWriter(None, sink=sink, **options), sink
+
+
+def test_burst_collapses_into_one_row():
+    writer, sink = make_writer(debounce=0.5, max_delay=5.0)
+    for at in (0.0, 0.2, 0.4, 0.6):
+        writer._accept('a.py', change('a.py'), at)
+    writer._accept('b.py', change('b.py'), 0.1)
+
+    writer._release_settled(0.9)
+    assert writer._batch == [{'source': 'b.py', 'coalesced': 1}]
+    writer._release_settled(1.1)
+    assert writer._batch[-1] == {'source': 'a.py', 'coalesced': 4}
+    assert not writer._pending
+
+
+def test_latest_build_wins():
+    writer, sink = make_writer(debounce=0.5)
+    writer._accept('a.py', lambda count: {'version': 1}, 0.0)
+    writer._accept('a.py', lambda count: {'version': 2}, 0.1)
+    writer._release_settled(1.0)
+    assert writer._batch == [{'version': 2}]
+
+
+def test_max_delay_releases_a_continuous_stream():
+    writer, sink = make_writer(debounce=0.5, max_delay=2.0)
+    at = 0.0
+    while at < 1.9:
+        writer._accept('log.txt', change('log.txt'), at)
+        writer._release_settled(at)
+        at += 0.25
+    assert writer._batch == []
+
+    writer._accept('log.txt', change('log.txt'), 2.0)
+    writer._release_settled(2.0)
+    assert writer._batch == [{'source': 'log.txt', 'coalesced': 9}]
+
+
+def test_unkeyed_events_and_build_failures():
+    writer, sink = make_writer()
+    writer._accept(None, change('now.py'), 0.0)
+    writer._accept(None, lambda count: None, 0.0)
+    writer._accept(None, lambda count: 1 / 0, 0.0)
+    assert writer._batch == [{'source': 'now.py', 'coalesced': 1}]
+
+
+def test_stop_flushes_everything():
+    writer, sink = make_writer(debounce=60, max_delay=60)
+    writer.start()
+    for i in range(3):
+        writer.submit(change('a.py'), key='a.py')
+    writer.add({'source': 'shell'})
+    writer.stop()
+
+    assert sorted(sink.rows, key=str) == sorted(
+        [{'source': 'a.py', 'coalesced': 3}, {'source': 'shell'}], key=str
+    )
+    assert writer.stats()['written'] == 2
+
+
+def test_batches_are_bounded():
+    writer, sink = make_writer(batch_size=10, flush_interval=60)
+    for i in range(25):
+        writer.add({'n': i})
+    writer.start()
+    writer.stop()
+
+    assert [len(batch) for batch in sink.batches] == [10, 10, 5]
+    assert [row['n'] for row in sink.rows] == list(range(25))
+
+
+def test_full_queue_drops_events():
+    writer, sink = make_writer(max_queue=2)
+    assert writer.add({'n': 1}) and writer.add({'n': 2})
+    assert not writer.add({'n': 3})
+    assert writer.stats() == {'queued': 2, 'pending': 0, 'submitted': 2, 'written': 0, 'dropped': 1}
+
+
+def test_submit_never_builds_on_the_caller_thread():
+    writer, sink = make_writer(debounce=0.01)
+    threads = []
+    writer.submit(lambda count: threads.append(threading.current_thread().name) or {'n': 1})
+    assert threads == []
+    writer.start()
+    writer.stop()
+    assert threads == ['timeline-writer']
+
+
+@pytest.fixture
+def sessions(tmp_path):
+    engine = create_timeline_engine(f"sqlite:///{tmp_path / 'timeline.db'}")
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def test_rows_and_snapshots_reach_the_database(sessions):
+    writer = TimelineWriter(sessions, debounce=60).start()
+    for _ in range(2):
+        writer.submit(lambda count: {
+            'timestamp': datetime(2026, 10, 1, 12), 'event_type': 'file_change', 'source': 'src/a.py',
+            'action': 'modified', 'details': {'coalesced': count}, 'snapshot': b'print(1)\n',
+        }, key='src/a.py')
+    writer.stop()
+
+    with sessions() as session:
+        events = session.query(TimelineEvent).all()
+        assert [(e.source, e.details) for e in events] == [('src/a.py', {'coalesced': 2})]
+        assert writer.blob_store.get(session, events[0].content_digest) == b'print(1)\n'
@@ -1,13 +1,32 @@
 """
 Timeline - Development Activity Tracker
 """
-from .models import TimelineEvent, CursorEventType
-from .cursor_handler import CursorEventHandler
-from .analyzer_crew import TimelineAnalyzerCrew
+import importlib
+
+# Exports are imported on first access (PEP 562), so `timeline logs` and the
+# hooks don't pay for crewai/langchain unless the analyzer is actually used
+_LAZY_EXPORTS = {
+    'TimelineEvent': '.models',
+    'CursorEventType': '.models',
+    'CursorEventHandler': '.cursor_handler',
+    'TimelineAnalyzerCrew': '.analyzer_crew',
+}
 
 __all__ = [
     'TimelineEvent',
     'CursorEventType',
     'CursorEventHandler',
     'TimelineAnalyzerCrew'
-] 
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,38 +1,21 @@
 from crews.base_crew import BaseCrew
+from crews.registry import shared_agent
 from crewai import Agent, Task, Crew
-from langchain_openai import ChatOpenAI
-from langchain.tools import Tool
-from langchain_community.tools import DuckDuckGoSearchRun
 from loguru import logger
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from .models import TimelineEvent
 from datetime import datetime, timedelta
-import os
+from .context import timeline_digest
+from .db import DEFAULT_DB_URL, create_timeline_engine
 
 class TimelineAnalyzerCrew(BaseCrew):
+    search_description = "Search for development patterns and best practices"
+
     def __init__(self):
         super().__init__("timeline-analysis")
-        
-        # Initialize OpenAI with the working key
-        self.llm = ChatOpenAI(
-            model="gpt-3.5-turbo",
-            temperature=0.7,
-            api_key=os.getenv('OPENAI_API_KEY')
-        )
-        
-        # Initialize tools
-        self.search = DuckDuckGoSearchRun()
-        self.tools = [
-            Tool(
-                name="Search",
-                func=self.search.run,
-                description="Search for development patterns and best practices"
-            )
-        ]
-        
-        # Create Pattern Analyzer
-        self.pattern_analyzer = Agent(
+
+    @property
+    def pattern_analyzer(self) -> Agent:
+        return shared_agent(('timeline-pattern-analyzer', self.model, self.temperature), lambda: Agent(
             role='Pattern Analyzer',
             goal='Analyze development patterns and suggest improvements',
             backstory="""You analyze development patterns and identify areas 
@@ -40,10 +23,11 @@ class TimelineAnalyzerCrew(BaseCrew):
             llm=self.llm,
             tools=self.tools,
             verbose=True
-        )
-        
-        # Create Code Reviewer
-        self.code_reviewer = Agent(
+        ))
+
+    @property
+    def code_reviewer(self) -> Agent:
+        return shared_agent(('timeline-code-reviewer', self.model, self.temperature), lambda: Agent(
             role='Code Reviewer',
             goal='Review code changes and suggest improvements',
             backstory="""You review code changes and provide constructive feedback
@@ -51,10 +35,11 @@ class TimelineAnalyzerCrew(BaseCrew):
             llm=self.llm,
             tools=self.tools,
             verbose=True
-        )
-        
-        # Create Documentation Expert
-        self.doc_expert = Agent(
+        ))
+
+    @property
+    def doc_expert(self) -> Agent:
+        return shared_agent(('timeline-doc-expert', self.model, self.temperature), lambda: Agent(
             role='Documentation Expert',
             goal='Create clear documentation from analysis',
             backstory="""You create clear, actionable documentation from 
@@ -62,15 +47,32 @@ class TimelineAnalyzerCrew(BaseCrew):
             llm=self.llm,
             tools=self.tools,
             verbose=True
-        )
-        
-        logger.info(f"Initialized {self.__class__.__name__}")
+        ))
 
-    def analyze_timeline(self, days_back=7):
-        """Analyze recent timeline events"""
+    @staticmethod
+    def load_context(since, db_url=DEFAULT_DB_URL, token_budget=3000):
+        """Digest of the timeline since ``since`` read from ``db_url``"""
+        engine = create_timeline_engine(db_url)
         try:
-            # Get recent events
-            since_date = datetime.now() - timedelta(days=days_back)
+            with sessionmaker(bind=engine)() as session:
+                return timeline_digest(session, since, token_budget=token_budget)
+        finally:
+            engine.dispose()
+
+    def analyze_timeline(self, days_back=7, context=None, db_url=DEFAULT_DB_URL, token_budget=3000):
+        """Analyze recent timeline events
+        
+        context: digest of the window from timeline.context (aggregates plus
+        sampled diffs within a token budget), shown to the Pattern Analyzer
+        so it works from real data of bounded size. Built from ``db_url``
+        when not given.
+        """
+        try:
+            # Timestamps are stored in UTC
+            since_date = datetime.utcnow() - timedelta(days=days_back)
+            if context is None:
+                context = self.load_context(since_date, db_url, token_budget)
+            timeline_context = context or "No timeline events recorded in this window."
             
             # Create analysis task
             analysis_task = Task(
@@ -91,6 +93,9 @@ class TimelineAnalyzerCrew(BaseCrew):
                    - Code quality
                    - Development speed
                    - AI utilization
+                
+                Timeline digest:
+                {timeline_context}
                 """,
                 agent=self.pattern_analyzer
             )
@@ -0,0 +1,83 @@
+import hashlib
+import zlib
+from loguru import logger
+from .models import TimelineBlob
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional; zlib is always available
+    zstandard = None
+
+
+class BlobStore:
+    """Content-addressed, compressed storage for file snapshots.
+
+    Blobs live in the ``timeline_blobs`` table keyed by the sha256 of their
+    raw bytes, so identical snapshots are stored once and events only carry
+    the digest.
+    """
+
+    def __init__(self, codec=None, level=None):
+        self.codec = codec or ('zstd' if zstandard else 'zlib')
+        if self.codec == 'zstd' and zstandard is None:
+            raise ValueError("zstd codec requested but zstandard is not installed")
+        self.level = level
+
+    @staticmethod
+    def digest(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def compress(self, data: bytes) -> bytes:
+        if self.codec == 'zstd':
+            return zstandard.ZstdCompressor(level=self.level or 3).compress(data)
+        return zlib.compress(data, self.level or 6)
+
+    @staticmethod
+    def decompress(codec: str, data: bytes) -> bytes:
+        if codec == 'zstd':
+            if zstandard is None:
+                raise RuntimeError("Blob is zstd-compressed but zstandard is not installed")
+            return zstandard.ZstdDecompressor().decompress(data)
+        return zlib.decompress(data)
+
+    def put_many(self, session, blobs: dict):
+        """Store {digest: raw bytes}, skipping digests that already exist.
+
+        Runs inside the caller's transaction so blobs and the events that
+        reference them commit together.
+        """
+        if not blobs:
+            return 0
+        digests = list(blobs)
+        existing = set()
+        for i in range(0, len(digests), 500):
+            chunk = digests[i:i + 500]
+            existing.update(
+                row[0] for row in session.query(TimelineBlob.digest)
+                .filter(TimelineBlob.digest.in_(chunk))
+            )
+        missing = [
+            {
+                'digest': digest,
+                'codec': self.codec,
+                'size': len(blobs[digest]),
+                'data': self.compress(blobs[digest]),
+            }
+            for digest in digests if digest not in existing
+        ]
+        if missing:
+            session.bulk_insert_mappings(TimelineBlob, missing)
+            logger.debug(f"Stored {len(missing)} new blobs ({len(existing)} deduplicated)")
+        return len(missing)
+
+    def put(self, session, data: bytes) -> str:
+        digest = self.digest(data)
+        self.put_many(session, {digest: data})
+        return digest
+
+    def get(self, session, digest: str):
+        """Return the raw bytes for a digest, or None if unknown"""
+        blob = session.get(TimelineBlob, digest)
+        if blob is None:
+            return None
+        return self.decompress(blob.codec, blob.data)
@@ -1,12 +1,21 @@
 import click
 from rich.console import Console
-from sqlalchemy import create_engine
+from rich.table import Table
+from rich.markup import escape
 from sqlalchemy.orm import sessionmaker
 from .logs import TimelineLogger
-from .analyzer_crew import TimelineAnalyzerCrew
-from .watcher import TimelineEventHandler
-from watchdog.observers import Observer
+from .db import create_timeline_engine
+from .watcher import WatchedRoot, load_watch_config
+from .ignore import DEFAULT_IGNORES
+from .partitions import compact as compact_timeline
+from .export import export_events, EXPORT_FORMATS
+from .ingest import IngestServer, IngestClient, DEFAULT_ADDRESS
+from .search import search_events, highlight, SearchUnavailable
+from .context import timeline_digest
+import asyncio
+import signal
 import time
+from datetime import datetime, timedelta
 from pathlib import Path
 from loguru import logger
 
@@ -18,46 +27,100 @@ def cli():
     pass
 
 @cli.command()
-@click.option('--path', default='.', help='Path to watch')
+@click.option('--path', multiple=True, help='Path to watch (repeatable; default: current directory)')
+@click.option('--config', 'config_file', type=click.Path(exists=True, dir_okay=False),
+              help='TOML or JSON file listing the roots to watch')
 @click.option('--db', default='sqlite:///timeline/data/timeline.db', help='Database URL')
-def watch(path, db):
-    """Watch directory for changes"""
+@click.option('--batch-size', default=500, help='Max events per database commit')
+@click.option('--flush-interval', default=1.0, help='Seconds between batch flushes')
+@click.option('--debounce', default=0.5, help='Seconds to coalesce repeated changes to a file')
+@click.option('--max-queue', default=10000, help='Events each root may queue before dropping')
+@click.option('--ignore', multiple=True, help='Extra gitignore-style pattern to ignore (repeatable)')
+@click.option('--ingest', is_flag=True, help='Send events to the ingest daemon instead of writing the database')
+@click.option('--ingest-address', default=DEFAULT_ADDRESS, help='Ingest daemon socket path or host:port')
+@click.option('--stats-interval', default=0.0, help='Seconds between per-root rate/queue reports (0 to disable)')
+def watch(path, config_file, db, batch_size, flush_interval, debounce, max_queue,
+          ignore, ingest, ingest_address, stats_interval):
+    """Watch directories for changes"""
     try:
+        entries = [{'path': p, 'ignore': [], 'max_queue': None} for p in path]
+        if config_file:
+            entries.extend(load_watch_config(config_file))
+        if not entries:
+            entries = [{'path': '.', 'ignore': [], 'max_queue': None}]
+
         # Initialize database if it doesn't exist
-        if not Path("timeline/data/timeline.db").exists():
+        if not ingest and not Path("timeline/data/timeline.db").exists():
             logger.info("Database not found, initializing...")
             from .init_db import init_database
             init_database()
         
-        logger.info(f"Starting watcher with db: {db}")
-        engine = create_engine(db)
-        logger.info("Created engine")
-        
-        Session = sessionmaker(bind=engine)
-        session = Session()
-        logger.info("Created session")
-        
-        event_handler = TimelineEventHandler(session)
-        logger.info("Created event handler")
+        if ingest:
+            logger.info(f"Starting watcher with ingest daemon: {ingest_address}")
+            Session = None
+            client = IngestClient(ingest_address)
+        else:
+            logger.info(f"Starting watcher with db: {db}")
+            engine = create_timeline_engine(db)
+            logger.info("Created engine")
+            Session = sessionmaker(bind=engine)
+            client = None
         
-        observer = Observer()
-        observer.schedule(event_handler, path, recursive=True)
-        logger.info(f"Scheduled observer for path: {path}")
+        roots = []
+        for entry in entries:
+            root = WatchedRoot(
+                entry['path'],
+                Session,
+                ignored_patterns=DEFAULT_IGNORES + list(ignore) + entry['ignore'],
+                sink=client,
+                max_queue=entry['max_queue'] or max_queue,
+                batch_size=batch_size,
+                flush_interval=flush_interval,
+                debounce=debounce
+            )
+            roots.append(root.start())
+            console.print(f"[green]Started watching {root.path}[/green] ({root.watches} watches)")
         
-        observer.start()
-        logger.info("Observer started")
-        
-        console.print(f"[green]Started watching {Path(path).absolute()}[/green]")
+        last_report = time.monotonic()
         while True:
             time.sleep(1)
+            if stats_interval and time.monotonic() - last_report >= stats_interval:
+                last_report = time.monotonic()
+                console.print(_watch_stats_table(roots))
             
     except Exception as e:
         logger.error(f"Watch failed: {str(e)}")
         raise
     finally:
-        if 'observer' in locals():
-            observer.stop()
-            observer.join()
+        for root in locals().get('roots', []):
+            root.stop()
+        if locals().get('client') is not None:
+            client.close()
+
+def _watch_stats_table(roots):
+    table = Table(title=f"Watched roots ({datetime.now():%H:%M:%S})")
+    table.add_column("Root")
+    table.add_column("Events/s", justify="right")
+    table.add_column("Writes/s", justify="right")
+    table.add_column("Queue", justify="right")
+    table.add_column("Pending", justify="right")
+    table.add_column("Written", justify="right")
+    table.add_column("Dropped", justify="right")
+    for root in roots:
+        stats = root.stats()
+        queue = f"{stats['queued']}/{stats['max_queue']}"
+        if stats['queued'] >= stats['max_queue'] * 0.8:
+            queue = f"[red]{queue}[/red]"
+        table.add_row(
+            escape(stats['path']),
+            f"{stats['events_per_sec']:.1f}",
+            f"{stats['writes_per_sec']:.1f}",
+            queue,
+            str(stats['pending']),
+            str(stats['written']),
+            f"[red]{stats['dropped']}[/red]" if stats['dropped'] else "0"
+        )
+    return table
 
 @cli.command()
 @click.option('--limit', default=100, help='Number of events to show')
@@ -66,7 +129,7 @@ def watch(path, db):
 @click.option('--db', default='sqlite:///timeline.db', help='Database URL')
 def logs(limit, type, source, db):
     """Show recent timeline events with filtering options"""
-    engine = create_engine(db)
+    engine = create_timeline_engine(db)
     Session = sessionmaker(bind=engine)
     session = Session()
     
@@ -82,21 +145,157 @@ def logs(limit, type, source, db):
     if not events:
         console.print("[yellow]No events found matching criteria[/yellow]")
 
+@cli.command()
+@click.argument('query', nargs=-1, required=True)
+@click.option('--limit', default=20, help='Number of results to show')
+@click.option('--type', help='Filter by event type')
+@click.option('--since', type=click.DateTime(), help='Only events at or after this time (UTC)')
+@click.option('--raw', is_flag=True, help='Pass FTS5 query syntax (OR, NEAR, prefix*) through unchanged')
+@click.option('--db', default='sqlite:///timeline/data/timeline.db', help='Database URL')
+def search(query, limit, type, since, raw, db):
+    """Full-text search over event content, user inputs and AI responses"""
+    engine = create_timeline_engine(db)
+    Session = sessionmaker(bind=engine)
+    try:
+        with Session() as session:
+            started = time.perf_counter()
+            results = search_events(
+                session, ' '.join(query), limit=limit,
+                event_type=type, since=since, raw=raw
+            )
+            elapsed = (time.perf_counter() - started) * 1000
+    except (SearchUnavailable, ValueError) as e:
+        raise click.ClickException(str(e))
+    finally:
+        engine.dispose()
+    
+    if not results:
+        console.print("[yellow]No events found matching criteria[/yellow]")
+        return
+    
+    table = Table(title=f"{len(results)} matches for '{escape(' '.join(query))}' ({elapsed:.1f} ms)")
+    table.add_column("Time", style="cyan")
+    table.add_column("Type", style="green")
+    table.add_column("Source", style="yellow")
+    table.add_column("Match")
+    for result in results:
+        table.add_row(
+            result['timestamp'].strftime("%Y-%m-%d %H:%M:%S") if result['timestamp'] else "",
+            result['event_type'],
+            escape(str(result['source'])),
+            highlight(result['snippet'] or "", "[bold magenta]", "[/bold magenta]", escape=escape)
+        )
+    console.print(table)
+
 @cli.command()
 @click.option('--days', default=7, help='Days of history to analyze')
 @click.option('--db', default='sqlite:///timeline.db', help='Database URL')
-def analyze(days, db):
+@click.option('--token-budget', default=3000, help='Approximate tokens of timeline context sent to the LLM')
+@click.option('--show-context', is_flag=True, help='Print the context digest and exit without calling the LLM')
+def analyze(days, db, token_budget, show_context):
     """Analyze timeline and suggest improvements"""
-    engine = create_engine(db)
+    engine = create_timeline_engine(db)
     Session = sessionmaker(bind=engine)
-    session = Session()
     
+    since = datetime.utcnow() - timedelta(days=days)
+    with Session() as session:
+        context = timeline_digest(session, since, token_budget=token_budget)
+    engine.dispose()
+    
+    if show_context:
+        console.print(escape(context))
+        return
+    
+    # crewai and langchain take seconds to import; only pay for them here
+    from .analyzer_crew import TimelineAnalyzerCrew
     analyzer = TimelineAnalyzerCrew()
-    result = analyzer.analyze_timeline(days_back=days)
+    result = analyzer.analyze_timeline(days_back=days, context=context)
     
     console.print("[green]Analysis complete![/green]")
     console.print(result)
 
+@cli.command()
+@click.option('--db', default='sqlite:///timeline/data/timeline.db', help='Database URL')
+@click.option('--address', default=DEFAULT_ADDRESS, help='Unix socket path, or host:port for localhost TCP')
+@click.option('--batch-size', default=500, help='Max events per group commit')
+@click.option('--flush-interval', default=0.05, help='Seconds to wait for more events before a partial group commit')
+@click.option('--max-queue', default=10000, help='Queued events before producers are slowed down')
+def ingest(db, address, batch_size, flush_interval, max_queue):
+    """Run the ingest daemon that owns timeline database writes"""
+    engine = create_timeline_engine(db)
+    server = IngestServer(
+        sessionmaker(bind=engine),
+        address=address,
+        max_queue=max_queue,
+        batch_size=batch_size,
+        flush_interval=flush_interval
+    )
+    
+    async def serve():
+        stopping = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stopping.set)
+        await server.start()
+        console.print(f"[green]Timeline ingest listening on {address}[/green]")
+        await stopping.wait()
+        await server.stop()
+    
+    try:
+        asyncio.run(serve())
+    finally:
+        engine.dispose()
+    console.print(f"Ingest stopped: {server.stats()}")
+
+@cli.command()
+@click.option('--db', default='sqlite:///timeline/data/timeline.db', help='Database URL')
+@click.option('--keep-months', default=3, help='Months of raw events to keep in the main database')
+@click.option('--retention-months', default=24, help='Drop archived months older than this (0 keeps them forever)')
+def compact(db, keep_months, retention_months):
+    """Archive old months, apply retention and vacuum the database"""
+    engine = create_timeline_engine(db)
+    try:
+        result = compact_timeline(engine, keep_months=keep_months, retention_months=retention_months)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    finally:
+        engine.dispose()
+    
+    for month, moved in result['archived'].items():
+        console.print(f"[green]Archived {moved} events from {month:%Y-%m}[/green]")
+    for month in result['dropped']:
+        console.print(f"[yellow]Dropped archive {month:%Y-%m}[/yellow]")
+    console.print(f"Vacuum: {result['vacuum']}")
+
+@cli.command()
+@click.option('--db', default='sqlite:///timeline/data/timeline.db', help='Database URL')
+@click.option('--format', 'export_format', type=click.Choice(EXPORT_FORMATS), default='parquet', help='Output format')
+@click.option('--since', type=click.DateTime(), help='Export events at or after this time (UTC)')
+@click.option('--until', type=click.DateTime(), help='Export events before this time (UTC)')
+@click.option('--output', help='Output file (default: timeline/exports/timeline_<now>.<format>)')
+@click.option('--chunk-size', default=10000, help='Rows fetched and written per batch')
+def export(db, export_format, since, until, output, chunk_size):
+    """Export events to a Parquet, Arrow or JSON Lines file"""
+    if output is None:
+        export_dir = Path("timeline/exports")
+        export_dir.mkdir(parents=True, exist_ok=True)
+        output = export_dir / f"timeline_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{export_format}"
+    
+    engine = create_timeline_engine(db)
+    Session = sessionmaker(bind=engine)
+    try:
+        with Session() as session:
+            written = export_events(
+                session, output, format=export_format,
+                since=since, until=until, chunk_size=chunk_size
+            )
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    finally:
+        engine.dispose()
+    
+    console.print(f"[green]Exported {written} events to {output}[/green]")
+
 def main():
     cli()
 
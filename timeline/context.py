@@ -0,0 +1,221 @@
+import heapq
+from collections import Counter
+from datetime import timedelta
+from sqlalchemy import select, func
+from .counters import hourly_activity
+from .models import TimelineEvent
+from .partitions import iter_sources
+
+# Rough size of an LLM token in characters, for budgeting
+CHARS_PER_TOKEN = 4
+
+CONTEXT_COLUMNS = [
+    TimelineEvent.id, TimelineEvent.timestamp, TimelineEvent.event_type,
+    TimelineEvent.source, TimelineEvent.action, TimelineEvent.details,
+    func.length(TimelineEvent.content).label('content_length'),
+]
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def _window(query, since, until):
+    query = query.where(TimelineEvent.timestamp >= since)
+    if until is not None:
+        query = query.where(TimelineEvent.timestamp < until)
+    return query
+
+
+def build_context(session, since, until=None, top=10, max_diffs=8, chunk_size=5000):
+    """Aggregate the events in [since, until) in one streaming pass.
+
+    Only counters and a few bounded top-N structures are kept, so memory
+    and the size of the result don't depend on how many events the window
+    holds. The per-day and hour-of-day histograms come from the hourly
+    counters rather than the scan. Diff text is fetched afterwards for a
+    handful of candidates: the latest change to each of the hottest files,
+    then the largest diffs.
+    """
+    by_type = Counter()
+    file_edits = Counter()
+    file_lines = {}
+    commands = Counter()
+    failures = Counter()
+    ai_actions = Counter()
+    slowest = []   # min-heap of (duration, command)
+    largest = []   # min-heap of (content_length, id, month)
+    diff_totals = Counter()
+    ai_with_code = 0
+
+    query = _window(select(*CONTEXT_COLUMNS), since, until)
+    for month, source in iter_sources(session, since, until):
+        for row in source.execute(query.execution_options(yield_per=chunk_size)):
+            details = row.details or {}
+            by_type[row.event_type] += 1
+
+            if row.event_type == 'file_change':
+                file_edits[row.source] += details.get('coalesced', 1)
+                diff = details.get('diff') or {}
+                added, removed = diff.get('added', 0), diff.get('removed', 0)
+                if added or removed:
+                    lines = file_lines.setdefault(row.source, [0, 0])
+                    lines[0] += added
+                    lines[1] += removed
+                diff_totals['added'] += added
+                diff_totals['removed'] += removed
+                diff_totals['keyframes'] += bool(diff.get('keyframe'))
+                if row.content_length and not diff.get('keyframe'):
+                    diff_totals['diffs'] += 1
+                    candidate = (row.content_length, row.id, month)
+                    if len(largest) < max_diffs:
+                        heapq.heappush(largest, candidate)
+                    elif candidate > largest[0]:
+                        heapq.heapreplace(largest, candidate)
+
+            elif row.event_type == 'terminal':
+                command = details.get('command')
+                if not command:
+                    continue
+                program = command.split()[0]
+                commands[program] += 1
+                if details.get('exit_status'):
+                    failures[program] += 1
+                duration = details.get('duration') or 0
+                if len(slowest) < 5:
+                    heapq.heappush(slowest, (duration, command[:80]))
+                elif duration > slowest[0][0]:
+                    heapq.heapreplace(slowest, (duration, command[:80]))
+
+            elif row.event_type == 'cursor':
+                ai_actions[row.action] += 1
+                ai_with_code += bool(details.get('has_code_changes'))
+
+    per_day = Counter()
+    by_hour = Counter()
+    for hour, count in hourly_activity(session, since, until):
+        per_day[hour.date()] += count
+        by_hour[hour.hour] += count
+
+    hot_files = [
+        {'source': path, 'edits': edits, 'added': file_lines.get(path, [0, 0])[0],
+         'removed': file_lines.get(path, [0, 0])[1]}
+        for path, edits in file_edits.most_common(top)
+    ]
+    return {
+        'since': since,
+        'until': until,
+        'total': sum(by_type.values()),
+        'by_type': dict(by_type.most_common()),
+        'per_day': sorted(per_day.items()),
+        'by_hour': sorted(by_hour.items()),
+        'hot_files': hot_files,
+        'diff_totals': dict(diff_totals),
+        'commands': [
+            {'program': program, 'runs': runs, 'failures': failures[program]}
+            for program, runs in commands.most_common(top)
+        ],
+        'slowest_commands': sorted(slowest, reverse=True),
+        'ai_actions': dict(ai_actions.most_common()),
+        'ai_with_code_changes': ai_with_code,
+        'diff_candidates': [
+            ('latest', path) for path in (f['source'] for f in hot_files[:max_diffs])
+        ] + [('event', (month, event_id)) for _, event_id, month in sorted(largest, reverse=True)],
+    }
+
+
+def _fetch_diff(session, context, candidate):
+    kind, key = candidate
+    columns = select(TimelineEvent.id, TimelineEvent.timestamp, TimelineEvent.source,
+                     TimelineEvent.details, TimelineEvent.content)
+    if kind == 'latest':
+        query = _window(columns, context['since'], context['until'])\
+            .where(TimelineEvent.source == key)\
+            .where(TimelineEvent.event_type == 'file_change')\
+            .where(TimelineEvent.content.isnot(None))\
+            .order_by(TimelineEvent.timestamp.desc())\
+            .limit(1)
+        for _, source in iter_sources(session, context['since'], context['until'], newest_first=True):
+            row = source.execute(query).first()
+            if row is not None:
+                return row
+        return None
+    month, event_id = key
+    for source_month, source in iter_sources(session, context['since'], context['until'], newest_first=True):
+        if source_month == month:
+            return source.execute(columns.where(TimelineEvent.id == event_id)).first()
+    return None
+
+
+def render_context(session, context, token_budget=3000):
+    """Compact text digest of ``context``, with sampled diffs filling the token budget"""
+    lines = []
+    window = f"{context['since']:%Y-%m-%d %H:%M}"
+    window += f" to {context['until']:%Y-%m-%d %H:%M}" if context['until'] else " to now"
+    by_type = ', '.join(f"{name} {count}" for name, count in context['by_type'].items())
+    lines.append(f"Window: {window} ({context['total']} events: {by_type or 'none'})")
+    if len(context['per_day']) > 31:
+        # Long windows: weekly buckets keep the line short
+        per_week = Counter()
+        for day, count in context['per_day']:
+            per_week[day - timedelta(days=day.weekday())] += count
+        lines.append("Events per week: " + ', '.join(f"{week:%m-%d} {count}" for week, count in sorted(per_week.items())))
+    elif context['per_day']:
+        lines.append("Events per day: " + ', '.join(f"{day:%m-%d} {count}" for day, count in context['per_day']))
+    if context['by_hour']:
+        lines.append("Events by hour of day (UTC): " + ', '.join(
+            f"{hour:02d}h {count}" for hour, count in context['by_hour']
+        ))
+    if context['hot_files']:
+        lines.append("Hot files (edits, +added/-removed lines):")
+        lines.extend(f"  {f['source']}: {f['edits']} (+{f['added']}/-{f['removed']})" for f in context['hot_files'])
+    totals = context['diff_totals']
+    if totals:
+        lines.append(
+            f"Diff volume: +{totals.get('added', 0)}/-{totals.get('removed', 0)} lines "
+            f"in {totals.get('diffs', 0)} diffs, {totals.get('keyframes', 0)} full snapshots"
+        )
+    if context['commands']:
+        lines.append("Commands (runs, failures): " + ', '.join(
+            f"{c['program']} {c['runs']} ({c['failures']})" for c in context['commands']
+        ))
+    if context['slowest_commands']:
+        lines.append("Slowest commands: " + ', '.join(
+            f"{command} {duration:.1f}s" for duration, command in context['slowest_commands']
+        ))
+    if context['ai_actions']:
+        lines.append("AI interactions: " + ', '.join(
+            f"{action} {count}" for action, count in context['ai_actions'].items()
+        ) + f"; {context['ai_with_code_changes']} with code changes")
+
+    summary = '\n'.join(lines)
+    remaining = (token_budget - estimate_tokens(summary)) * CHARS_PER_TOKEN
+    candidates = context['diff_candidates']
+    if remaining <= 0 or not candidates:
+        return summary
+
+    # Spread the remaining budget evenly over the candidates, at least ~100 tokens each
+    per_diff = max(400, remaining // len(candidates))
+    sections, seen = [], set()
+    for candidate in candidates:
+        if remaining < 200:
+            break
+        row = _fetch_diff(session, context, candidate)
+        if row is None or row.id in seen:
+            continue
+        seen.add(row.id)
+        diff = (row.details or {}).get('diff') or {}
+        header = f"--- {row.timestamp:%Y-%m-%d %H:%M} {row.source} (+{diff.get('added', 0)}/-{diff.get('removed', 0)})"
+        body = row.content[:max(0, min(per_diff, remaining) - len(header))]
+        if len(body) < len(row.content):
+            body += "\n[...truncated]"
+        sections.append(f"{header}\n{body}")
+        remaining -= len(header) + len(body) + 1
+    if sections:
+        summary += "\n\nRepresentative diffs:\n" + '\n'.join(sections)
+    return summary
+
+
+def timeline_digest(session, since, until=None, token_budget=3000):
+    """Build and render the analysis context for a window in one call"""
+    return render_context(session, build_context(session, since, until), token_budget=token_budget)
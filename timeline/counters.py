@@ -0,0 +1,90 @@
+import os
+from collections import Counter
+from datetime import datetime
+from sqlalchemy import select, func
+from .models import TimelineEventCount
+
+# Rows per upsert statement: 4 bound parameters each keeps a statement under
+# the 999-variable limit of older SQLite builds
+UPSERT_CHUNK = 200
+
+
+def source_dir(source) -> str:
+    """Bucket a source into its directory ('shell', 'cursor' stay as they are)"""
+    if not source:
+        return ''
+    directory = os.path.dirname(source)
+    return directory if directory else source
+
+
+def hour_bucket(timestamp) -> datetime:
+    return (timestamp or datetime.utcnow()).replace(minute=0, second=0, microsecond=0)
+
+
+def count_keys(rows):
+    """Aggregate event mappings into {(event_type, source_dir, hour): count}"""
+    return Counter(
+        (row.get('event_type') or '', source_dir(row.get('source')), hour_bucket(row.get('timestamp')))
+        for row in rows
+    )
+
+
+def record_counts(session, rows):
+    """Add event mappings to the hourly rollup inside the caller's transaction"""
+    counts = count_keys(rows)
+    if not counts:
+        return
+    values = [
+        {'event_type': event_type, 'source_dir': directory, 'hour': hour, 'count': count}
+        for (event_type, directory, hour), count in counts.items()
+    ]
+    dialect = session.get_bind().dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        for i in range(0, len(values), UPSERT_CHUNK):
+            statement = insert(TimelineEventCount).values(values[i:i + UPSERT_CHUNK])
+            statement = statement.on_conflict_do_update(
+                index_elements=['event_type', 'source_dir', 'hour'],
+                set_={'count': TimelineEventCount.count + statement.excluded['count']}
+            )
+            session.execute(statement)
+        return
+
+    # Other databases: read-modify-write
+    for value in values:
+        existing = session.get(TimelineEventCount, (value['event_type'], value['source_dir'], value['hour']))
+        if existing is None:
+            session.add(TimelineEventCount(**value))
+        else:
+            existing.count += value['count']
+
+
+def event_totals(session):
+    """Total events and totals per type, read from the rollup"""
+    by_type = dict(
+        session.execute(
+            select(TimelineEventCount.event_type, func.sum(TimelineEventCount.count))
+            .group_by(TimelineEventCount.event_type)
+        ).all()
+    )
+    return {'total': sum(by_type.values()), 'by_type': by_type}
+
+
+def hourly_activity(session, since=None, until=None, event_type=None):
+    """[(hour, count)] oldest first, optionally within [since, until) and for one type
+
+    Bounds are applied to whole hours: an hour partly inside the window counts in full.
+    """
+    query = select(TimelineEventCount.hour, func.sum(TimelineEventCount.count))\
+        .group_by(TimelineEventCount.hour)\
+        .order_by(TimelineEventCount.hour)
+    if since is not None:
+        query = query.where(TimelineEventCount.hour >= hour_bucket(since))
+    if until is not None:
+        query = query.where(TimelineEventCount.hour < until)
+    if event_type:
+        query = query.where(TimelineEventCount.event_type == event_type)
+    return [(hour, int(count)) for hour, count in session.execute(query).all()]
@@ -1,11 +1,16 @@
 from .models import TimelineEvent, CursorEventType
+from .counters import record_counts
+from .ingest import IngestClient
 from sqlalchemy.orm import Session
 from loguru import logger
 import json
+from datetime import datetime
 
 class CursorEventHandler:
-    def __init__(self, db_session: Session):
+    def __init__(self, db_session: Session = None, client: IngestClient = None):
+        """Send events to the ingest daemon, or write through ``db_session`` if given"""
         self.session = db_session
+        self.client = client or (IngestClient() if db_session is None else None)
         
     def record_cursor_event(self, 
                            event_type: CursorEventType,
@@ -15,25 +20,30 @@ class CursorEventHandler:
                            file_path: str = None):
         """Record a Cursor IDE event"""
         try:
-            event = TimelineEvent(
-                event_type='cursor',
-                source=file_path or 'cursor',
-                action=event_type.value,
-                cursor_event_type=event_type,
-                user_input=user_input,
-                ai_response=ai_response,
-                code_changes=code_changes,
-                details={
+            event = {
+                'timestamp': datetime.utcnow(),
+                'event_type': 'cursor',
+                'source': file_path or 'cursor',
+                'action': event_type.value,
+                'cursor_event_type': event_type,
+                'user_input': user_input,
+                'ai_response': ai_response,
+                'code_changes': code_changes,
+                'details': {
                     'cursor_version': '0.1',  # Add version tracking
                     'has_code_changes': bool(code_changes),
                     'files_affected': list(code_changes.keys()) if code_changes else []
                 }
-            )
+            }
             
-            self.session.add(event)
-            self.session.commit()
+            if self.client is not None:
+                self.client.send(event)
+            else:
+                self.session.add(TimelineEvent(**event))
+                record_counts(self.session, [event])
+                self.session.commit()
             logger.info(f"Recorded Cursor {event_type.value} event")
             
         except Exception as e:
             logger.error(f"Failed to record Cursor event: {str(e)}")
-            raise 
\ No newline at end of file
+            raise 
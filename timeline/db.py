@@ -0,0 +1,33 @@
+from sqlalchemy import create_engine, event
+
+DEFAULT_DB_URL = 'sqlite:///timeline/data/timeline.db'
+
+
+def create_timeline_engine(url=DEFAULT_DB_URL, **kwargs):
+    """Create an engine for the timeline database.
+
+    SQLite connections are opened in WAL mode with a busy timeout, so the
+    watcher can keep writing while the dev docs server and CLI read, and
+    the pool hands connections across threads.
+    """
+    if url.startswith('sqlite'):
+        kwargs.setdefault('connect_args', {}).setdefault('check_same_thread', False)
+        if ':memory:' not in url:
+            kwargs.setdefault('pool_size', 5)
+            kwargs.setdefault('max_overflow', 10)
+            kwargs.setdefault('pool_recycle', 3600)
+    engine = create_engine(url, **kwargs)
+
+    if engine.dialect.name == 'sqlite':
+        @event.listens_for(engine, "connect")
+        def _set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            # Only takes effect on a new file; `timeline compact` converts old ones
+            cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA busy_timeout=5000")
+            cursor.close()
+
+    return engine
+
@@ -0,0 +1,86 @@
+import difflib
+from collections import OrderedDict
+from .blobs import BlobStore
+
+
+class DiffTracker:
+    """Remembers the last-seen version of each file and turns saves into diffs.
+
+    The first capture of a file (and every ``keyframe_interval`` changes after
+    that, or whenever a diff would be larger than half the file) is a
+    keyframe: the full bytes go to the blob store. Every other capture only
+    records a compact unified diff against the previous version, with the
+    keyframe digest it descends from.
+    """
+
+    def __init__(self, max_files=2000, keyframe_interval=50,
+                 max_text_bytes=1024 * 1024, context_lines=1):
+        self.max_files = max_files
+        self.keyframe_interval = keyframe_interval
+        self.max_text_bytes = max_text_bytes
+        self.context_lines = context_lines
+        # path -> (lines, keyframe digest, changes since keyframe)
+        self._last = OrderedDict()
+
+    def capture(self, path: str, data: bytes) -> dict:
+        """Return the event fields for a new version of ``path``.
+
+        Keys: ``content`` (unified diff text or None), ``snapshot`` (bytes to
+        store, keyframes only) and ``diff`` (summary for ``details``).
+        """
+        text = self._decode(data)
+        if text is None:
+            # Binary or too large to diff: snapshot it and forget any history
+            self._last.pop(path, None)
+            return {'content': None, 'snapshot': data,
+                    'diff': {'keyframe': True, 'binary': True}}
+
+        lines = text.splitlines(keepends=True)
+        previous = self._last.pop(path, None)
+        if previous is None:
+            return self._keyframe(path, data, lines)
+
+        old_lines, base, since_keyframe = previous
+        diff = ''.join(difflib.unified_diff(
+            old_lines, lines, fromfile=path, tofile=path, n=self.context_lines
+        ))
+        added = removed = 0
+        for line in diff.splitlines():
+            if line.startswith('+') and not line.startswith('+++'):
+                added += 1
+            elif line.startswith('-') and not line.startswith('---'):
+                removed += 1
+
+        since_keyframe += 1
+        if since_keyframe >= self.keyframe_interval or len(diff) > len(data) // 2:
+            result = self._keyframe(path, data, lines)
+            result['content'] = diff or None
+            result['diff'].update(added=added, removed=removed, bytes=len(diff))
+            return result
+
+        self._remember(path, lines, base, since_keyframe)
+        return {
+            'content': diff or None,
+            'snapshot': None,
+            'diff': {'keyframe': False, 'base': base,
+                     'added': added, 'removed': removed, 'bytes': len(diff)},
+        }
+
+    def _keyframe(self, path, data, lines):
+        digest = BlobStore.digest(data)
+        self._remember(path, lines, digest, 0)
+        return {'content': None, 'snapshot': data,
+                'diff': {'keyframe': True, 'base': digest, 'lines': len(lines)}}
+
+    def _remember(self, path, lines, base, since_keyframe):
+        self._last[path] = (lines, base, since_keyframe)
+        while len(self._last) > self.max_files:
+            self._last.popitem(last=False)
+
+    def _decode(self, data):
+        if len(data) > self.max_text_bytes or b'\0' in data[:8192]:
+            return None
+        try:
+            return data.decode('utf-8')
+        except UnicodeDecodeError:
+            return None
@@ -0,0 +1,170 @@
+import json
+from sqlalchemy import select
+from loguru import logger
+from .models import TimelineEvent
+from .partitions import iter_sources
+
+# pyarrow is optional (jsonl export needs nothing extra) and slow to import,
+# so it is loaded by the first Parquet/Arrow export rather than by the CLI
+pyarrow = None
+
+EXPORT_FORMATS = ('parquet', 'arrow', 'jsonl')
+
+# Low-cardinality columns stored as dictionary indices
+DICTIONARY_COLUMNS = ('event_type', 'source', 'action', 'cursor_event_type')
+JSON_COLUMNS = ('details', 'code_changes')
+
+EXPORT_COLUMNS = [
+    TimelineEvent.id, TimelineEvent.timestamp,
+    TimelineEvent.event_type, TimelineEvent.source, TimelineEvent.action,
+    TimelineEvent.details, TimelineEvent.content, TimelineEvent.content_digest,
+    TimelineEvent.cursor_event_type, TimelineEvent.user_input,
+    TimelineEvent.ai_response, TimelineEvent.code_changes,
+]
+
+
+def _load_pyarrow():
+    global pyarrow
+    if pyarrow is None:
+        try:
+            import pyarrow.ipc
+            import pyarrow.parquet
+        except ImportError:
+            pyarrow = None
+    return pyarrow
+
+
+def iter_event_chunks(session, since=None, until=None, chunk_size=10000):
+    """Yield lists of event rows, oldest first, from the archives and the main database.
+
+    Rows are streamed with ``yield_per`` so only one chunk is held in memory.
+    """
+    query = select(*EXPORT_COLUMNS).order_by(TimelineEvent.timestamp, TimelineEvent.id)
+    if since is not None:
+        query = query.where(TimelineEvent.timestamp >= since)
+    if until is not None:
+        query = query.where(TimelineEvent.timestamp < until)
+
+    for _, source in iter_sources(session, since, until):
+        result = source.execute(query.execution_options(yield_per=chunk_size))
+        for chunk in result.partitions():
+            yield [row._asdict() for row in chunk]
+
+
+def _plain(row):
+    """Row values as JSON-friendly Python types"""
+    row = dict(row)
+    if row['cursor_event_type'] is not None:
+        row['cursor_event_type'] = row['cursor_event_type'].value
+    return row
+
+
+def export_jsonl(chunks, output):
+    written = 0
+    with open(output, 'w') as f:
+        for chunk in chunks:
+            for row in chunk:
+                row = _plain(row)
+                row['timestamp'] = row['timestamp'].isoformat() if row['timestamp'] else None
+                f.write(json.dumps(row, default=str) + '\n')
+            written += len(chunk)
+    return written
+
+
+class _DictionaryEncoder:
+    """Grows one dictionary per column across batches.
+
+    Every batch is encoded against the dictionary seen so far, so later
+    batches only ever append to it (an Arrow dictionary delta) instead of
+    replacing it.
+    """
+
+    def __init__(self):
+        self.index = {}
+        self.values = []
+
+    def encode(self, column):
+        indices = []
+        for value in column:
+            if value is None:
+                indices.append(None)
+                continue
+            position = self.index.get(value)
+            if position is None:
+                position = self.index[value] = len(self.values)
+                self.values.append(value)
+            indices.append(position)
+        return pyarrow.DictionaryArray.from_arrays(
+            pyarrow.array(indices, type=pyarrow.int32()),
+            pyarrow.array(self.values, type=pyarrow.string())
+        )
+
+
+def arrow_schema():
+    fields = [
+        pyarrow.field('id', pyarrow.int64()),
+        pyarrow.field('timestamp', pyarrow.timestamp('us')),
+    ]
+    for name in (column.key for column in EXPORT_COLUMNS[2:]):
+        if name in DICTIONARY_COLUMNS:
+            fields.append(pyarrow.field(name, pyarrow.dictionary(pyarrow.int32(), pyarrow.string())))
+        else:
+            fields.append(pyarrow.field(name, pyarrow.string()))
+    return pyarrow.schema(fields)
+
+
+def _record_batches(chunks, schema):
+    encoders = {name: _DictionaryEncoder() for name in DICTIONARY_COLUMNS}
+    for chunk in chunks:
+        rows = [_plain(row) for row in chunk]
+        arrays = []
+        for field in schema:
+            values = [row[field.name] for row in rows]
+            if field.name in encoders:
+                arrays.append(encoders[field.name].encode(values))
+            elif field.name in JSON_COLUMNS:
+                arrays.append(pyarrow.array(
+                    [json.dumps(value, default=str) if value is not None else None for value in values],
+                    type=field.type
+                ))
+            else:
+                arrays.append(pyarrow.array(values, type=field.type))
+        yield pyarrow.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def export_parquet(chunks, output):
+    schema = arrow_schema()
+    written = 0
+    with pyarrow.parquet.ParquetWriter(
+        output, schema, compression='zstd', use_dictionary=list(DICTIONARY_COLUMNS)
+    ) as writer:
+        for batch in _record_batches(chunks, schema):
+            writer.write_batch(batch)
+            written += batch.num_rows
+    return written
+
+
+def export_arrow(chunks, output):
+    schema = arrow_schema()
+    options = pyarrow.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+    written = 0
+    with pyarrow.OSFile(str(output), 'wb') as sink:
+        with pyarrow.ipc.new_file(sink, schema, options=options) as writer:
+            for batch in _record_batches(chunks, schema):
+                writer.write_batch(batch)
+                written += batch.num_rows
+    return written
+
+
+def export_events(session, output, format='parquet', since=None, until=None, chunk_size=10000):
+    """Stream events in [since, until) to ``output``; returns the number written"""
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {format}")
+    if format != 'jsonl' and _load_pyarrow() is None:
+        raise ValueError(f"{format} export needs pyarrow (pip install pyarrow)")
+
+    chunks = iter_event_chunks(session, since=since, until=until, chunk_size=chunk_size)
+    exporter = {'parquet': export_parquet, 'arrow': export_arrow, 'jsonl': export_jsonl}[format]
+    written = exporter(chunks, output)
+    logger.info(f"Exported {written} timeline events to {output}")
+    return written
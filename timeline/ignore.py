@@ -0,0 +1,150 @@
+import os
+import re
+from pathlib import Path
+from loguru import logger
+
+DEFAULT_IGNORES = [
+    '*.pyc', '__pycache__', '.git', 'node_modules',
+    '*.swp', '*.swo', '.DS_Store'
+]
+
+IGNORE_FILES = ('.gitignore', '.timelineignore')
+
+
+def translate(pattern: str) -> str:
+    """Translate one gitignore glob (without '!' or trailing '/') to a regex"""
+    anchored = '/' in pattern
+    pattern = pattern.lstrip('/')
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            if pattern.startswith('**', i):
+                at_segment_start = i == 0 or pattern[i - 1] == '/'
+                if at_segment_start and pattern.startswith('**/', i):
+                    out.append('(?:.*/)?')
+                    i += 3
+                    continue
+                if at_segment_start and i + 2 == n:
+                    out.append('.*')
+                    i += 2
+                    continue
+                i += 1
+            out.append('[^/]*')
+        elif c == '?':
+            out.append('[^/]')
+        elif c == '[':
+            # A ']' right after '[' (or '[!') is a member, not the end
+            end = pattern.find(']', i + 3 if pattern[i + 1:i + 2] in ('!', '^') else i + 2)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end].replace('\\', '\\\\')
+                # Characters the re module treats as set syntax are literal here
+                body = re.sub(r'([&~|\[])', r'\\\1', body)
+                if body[:1] in ('!', '^'):
+                    body = '^' + body[1:]
+                out.append('[' + body + ']')
+                i = end
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    regex = ''.join(out)
+    return regex if anchored else '(?:.*/)?' + regex
+
+
+class IgnoreMatcher:
+    """gitignore-compatible path matcher compiled once into two regexes.
+
+    Patterns are combined into one alternation ordered last-to-first, so the
+    alternative that matches is the one gitignore would pick ("last match
+    wins") and its group name tells us whether it was a negation. Decisions
+    for directories are cached, and a path under an ignored directory is
+    ignored without being matched itself, as in git.
+    """
+
+    def __init__(self, root='.', patterns=()):
+        self.root = os.path.abspath(root)
+        self._prefix = self.root.rstrip(os.sep) + os.sep
+        self.patterns = []
+        self._dir_cache = {}
+        for pattern in patterns:
+            self.add(pattern)
+        self._compile()
+
+    @classmethod
+    def for_root(cls, root='.', patterns=None, ignore_files=IGNORE_FILES):
+        """Matcher for ``root`` using defaults (or ``patterns``) plus its ignore files"""
+        lines = list(DEFAULT_IGNORES if patterns is None else patterns)
+        for name in ignore_files:
+            ignore_file = Path(root) / name
+            if ignore_file.is_file():
+                lines.extend(ignore_file.read_text(errors='replace').splitlines())
+                logger.debug(f"Loaded ignore patterns from {ignore_file}")
+        return cls(root, lines)
+
+    def add(self, line: str):
+        """Parse one gitignore line; call ``_compile`` afterwards"""
+        line = line.rstrip('\n')
+        if not line.strip() or line.startswith('#'):
+            return
+        if not line.endswith('\\ '):
+            line = line.rstrip()
+        negate = line.startswith('!')
+        if negate or line.startswith('\\!') or line.startswith('\\#'):
+            line = line[1:]
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        if line:
+            self.patterns.append((translate(line), negate, dir_only))
+
+    def _compile(self):
+        def combine(entries):
+            alternatives = [
+                f'(?P<{"n" if negate else "i"}{index}>{regex})'
+                for index, (regex, negate, _) in reversed(list(enumerate(entries)))
+            ]
+            return re.compile('(?:' + '|'.join(alternatives) + r')\Z') if alternatives else None
+
+        self._file_regex = combine([p for p in self.patterns if not p[2]])
+        self._dir_regex = combine(self.patterns)
+        self._dir_cache.clear()
+
+    def _relative(self, path):
+        path = os.fspath(path)
+        if not os.path.isabs(path):
+            path = os.path.join(self.root, path)
+        if not path.startswith(self._prefix):
+            return None
+        return path[len(self._prefix):].replace(os.sep, '/')
+
+    @staticmethod
+    def _matches(regex, rel):
+        if regex is None:
+            return False
+        match = regex.match(rel)
+        return match is not None and match.lastgroup[0] == 'i'
+
+    def _dir_ignored(self, rel_dir):
+        cached = self._dir_cache.get(rel_dir)
+        if cached is None:
+            parent = rel_dir.rpartition('/')[0]
+            cached = (bool(parent) and self._dir_ignored(parent)) \
+                or self._matches(self._dir_regex, rel_dir)
+            self._dir_cache[rel_dir] = cached
+        return cached
+
+    def is_ignored(self, path, is_dir=False) -> bool:
+        rel = self._relative(path)
+        if not rel:
+            return False
+        if is_dir:
+            return self._dir_ignored(rel)
+        parent, _, _ = rel.rpartition('/')
+        if parent and self._dir_ignored(parent):
+            return True
+        return self._matches(self._file_regex, rel)
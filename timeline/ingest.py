@@ -0,0 +1,397 @@
+import asyncio
+import base64
+import enum
+import json
+import os
+import select
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from loguru import logger
+from .blobs import BlobStore
+from .models import CursorEventType
+from .writer import write_rows
+
+try:
+    import fcntl
+except ImportError:  # Windows: spool appends are only serialised per process
+    fcntl = None
+
+DEFAULT_ADDRESS = 'timeline/data/ingest.sock'
+DEFAULT_SPOOL = 'timeline/data/ingest.spool'
+
+# One line may carry a base64 file snapshot
+MAX_LINE = 16 * 1024 * 1024
+
+ENUM_COLUMNS = {'cursor_event_type': CursorEventType}
+
+
+def parse_address(address):
+    """'host:port' is a TCP address on localhost, anything else a Unix socket path"""
+    host, _, port = str(address).rpartition(':')
+    if host and port.isdigit() and os.sep not in host:
+        return 'tcp', (host, int(port))
+    return 'unix', str(address)
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {'$datetime': value.isoformat()}
+    if isinstance(value, (bytes, bytearray)):
+        return {'$bytes': base64.b64encode(value).decode('ascii')}
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f"Cannot encode {type(value).__name__} for ingest")
+
+
+def _decode_value(obj):
+    if len(obj) == 1:
+        if '$datetime' in obj:
+            return datetime.fromisoformat(obj['$datetime'])
+        if '$bytes' in obj:
+            return base64.b64decode(obj['$bytes'])
+    return obj
+
+
+@contextmanager
+def spool_lock(spool_path):
+    """Exclusive lock clients hold while appending to the spool and the daemon while rotating it"""
+    if fcntl is None:
+        yield
+        return
+    path = Path(spool_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(path.name + '.lock'), 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def encode_event(mapping) -> bytes:
+    """One event mapping as an NDJSON line"""
+    return json.dumps(mapping, default=_encode_value, separators=(',', ':')).encode() + b'\n'
+
+
+def decode_event(line):
+    mapping = json.loads(line, object_hook=_decode_value)
+    for column, enum_type in ENUM_COLUMNS.items():
+        if mapping.get(column) is not None:
+            mapping[column] = enum_type(mapping[column])
+    return mapping
+
+
+class IngestServer:
+    """Asyncio daemon that owns timeline writes.
+
+    Producers send NDJSON event mappings over a Unix socket (or localhost
+    TCP). Connections feed one bounded queue; when it is full, reads stop
+    and the kernel socket buffers push back on the producers. A single
+    committer drains the queue in group commits of up to ``batch_size``
+    rows, waiting up to ``flush_interval`` for a partial batch to fill.
+    Events spooled by clients while the daemon was down are replayed on
+    start and every ``spool_interval`` seconds; a batch that fails to
+    commit is appended to the same spool and retried with them.
+    """
+
+    def __init__(self, session_factory, address=DEFAULT_ADDRESS, spool_path=DEFAULT_SPOOL,
+                 max_queue=10000, batch_size=500, flush_interval=0.05,
+                 spool_interval=30.0, blob_store=None):
+        self.session_factory = session_factory
+        self.address = address
+        self.spool_path = Path(spool_path)
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spool_interval = spool_interval
+        self.blob_store = blob_store or BlobStore()
+        self.queue = None
+        self._server = None
+        self._streams = set()
+        self._tasks = []
+
+        self.received = 0
+        self.rejected = 0
+        self.written = 0
+        self.commits = 0
+        self.respooled = 0
+        self.dropped = 0
+
+    async def start(self):
+        self.queue = asyncio.Queue(maxsize=self.max_queue)
+        kind, target = parse_address(self.address)
+        if kind == 'unix':
+            Path(target).parent.mkdir(parents=True, exist_ok=True)
+            if os.path.exists(target):
+                os.unlink(target)  # Stale socket from a previous run
+            self._server = await asyncio.start_unix_server(self._handle, path=target, limit=MAX_LINE)
+        else:
+            self._server = await asyncio.start_server(self._handle, *target, limit=MAX_LINE)
+        self._tasks = [
+            asyncio.create_task(self._commit_loop(), name="ingest-commit"),
+            asyncio.create_task(self._spool_loop(), name="ingest-spool"),
+        ]
+        logger.info(f"Timeline ingest listening on {self.address}")
+        return self
+
+    async def stop(self):
+        """Stop accepting events, commit everything queued and shut down"""
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        for stream in list(self._streams):
+            stream.close()
+        await self.queue.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        kind, target = parse_address(self.address)
+        if kind == 'unix' and os.path.exists(target):
+            os.unlink(target)
+        logger.info(f"Timeline ingest stopped ({self.written} events written)")
+
+    def stats(self):
+        return {
+            'connections': len(self._streams),
+            'queued': self.queue.qsize() if self.queue else 0,
+            'received': self.received,
+            'rejected': self.rejected,
+            'written': self.written,
+            'commits': self.commits,
+            'respooled': self.respooled,
+            'dropped': self.dropped,
+        }
+
+    async def _handle(self, reader, writer):
+        self._streams.add(writer)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    logger.warning("Dropping ingest connection: line over the size limit")
+                    break
+                if not line:
+                    break
+                if not line.endswith(b'\n'):
+                    break  # Client went away mid-line
+                try:
+                    mapping = decode_event(line)
+                except (ValueError, TypeError) as e:
+                    self.rejected += 1
+                    logger.warning(f"Rejected malformed ingest event: {str(e)}")
+                    continue
+                self.received += 1
+                await self.queue.put(mapping)
+        except ConnectionError:
+            pass
+        finally:
+            self._streams.discard(writer)
+            writer.close()
+
+    def _drain(self, rows):
+        while len(rows) < self.batch_size:
+            try:
+                rows.append(self.queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return rows
+
+    async def _commit_loop(self):
+        while True:
+            # Whatever queued up during the previous commit goes into this one
+            rows = self._drain([await self.queue.get()])
+            if len(rows) < self.batch_size and self.flush_interval:
+                await asyncio.sleep(self.flush_interval)
+                self._drain(rows)
+            try:
+                # write_rows moves snapshots out of the rows, so keep them for the spool
+                if await asyncio.to_thread(write_rows, self.session_factory,
+                                           [dict(row) for row in rows], self.blob_store):
+                    self.written += len(rows)
+                    self.commits += 1
+                else:
+                    await asyncio.to_thread(self._spool_failed, rows)
+            finally:
+                for _ in rows:
+                    self.queue.task_done()
+
+    def _spool_failed(self, rows):
+        """Append a batch that failed to commit to the spool; the spool loop retries it"""
+        data = b''.join(encode_event(row) for row in rows)
+        try:
+            with spool_lock(self.spool_path), open(self.spool_path, 'ab') as f:
+                f.write(data)
+            self.respooled += len(rows)
+        except OSError as e:
+            self.dropped += len(rows)
+            logger.error(f"Failed to spool {len(rows)} uncommitted timeline events: {str(e)}")
+
+    async def _spool_loop(self):
+        while True:
+            try:
+                await self.replay_spool()
+            except Exception as e:
+                logger.error(f"Failed to replay ingest spool: {str(e)}")
+            await asyncio.sleep(self.spool_interval)
+
+    async def replay_spool(self):
+        """Queue events that clients spooled while the daemon was unreachable"""
+        if not self.spool_path.exists():
+            return 0
+        replaying = self.spool_path.with_suffix('.replaying')
+        if not replaying.exists():
+            # Clients append under the same lock, so none can be midway
+            # through writing to the file being moved
+            with spool_lock(self.spool_path):
+                os.replace(self.spool_path, replaying)
+        replayed = 0
+        with open(replaying, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    continue
+                try:
+                    await self.queue.put(decode_event(line))
+                    replayed += 1
+                except (ValueError, TypeError) as e:
+                    self.rejected += 1
+                    logger.warning(f"Skipping malformed spooled event: {str(e)}")
+        replaying.unlink()
+        logger.info(f"Replayed {replayed} spooled timeline events")
+        return replayed
+
+
+class IngestClient:
+    """Thread-safe producer side of the ingest daemon.
+
+    ``send`` writes NDJSON lines to the daemon socket. While the daemon
+    applies backpressure it blocks, checking every ``timeout`` seconds that
+    the daemon is still connected; only a daemon that is down (refused,
+    hung up, or making no progress for ``stall_timeout``) makes it fall
+    back to a local spool file. Lines the daemon already received are
+    never spooled again. Reconnecting is retried at most every
+    ``retry_interval`` seconds.
+    """
+
+    def __init__(self, address=DEFAULT_ADDRESS, spool_path=DEFAULT_SPOOL,
+                 timeout=5.0, retry_interval=5.0, stall_timeout=120.0):
+        self.address = address
+        self.spool_path = Path(spool_path)
+        self.timeout = timeout
+        self.retry_interval = retry_interval
+        self.stall_timeout = stall_timeout
+        self._socket = None
+        self._next_attempt = 0.0
+        self._lock = threading.Lock()
+
+        self.sent = 0
+        self.spooled = 0
+
+    def send(self, mapping):
+        return self.send_many([mapping])
+
+    def send_many(self, mappings):
+        """Deliver event mappings; returns False only if they could not even be spooled"""
+        if not mappings:
+            return True
+        data = b''.join(encode_event(mapping) for mapping in mappings)
+        with self._lock:
+            sent = 0
+            sock = self._connect()
+            if sock is not None:
+                sent = self._send(sock, data)
+                if sent == len(data):
+                    self.sent += len(mappings)
+                    return True
+                self._disconnect()
+            # The daemon drops a trailing partial line, so spool from its start
+            delivered = data.count(b'\n', 0, sent)
+            self.sent += delivered
+            return self._spool(data[data.rfind(b'\n', 0, sent) + 1:], len(mappings) - delivered)
+
+    def _send(self, sock, data):
+        """Write ``data``; returns how many bytes went out before the daemon was lost"""
+        view = memoryview(data)
+        sent = 0
+        progress = time.monotonic()
+        while sent < len(data):
+            try:
+                _, writable, _ = select.select([], [sock], [], self.timeout)
+                if writable:
+                    sent += sock.send(view[sent:])
+                    progress = time.monotonic()
+                    continue
+            except TimeoutError:
+                pass
+            except OSError as e:
+                logger.warning(f"Timeline ingest unavailable, spooling events: {str(e)}")
+                return sent
+            # Not writable: a busy daemon, unless it hung up or stopped reading entirely
+            if not self._peer_open(sock):
+                logger.warning("Timeline ingest closed the connection, spooling events")
+                return sent
+            if time.monotonic() - progress > self.stall_timeout:
+                logger.warning(f"Timeline ingest stalled for {self.stall_timeout:.0f}s, spooling events")
+                return sent
+        return sent
+
+    def close(self):
+        with self._lock:
+            self._disconnect()
+
+    def _connect(self):
+        if self._socket is not None:
+            if self._peer_open(self._socket):
+                return self._socket
+            self._socket.close()
+            self._socket = None
+            self._next_attempt = 0.0
+        if time.monotonic() < self._next_attempt:
+            return None
+        kind, target = parse_address(self.address)
+        try:
+            if kind == 'unix':
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.settimeout(self.timeout)
+                sock.connect(target)
+            else:
+                sock = socket.create_connection(target, timeout=self.timeout)
+        except OSError:
+            self._next_attempt = time.monotonic() + self.retry_interval
+            return None
+        self._socket = sock
+        return sock
+
+    @staticmethod
+    def _peer_open(sock):
+        """The daemon never writes back, so readable means it hung up"""
+        try:
+            readable, _, _ = select.select([sock], [], [], 0)
+            return not readable or sock.recv(1, socket.MSG_PEEK) != b''
+        except OSError:
+            return False
+
+    def _disconnect(self):
+        if self._socket is not None:
+            try:
+                self._socket.close()
+            except OSError:
+                pass
+            self._socket = None
+        self._next_attempt = time.monotonic() + self.retry_interval
+
+    def _spool(self, data, count):
+        try:
+            self.spool_path.parent.mkdir(parents=True, exist_ok=True)
+            with spool_lock(self.spool_path), open(self.spool_path, 'ab') as f:
+                f.write(data)
+            self.spooled += count
+            return True
+        except OSError as e:
+            logger.error(f"Failed to spool {count} timeline events: {str(e)}")
+            return False
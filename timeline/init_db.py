@@ -1,7 +1,7 @@
 from pathlib import Path
-from sqlalchemy import create_engine
 from loguru import logger
 from .models import Base
+from .db import create_timeline_engine
 
 def init_database():
     """Initialize the SQLite database"""
@@ -12,7 +12,7 @@ def init_database():
         
         # Create database
         db_path = db_dir / "timeline.db"
-        engine = create_engine(f'sqlite:///{db_path}')
+        engine = create_timeline_engine(f'sqlite:///{db_path}')
         
         # Create all tables
         Base.metadata.create_all(engine)
@@ -0,0 +1,19 @@
+import sys
+from pathlib import Path
+from loguru import logger
+
+LOG_DIR = Path("timeline/logs")
+
+
+def setup_logging(name: str, level: str = "INFO"):
+    """Log to stdout and to timeline/logs/<name>.log (read by the dev docs log viewer)"""
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    logger.remove()  # Remove default handler
+    logger.add(
+        LOG_DIR / f"{name}.log",
+        rotation="1 day",
+        retention="7 days",
+        format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}",
+        level=level
+    )
+    logger.add(sys.stdout, colorize=True, format="<green>{time:HH:mm:ss}</green> | <level>{level}</level> | <cyan>{message}</cyan>", level=level)
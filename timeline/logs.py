@@ -2,9 +2,10 @@ from pathlib import Path
 from datetime import datetime
 from rich.console import Console
 from rich.table import Table
-from rich.markdown import Markdown
 from sqlalchemy import desc
 from .models import TimelineEvent
+from .blobs import BlobStore
+from .partitions import MonthPartitions, month_start
 import json
 
 console = Console()
@@ -12,6 +13,7 @@ console = Console()
 class TimelineLogger:
     def __init__(self, db_session):
         self.session = db_session
+        self.partitions = MonthPartitions.for_bind(db_session.get_bind())
         self.log_dir = Path("timeline/logs")
         self.log_dir.mkdir(parents=True, exist_ok=True)
 
@@ -37,6 +39,9 @@ class TimelineLogger:
                     f.write(json.dumps(event.details, indent=2))
                     f.write("\n```\n")
                 
+                if event.content_digest:
+                    f.write(f"- Snapshot: {event.content_digest}\n")
+                
                 if event.content:
                     f.write("### Content\n```\n")
                     f.write(event.content[:500] + ("..." if len(event.content) > 500 else ""))
@@ -46,12 +51,21 @@ class TimelineLogger:
         
         return log_file
 
+    def _query(self, build, limit):
+        """Newest-first events from the main database, then archives if still short"""
+        events = build(self.session).limit(limit).all()
+        if self.partitions is not None and len(events) < limit:
+            until = events[-1].timestamp if events else None
+            events.extend(self.partitions.query(build, until=until, limit=limit - len(events)))
+        return events
+
     def display_recent_changes(self, limit=100):
         """Display recent changes in rich table format"""
-        events = self.session.query(TimelineEvent)\
-            .order_by(desc(TimelineEvent.timestamp))\
-            .limit(limit)\
-            .all()
+        events = self._query(
+            lambda session: session.query(TimelineEvent)\
+                .order_by(desc(TimelineEvent.timestamp)),
+            limit
+        )
         
         # Create rich table
         table = Table(title=f"Recent Timeline Events (Last {limit})")
@@ -82,16 +96,30 @@ class TimelineLogger:
 
     def get_logs_by_type(self, event_type, limit=100):
         """Get logs filtered by event type"""
-        return self.session.query(TimelineEvent)\
-            .filter(TimelineEvent.event_type == event_type)\
-            .order_by(desc(TimelineEvent.timestamp))\
-            .limit(limit)\
-            .all()
+        return self._query(
+            lambda session: session.query(TimelineEvent)\
+                .filter(TimelineEvent.event_type == event_type)\
+                .order_by(desc(TimelineEvent.timestamp)),
+            limit
+        )
 
     def get_logs_by_source(self, source, limit=100):
         """Get logs filtered by source"""
-        return self.session.query(TimelineEvent)\
-            .filter(TimelineEvent.source.like(f"%{source}%"))\
-            .order_by(desc(TimelineEvent.timestamp))\
-            .limit(limit)\
-            .all() 
\ No newline at end of file
+        return self._query(
+            lambda session: session.query(TimelineEvent)\
+                .filter(TimelineEvent.source.like(f"%{source}%"))\
+                .order_by(desc(TimelineEvent.timestamp)),
+            limit
+        )
+
+    def get_snapshot(self, event):
+        """Return the full file snapshot recorded for an event, if any"""
+        if not event.content_digest:
+            return None
+        data = BlobStore().get(self.session, event.content_digest)
+        if data is None and self.partitions is not None and event.timestamp:
+            month = month_start(event.timestamp)
+            if month in self.partitions.months():
+                with self.partitions.session(month) as session:
+                    data = BlobStore().get(session, event.content_digest)
+        return data.decode(errors='replace') if data is not None else None
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, JSON, Text, Enum
+from sqlalchemy import create_engine, Column, Integer, String, DateTime, JSON, Text, Enum, Index, LargeBinary, DDL, event
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 import enum
@@ -15,6 +15,12 @@ class CursorEventType(enum.Enum):
 
 class TimelineEvent(Base):
     __tablename__ = 'timeline_events'
+    __table_args__ = (
+        # Every listing is "newest first", optionally narrowed by type or source
+        Index('ix_timeline_events_timestamp', 'timestamp'),
+        Index('ix_timeline_events_type_timestamp', 'event_type', 'timestamp'),
+        Index('ix_timeline_events_source_timestamp', 'source', 'timestamp'),
+    )
     
     id = Column(Integer, primary_key=True)
     timestamp = Column(DateTime, default=datetime.utcnow)
@@ -23,9 +29,54 @@ class TimelineEvent(Base):
     action = Column(String(50))      # Action type
     details = Column(JSON)           # Additional details
     content = Column(Text)           # Event content
+    content_digest = Column(String(64), nullable=True)  # Snapshot in timeline_blobs
     
     # Cursor-specific fields
     cursor_event_type = Column(Enum(CursorEventType), nullable=True)
     ai_response = Column(Text, nullable=True)        # AI's response
     user_input = Column(Text, nullable=True)         # User's input
-    code_changes = Column(JSON, nullable=True)       # Code changes made 
\ No newline at end of file
+    code_changes = Column(JSON, nullable=True)       # Code changes made 
+
+# SQLite full-text index over the searchable text, kept in sync by triggers
+TIMELINE_FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS timeline_events_fts USING fts5(
+        content, user_input, ai_response,
+        content='timeline_events', content_rowid='id', tokenize='porter unicode61'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS timeline_events_fts_insert AFTER INSERT ON timeline_events BEGIN
+        INSERT INTO timeline_events_fts(rowid, content, user_input, ai_response)
+        VALUES (new.id, new.content, new.user_input, new.ai_response);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS timeline_events_fts_delete AFTER DELETE ON timeline_events BEGIN
+        INSERT INTO timeline_events_fts(timeline_events_fts, rowid, content, user_input, ai_response)
+        VALUES ('delete', old.id, old.content, old.user_input, old.ai_response);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS timeline_events_fts_update AFTER UPDATE OF content, user_input, ai_response ON timeline_events BEGIN
+        INSERT INTO timeline_events_fts(timeline_events_fts, rowid, content, user_input, ai_response)
+        VALUES ('delete', old.id, old.content, old.user_input, old.ai_response);
+        INSERT INTO timeline_events_fts(rowid, content, user_input, ai_response)
+        VALUES (new.id, new.content, new.user_input, new.ai_response);
+    END""",
+]
+for statement in TIMELINE_FTS_DDL:
+    event.listen(TimelineEvent.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+
+class TimelineBlob(Base):
+    """Compressed file snapshot, stored once per distinct content"""
+    __tablename__ = 'timeline_blobs'
+
+    digest = Column(String(64), primary_key=True)  # sha256 of the raw bytes
+    codec = Column(String(10))                     # 'zstd' or 'zlib'
+    size = Column(Integer)                         # Uncompressed size
+    data = Column(LargeBinary)                     # Compressed bytes
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class TimelineEventCount(Base):
+    """Hourly event counts per type and source directory, kept by the write path"""
+    __tablename__ = 'timeline_event_counts'
+
+    event_type = Column(String(50), primary_key=True)
+    source_dir = Column(String(255), primary_key=True)  # Directory of the source path
+    hour = Column(DateTime, primary_key=True)           # Start of the hour (UTC)
+    count = Column(Integer, nullable=False, default=0)
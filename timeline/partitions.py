@@ -0,0 +1,215 @@
+import re
+from datetime import datetime
+from pathlib import Path
+from loguru import logger
+from sqlalchemy import create_engine, select, delete, insert, func, MetaData, text
+from sqlalchemy.orm import Session
+from .models import Base, TimelineEvent, TimelineBlob
+
+ARCHIVE_NAME = re.compile(r'timeline-(\d{4})-(\d{2})\.db$')
+
+
+def month_start(timestamp) -> datetime:
+    return datetime(timestamp.year, timestamp.month, 1)
+
+
+def add_months(month: datetime, count: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + count
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+class MonthPartitions:
+    """Monthly archive files next to a SQLite timeline database.
+
+    The main database holds recent events plus the hourly counters. Older
+    months are moved into ``archive/timeline-YYYY-MM.db`` (events and the
+    snapshots they reference), and reads only open the archives whose month
+    overlaps the requested time range.
+    """
+
+    def __init__(self, db_path, archive_dir=None):
+        self.db_path = Path(db_path)
+        self.archive_dir = Path(archive_dir) if archive_dir else self.db_path.parent / 'archive'
+        self._engines = {}
+
+    @classmethod
+    def for_bind(cls, bind):
+        """Partitions for an engine or connection, or None if it isn't a SQLite file"""
+        url = bind.engine.url
+        if url.get_backend_name() != 'sqlite' or not url.database or url.database == ':memory:':
+            return None
+        return cls(url.database)
+
+    def path(self, month: datetime) -> Path:
+        return self.archive_dir / f'timeline-{month:%Y-%m}.db'
+
+    def months(self):
+        """Archived months, oldest first"""
+        if not self.archive_dir.is_dir():
+            return []
+        months = []
+        for path in self.archive_dir.iterdir():
+            match = ARCHIVE_NAME.match(path.name)
+            if match:
+                months.append(datetime(int(match.group(1)), int(match.group(2)), 1))
+        return sorted(months)
+
+    def overlapping(self, since=None, until=None):
+        """Archived months intersecting [since, until], newest first"""
+        return [
+            month for month in reversed(self.months())
+            if (since is None or add_months(month, 1) > since)
+            and (until is None or month <= until)
+        ]
+
+    def session(self, month: datetime) -> Session:
+        """A session reading one archive file"""
+        engine = self._engines.get(month)
+        if engine is None:
+            engine = create_engine(f'sqlite:///{self.path(month)}')
+            self._engines[month] = engine
+        return Session(bind=engine, expire_on_commit=False)
+
+    def query(self, build, since=None, until=None, limit=None):
+        """Run ``build(session)`` (an ORM query, newest first) over the archives.
+
+        Archives are visited newest first and skipped once ``limit`` rows
+        have been collected. The returned objects are detached.
+        """
+        results = []
+        for month in self.overlapping(since, until):
+            if limit is not None and len(results) >= limit:
+                break
+            with self.session(month) as session:
+                query = build(session)
+                if limit is not None:
+                    query = query.limit(limit - len(results))
+                results.extend(query.all())
+                session.expunge_all()
+        return results
+
+    def dispose(self):
+        for engine in self._engines.values():
+            engine.dispose()
+        self._engines.clear()
+
+    def archive_month(self, engine, month: datetime) -> int:
+        """Move one month of events (and their snapshots) into its archive file"""
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        path = self.path(month)
+        archive_engine = create_engine(f'sqlite:///{path}')
+        Base.metadata.create_all(archive_engine, tables=[TimelineEvent.__table__, TimelineBlob.__table__])
+        archive_engine.dispose()
+
+        schema = 'archive_' + month.strftime('%Y_%m')
+        archived = MetaData()
+        events = TimelineEvent.__table__.to_metadata(archived, schema=schema)
+        blobs = TimelineBlob.__table__.to_metadata(archived, schema=schema)
+        main_events = TimelineEvent.__table__
+        in_month = (main_events.c.timestamp >= month) & (main_events.c.timestamp < add_months(month, 1))
+
+        with engine.connect() as connection:
+            connection.execute(text(f"ATTACH DATABASE :path AS {schema}"), {'path': str(path)})
+            connection.commit()
+            try:
+                with connection.begin():
+                    columns = [column.name for column in main_events.columns]
+                    moved = connection.execute(
+                        insert(events).prefix_with('OR IGNORE').from_select(
+                            columns, select(*main_events.columns).where(in_month)
+                        )
+                    ).rowcount
+                    digests = select(main_events.c.content_digest).where(in_month)\
+                        .where(main_events.c.content_digest.isnot(None))
+                    connection.execute(
+                        insert(blobs).prefix_with('OR IGNORE').from_select(
+                            [column.name for column in TimelineBlob.__table__.columns],
+                            select(*TimelineBlob.__table__.columns).where(TimelineBlob.digest.in_(digests))
+                        )
+                    )
+                    connection.execute(delete(main_events).where(in_month))
+                    # Snapshots still referenced by recent events stay in the main file too
+                    still_used = select(main_events.c.content_digest)\
+                        .where(main_events.c.content_digest.isnot(None))
+                    connection.execute(
+                        delete(TimelineBlob.__table__)
+                        .where(TimelineBlob.digest.in_(select(blobs.c.digest)))
+                        .where(TimelineBlob.digest.not_in(still_used))
+                    )
+            finally:
+                connection.execute(text(f"DETACH DATABASE {schema}"))
+                connection.commit()
+        logger.info(f"Archived {moved} events from {month:%Y-%m} to {path}")
+        return moved
+
+    def drop_before(self, month: datetime):
+        """Delete archive files for months before ``month``"""
+        dropped = []
+        for archived in self.months():
+            if archived < month:
+                self.path(archived).unlink()
+                dropped.append(archived)
+                logger.info(f"Dropped archive {archived:%Y-%m}")
+        return dropped
+
+
+def iter_sources(session, since=None, until=None, newest_first=False):
+    """Yield ``(month, session)`` for each archive overlapping [since, until], then ``(None, session)`` for the main database.
+
+    ``newest_first`` reverses the order. Archive sessions are closed once
+    the caller moves on to the next source.
+    """
+    partitions = MonthPartitions.for_bind(session.get_bind())
+    months = partitions.overlapping(since, until) if partitions is not None else []
+    try:
+        if newest_first:
+            yield None, session
+        for month in (months if newest_first else reversed(months)):
+            with partitions.session(month) as archive_session:
+                yield month, archive_session
+        if not newest_first:
+            yield None, session
+    finally:
+        if partitions is not None:
+            partitions.dispose()
+
+
+def incremental_vacuum(engine):
+    """Return free pages to the filesystem, switching to incremental auto_vacuum once"""
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+        mode = connection.exec_driver_sql("PRAGMA auto_vacuum").scalar()
+        if mode != 2:
+            # The mode only takes effect after a full VACUUM
+            connection.exec_driver_sql("PRAGMA auto_vacuum=INCREMENTAL")
+            connection.exec_driver_sql("VACUUM")
+            return 'full'
+        connection.exec_driver_sql("PRAGMA incremental_vacuum")
+        return 'incremental'
+
+
+def compact(engine, keep_months=3, retention_months=24, now=None):
+    """Archive months older than ``keep_months``, drop archives past ``retention_months``.
+
+    Per-hour counts stay in the main database as the summary of archived
+    events. ``retention_months=0`` keeps archives forever.
+    """
+    partitions = MonthPartitions.for_bind(engine)
+    if partitions is None:
+        raise ValueError("Compaction needs a SQLite database file")
+
+    current = month_start(now or datetime.utcnow())
+    cutoff = add_months(current, -keep_months)
+    archived = {}
+    while True:
+        with engine.connect() as connection:
+            oldest = connection.scalar(
+                select(func.min(TimelineEvent.timestamp)).where(TimelineEvent.timestamp < cutoff)
+            )
+        if oldest is None:
+            break
+        month = month_start(oldest)
+        archived[month] = partitions.archive_month(engine, month)
+
+    dropped = partitions.drop_before(add_months(current, -retention_months)) if retention_months else []
+    vacuum = incremental_vacuum(engine)
+    return {'archived': archived, 'dropped': dropped, 'vacuum': vacuum}
@@ -0,0 +1,88 @@
+from sqlalchemy import text, bindparam, DateTime, Float
+from sqlalchemy.exc import OperationalError
+from .partitions import iter_sources
+
+# Placeholders around matched terms; callers swap them for their own markup
+HIGHLIGHT_OPEN = '\x02'
+HIGHLIGHT_CLOSE = '\x03'
+
+SEARCH_SQL = """
+SELECT e.id, e.timestamp, e.event_type, e.source, e.action,
+       snippet(timeline_events_fts, -1, :open, :close, '…', :tokens) AS snippet,
+       bm25(timeline_events_fts) AS rank
+FROM timeline_events_fts
+JOIN timeline_events e ON e.id = timeline_events_fts.rowid
+WHERE timeline_events_fts MATCH :query {filters}
+ORDER BY rank
+LIMIT :limit
+"""
+
+
+class SearchUnavailable(Exception):
+    """The database has no full-text index (run the alembic upgrade)"""
+
+
+def fts_query(query: str) -> str:
+    """Quote each word so punctuation in paths and code can't break FTS syntax.
+
+    A trailing ``*`` is kept as a prefix search; words are ANDed.
+    """
+    terms = []
+    for word in query.split():
+        prefix = word.endswith('*') and len(word) > 1
+        word = word.rstrip('*') if prefix else word
+        terms.append('"' + word.replace('"', '""') + '"' + ('*' if prefix else ''))
+    return ' '.join(terms)
+
+
+def highlight(snippet: str, open_tag: str, close_tag: str, escape=None) -> str:
+    """Replace the highlight placeholders, escaping the text between them"""
+    if escape is not None:
+        snippet = escape(snippet)
+    return snippet.replace(HIGHLIGHT_OPEN, open_tag).replace(HIGHLIGHT_CLOSE, close_tag)
+
+
+def _search_one(session, query, limit, event_type=None, since=None, until=None, tokens=12):
+    filters = []
+    params = {
+        'query': query, 'limit': limit, 'tokens': tokens,
+        'open': HIGHLIGHT_OPEN, 'close': HIGHLIGHT_CLOSE,
+    }
+    if event_type:
+        filters.append("AND e.event_type = :event_type")
+        params['event_type'] = event_type
+    if since is not None:
+        filters.append("AND e.timestamp >= :since")
+        params['since'] = since
+    if until is not None:
+        filters.append("AND e.timestamp < :until")
+        params['until'] = until
+    statement = text(SEARCH_SQL.format(filters=' '.join(filters)))\
+        .bindparams(*(bindparam(name, type_=DateTime) for name in ('since', 'until') if name in params))\
+        .columns(timestamp=DateTime, rank=Float)
+    try:
+        rows = session.execute(statement, params).all()
+    except OperationalError as e:
+        message = str(e.orig)
+        if 'no such table' in message:
+            raise SearchUnavailable("Full-text index missing; run: alembic upgrade head") from e
+        raise ValueError(f"Invalid search query: {message}") from e
+    return [dict(row._mapping) for row in rows]
+
+
+def search_events(session, query, limit=20, event_type=None, since=None, until=None, raw=False):
+    """Rank events matching ``query`` by bm25, best first.
+
+    Searches the main database and any archived months overlapping
+    [since, until]. Each result carries a ``snippet`` with matches wrapped
+    in ``HIGHLIGHT_OPEN``/``HIGHLIGHT_CLOSE``. ``raw`` passes FTS5 query
+    syntax (OR, NEAR, column filters) through unchanged.
+    """
+    match = query if raw else fts_query(query)
+    if not match:
+        return []
+    results = []
+    for _, source in iter_sources(session, since, until, newest_first=True):
+        results.extend(_search_one(source, match, limit, event_type, since, until))
+    results.sort(key=lambda result: result['rank'])
+    return results[:limit]
@@ -1,23 +1,181 @@
 import pty
 import os
-import sys
-from .models import TimelineEvent
+import re
+import codecs
+import tempfile
+import time
+from datetime import datetime
 from sqlalchemy.orm import Session
+from loguru import logger
+from .ingest import IngestClient
+from .writer import TimelineWriter
+
+# Private OSC sequence the shell prints before each prompt:
+#   ESC ] 6973 ; <exit status> ; <cwd> ; <`history 1` line> BEL
+MARKER_START = b'\x1b]6973;'
+MARKER_END = b'\x07'
+
+MAX_OUTPUT_CHARS = 4000
+
+ANSI_ESCAPE = re.compile(r'\x1b(?:\][^\x07]*(?:\x07|\x1b\\)|\[[0-?]*[ -/]*[@-~]|[@-Z\\-_])')
+HISTORY_LINE = re.compile(r'\s*(\d+)\*?\s+(.*)', re.DOTALL)
+
+BASH_HOOK = r'''
+[ -f ~/.bashrc ] && . ~/.bashrc
+# Repeated commands must get new history numbers (ignoredups and erasedups
+# reuse them); space-prefixed commands stay out of history and the timeline
+case ":$HISTCONTROL:" in
+    *:ignorespace:*|*:ignoreboth:*) HISTCONTROL=ignorespace ;;
+    *) HISTCONTROL= ;;
+esac
+__timeline_prompt() {
+    local status=$?
+    printf '\033]6973;%s;%s;%s\007' "$status" "$PWD" "$(HISTTIMEFORMAT= history 1)"
+    return $status
+}
+PROMPT_COMMAND="__timeline_prompt${PROMPT_COMMAND:+;$PROMPT_COMMAND}"
+'''
+
+
+class CommandParser:
+    """Turns pty traffic into one event per shell command.
+
+    Input is only watched for Enter, which starts the clock. Output is
+    decoded incrementally (so split UTF-8 sequences are safe) and collected
+    until the shell's prompt marker arrives with the command's exit status;
+    the marker is removed from what reaches the real terminal.
+    """
+
+    def __init__(self, emit, max_output=MAX_OUTPUT_CHARS):
+        self.emit = emit
+        self.max_output = max_output
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self._carry = b''
+        self._last_history_id = None
+        self._reset()
+
+    def _reset(self):
+        self._started = None
+        self._started_at = None
+        self._output = []
+        self._output_chars = 0
+        self._truncated = False
+
+    def feed_input(self, data: bytes):
+        if self._started is None and (b'\r' in data or b'\n' in data):
+            self._started = time.monotonic()
+            self._started_at = datetime.utcnow()
+
+    def feed_output(self, data: bytes) -> bytes:
+        """Consume pty output; returns the bytes to show on the terminal"""
+        data = self._carry + data
+        self._carry = b''
+        shown = []
+        while data:
+            start = data.find(MARKER_START)
+            if start == -1:
+                # Hold back a trailing partial marker until the next read
+                for keep in range(min(len(MARKER_START) - 1, len(data)), 0, -1):
+                    if MARKER_START.startswith(data[-keep:]):
+                        self._carry = data[-keep:]
+                        data = data[:-keep]
+                        break
+                self._collect(data)
+                shown.append(data)
+                break
+            end = data.find(MARKER_END, start)
+            if end == -1:
+                self._carry = data[start:]
+                data = data[:start]
+                self._collect(data)
+                shown.append(data)
+                break
+            self._collect(data[:start])
+            shown.append(data[:start])
+            self._marker(data[start + len(MARKER_START):end])
+            data = data[end + 1:]
+        return b''.join(shown)
+
+    def _collect(self, data: bytes):
+        if self._started is None or not data:
+            return
+        text = self._decoder.decode(data)
+        if self._output_chars < self.max_output:
+            if len(text) > self.max_output - self._output_chars:
+                text = text[:self.max_output - self._output_chars]
+                self._truncated = True
+            self._output.append(text)
+            self._output_chars += len(text)
+        elif text:
+            self._truncated = True
+
+    def _marker(self, payload: bytes):
+        status, cwd, history = (payload.decode('utf-8', errors='replace').split(';', 2) + ['', ''])[:3]
+        match = HISTORY_LINE.match(history)
+        history_id, command = (match.group(1), match.group(2).strip()) if match else (None, '')
+        started, started_at = self._started, self._started_at
+        output = ANSI_ESCAPE.sub('', ''.join(self._output) + self._decoder.decode(b'', final=True))
+        truncated = self._truncated
+        self._reset()
+
+        # An empty line re-reports the previous history entry
+        if not command or history_id == self._last_history_id or started is None:
+            self._last_history_id = history_id
+            return
+        self._last_history_id = history_id
+        self.emit({
+            'timestamp': started_at,
+            'event_type': 'terminal',
+            'source': 'shell',
+            'action': 'command',
+            'content': f"$ {command}\n{output.replace(chr(13), '')}",
+            'details': {
+                'command': command,
+                'exit_status': int(status) if status.lstrip('-').isdigit() else None,
+                'duration': round(time.monotonic() - started, 3),
+                'cwd': cwd,
+                'history_id': history_id,
+                'output_truncated': truncated
+            }
+        })
+
+
+def capture_terminal(db_session: Session = None, client: IngestClient = None, shell="/bin/bash"):
+    """Capture terminal commands
+
+    Runs an interactive bash with a prompt hook and records one event per
+    command (text, exit status, duration and an output excerpt). Events are
+    queued on a TimelineWriter, so the pty never waits on the database;
+    they go to the ingest daemon unless a ``db_session`` is given.
+    """
+    if db_session is not None and client is None:
+        bind = db_session.get_bind()
+        writer = TimelineWriter(lambda: Session(bind=bind), flush_interval=0.5)
+    else:
+        writer = TimelineWriter(None, flush_interval=0.5, sink=client or IngestClient())
+    writer.start()
+    parser = CommandParser(writer.add)
 
-def capture_terminal(db_session: Session):
-    """Capture terminal commands"""
     def read(fd):
+        data = os.read(fd, 4096)
+        if not data:
+            return data
+        # pty.spawn treats b'' as end of file; terminals ignore NUL
+        return parser.feed_output(data) or b'\0'
+
+    def read_input(fd):
         data = os.read(fd, 1024)
-        if data:
-            # Record command in timeline
-            event = TimelineEvent(
-                event_type='terminal',
-                source='shell',
-                action='command',
-                content=data.decode()
-            )
-            db_session.add(event)
-            db_session.commit()
+        parser.feed_input(data)
         return data
 
-    pty.spawn("/bin/bash", read) 
\ No newline at end of file
+    with tempfile.NamedTemporaryFile('w', prefix='timeline-bashrc-', suffix='.sh', delete=False) as rcfile:
+        rcfile.write(BASH_HOOK)
+    try:
+        pty.spawn([shell, '--rcfile', rcfile.name, '-i'], read, read_input)
+    finally:
+        os.unlink(rcfile.name)
+        writer.stop()
+        if writer.sink is not None:
+            writer.sink.close()
+        stats = writer.stats()
+        logger.info(f"Terminal capture recorded {stats['written']} commands")
@@ -1,46 +1,236 @@
 from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
 from pathlib import Path
 from datetime import datetime
 import json
-from .models import TimelineEvent
-from sqlalchemy.orm import Session
+import time
+from .writer import TimelineWriter
+from .diffs import DiffTracker
+from .ignore import IgnoreMatcher
 from loguru import logger
+import os
+
+try:
+    import tomllib
+except ImportError:  # Python 3.10; TOML configs need the tomli backport
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
 
 class TimelineEventHandler(FileSystemEventHandler):
-    def __init__(self, db_session: Session, ignored_patterns=None):
-        self.session = db_session
-        self.ignored_patterns = ignored_patterns or [
-            '*.pyc', '__pycache__', '.git', 'node_modules',
-            '*.swp', '*.swo', '.DS_Store'
-        ]
-        
-    def should_ignore(self, path):
-        path_str = str(path)
-        return any(pattern in path_str for pattern in self.ignored_patterns)
-        
+    def __init__(self, writer: TimelineWriter, ignored_patterns=None,
+                 max_snapshot_bytes=5 * 1024 * 1024, root='.'):
+        self.writer = writer
+        self.max_snapshot_bytes = max_snapshot_bytes
+        self.diffs = DiffTracker()
+        # gitignore-style patterns plus the root's .gitignore/.timelineignore
+        self.matcher = IgnoreMatcher.for_root(root, ignored_patterns)
+        self.observer = None
+        self.shallow_watches = set()
+
+    def should_ignore(self, path, is_dir=False):
+        return self.matcher.is_ignored(path, is_dir=is_dir)
+
+    def on_created(self, event):
+        # Directories created under a non-recursive watch need their own watch
+        if not event.is_directory or self.observer is None:
+            return
+        if os.path.dirname(event.src_path) in self.shallow_watches \
+                and not self.should_ignore(event.src_path, is_dir=True):
+            self.observer.schedule(self, event.src_path, recursive=True)
+            logger.debug(f"Watching new directory {event.src_path}")
+
     def on_modified(self, event):
         if event.is_directory or self.should_ignore(event.src_path):
             return
-            
+
+        # Only enqueue here; the writer reads the file on its own thread
+        src_path = event.src_path
+        timestamp = datetime.utcnow()
+        self.writer.submit(
+            lambda count: self.build_event(src_path, timestamp, count),
+            key=src_path
+        )
+
+    def build_event(self, src_path, timestamp, count=1):
+        """Build the timeline row for a (possibly coalesced) modification"""
+        path = Path(src_path)
+        if not path.is_file():
+            return None
+
+        size = path.stat().st_size
+        details = {
+            'size': size,
+            'extension': path.suffix,
+            'directory': str(path.parent),
+            'coalesced': count
+        }
+        content = snapshot = None
+        if size <= self.max_snapshot_bytes:
+            # Keyframes go whole to the blob store; other saves keep only a diff
+            change = self.diffs.capture(str(path), path.read_bytes())
+            content, snapshot = change['content'], change['snapshot']
+            details['diff'] = change['diff']
+
+        event = {
+            'timestamp': timestamp,
+            'event_type': 'file_change',
+            'source': str(path),
+            'action': 'modified',
+            'details': details,
+            'content': content,
+            'snapshot': snapshot
+        }
+        logger.info(f"Recorded modification to {path}" + (f" (x{count})" if count > 1 else ""))
+        return event
+
+
+def schedule_watches(observer, handler: TimelineEventHandler, root, max_watches=64):
+    """Schedule watches for ``root`` without ever watching ignored directories.
+
+    A directory whose subtree contains no ignored directories gets a single
+    recursive watch. Otherwise it is watched non-recursively and its
+    non-ignored children are visited in turn, so events from ignored trees
+    (node_modules, .git, build output) are never delivered. Each watch costs
+    an emitter, so once ``max_watches`` is spent the remaining subtrees fall
+    back to recursive watches filtered by ``should_ignore``.
+    """
+    root = os.path.abspath(root)
+    handler.observer = observer
+    contains_ignored = {}
+
+    def child_dirs(directory):
         try:
-            path = Path(event.src_path)
-            
-            # Create timeline event
-            timeline_event = TimelineEvent(
-                event_type='file_change',
-                source=str(path),
-                action='modified',
-                details={
-                    'size': path.stat().st_size,
-                    'extension': path.suffix,
-                    'directory': str(path.parent)
-                },
-                content=path.read_text()[:1000] if path.is_file() else None
-            )
-            
-            self.session.add(timeline_event)
-            self.session.commit()
-            logger.info(f"Recorded modification to {path}")
-            
-        except Exception as e:
-            logger.error(f"Failed to record event: {str(e)}") 
\ No newline at end of file
+            with os.scandir(directory) as entries:
+                return [e.path for e in entries if e.is_dir(follow_symlinks=False)]
+        except OSError:
+            return []
+
+    def has_ignored(directory):
+        if directory not in contains_ignored:
+            found = False
+            for child in child_dirs(directory):
+                if handler.should_ignore(child, is_dir=True) or has_ignored(child):
+                    found = True
+                    break
+            contains_ignored[directory] = found
+        return contains_ignored[directory]
+
+    scheduled = 0
+    pending = [root]
+    while pending:
+        directory = pending.pop(0)
+        children = None
+        if has_ignored(directory):
+            children = [
+                child for child in child_dirs(directory)
+                if not handler.should_ignore(child, is_dir=True)
+            ]
+            if scheduled + 1 + len(pending) + len(children) > max_watches:
+                children = None
+
+        if children is None:
+            observer.schedule(handler, directory, recursive=True)
+        else:
+            observer.schedule(handler, directory, recursive=False)
+            handler.shallow_watches.add(directory)
+            pending.extend(children)
+        scheduled += 1
+
+    logger.info(f"Scheduled {scheduled} watches under {root} "
+                f"({len(handler.shallow_watches)} non-recursive)")
+    return scheduled
+
+
+def load_watch_config(path):
+    """Read the roots to watch from a TOML or JSON file.
+
+    The file holds a ``root`` list of tables with a ``path`` and optional
+    ``ignore`` patterns and ``max_queue``; a top-level ``ignore`` applies to
+    every root::
+
+        ignore = ["*.log"]
+
+        [[root]]
+        path = "~/src/api"
+
+        [[root]]
+        path = "/mnt/share/monorepo"
+        ignore = ["dist/"]
+        max_queue = 2000
+    """
+    path = Path(path)
+    if path.suffix == '.json':
+        config = json.loads(path.read_text())
+    else:
+        if tomllib is None:
+            raise ValueError(f"Reading {path} needs Python 3.11+ or tomli (pip install tomli)")
+        with open(path, 'rb') as f:
+            config = tomllib.load(f)
+
+    shared = list(config.get('ignore', []))
+    roots = []
+    for entry in config.get('root', []):
+        if isinstance(entry, str):
+            entry = {'path': entry}
+        if 'path' not in entry:
+            raise ValueError(f"{path}: every [[root]] needs a path")
+        root = os.path.expanduser(entry['path'])
+        if not os.path.isdir(root):
+            raise ValueError(f"{path}: root {root} is not a directory")
+        roots.append({
+            'path': root,
+            'ignore': shared + list(entry.get('ignore', [])),
+            'max_queue': entry.get('max_queue'),
+        })
+    if not roots:
+        raise ValueError(f"{path}: no [[root]] entries to watch")
+    return roots
+
+
+class WatchedRoot:
+    """One watched directory with its own observer, queue and worker.
+
+    The observer thread only filters paths and enqueues; reading files and
+    writing rows happen on this root's ``TimelineWriter`` thread behind a
+    bounded queue. A slow root (huge checkout, network file system) backs
+    up and drops only its own events instead of starving the others.
+    """
+
+    def __init__(self, path, session_factory, ignored_patterns=None, sink=None, **writer_options):
+        self.path = os.path.abspath(path)
+        self.writer = TimelineWriter(session_factory, sink=sink, **writer_options)
+        self.handler = TimelineEventHandler(self.writer, ignored_patterns=ignored_patterns, root=self.path)
+        self.observer = None
+        self.watches = 0
+        self._last = (time.monotonic(), 0, 0)
+
+    def start(self):
+        self.writer.start()
+        self.observer = Observer()
+        self.observer.name = f"timeline-observer {self.path}"
+        self.watches = schedule_watches(self.observer, self.handler, self.path)
+        self.observer.start()
+        return self
+
+    def stop(self):
+        if self.observer is not None:
+            self.observer.stop()
+            self.observer.join()
+            self.observer = None
+        self.writer.stop()
+
+    def stats(self):
+        """Writer counters plus event rates since the previous call"""
+        stats = self.writer.stats()
+        now = time.monotonic()
+        then, submitted, written = self._last
+        elapsed = max(now - then, 1e-6)
+        stats['path'] = self.path
+        stats['watches'] = self.watches
+        stats['max_queue'] = self.writer.max_queue
+        stats['events_per_sec'] = (stats['submitted'] - submitted) / elapsed
+        stats['writes_per_sec'] = (stats['written'] - written) / elapsed
+        self._last = (now, stats['submitted'], stats['written'])
+        return stats
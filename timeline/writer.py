@@ -0,0 +1,202 @@
+import queue
+import threading
+import time
+from loguru import logger
+from .blobs import BlobStore
+from .counters import record_counts
+from .models import TimelineEvent
+
+
+def write_rows(session_factory, rows, blob_store):
+    """Insert event mappings, their snapshots and counters in one transaction.
+
+    Raw bytes under ``snapshot`` are moved to the blob store and replaced by
+    ``content_digest``. Returns True if the rows were committed.
+    """
+    blobs = {}
+    for row in rows:
+        snapshot = row.pop('snapshot', None)
+        if snapshot is not None:
+            row['content_digest'] = blob_store.digest(snapshot)
+            blobs[row['content_digest']] = snapshot
+
+    session = session_factory()
+    try:
+        blob_store.put_many(session, blobs)
+        session.bulk_insert_mappings(TimelineEvent, rows)
+        record_counts(session, rows)
+        session.commit()
+        logger.debug(f"Flushed {len(rows)} timeline events")
+        return True
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Failed to flush {len(rows)} timeline events: {str(e)}")
+        return False
+    finally:
+        session.close()
+
+
+class _Pending:
+    """A debounced event waiting for its burst to settle"""
+    __slots__ = ('build', 'count', 'first_seen', 'last_seen')
+
+    def __init__(self, build, now):
+        self.build = build
+        self.count = 1
+        self.first_seen = now
+        self.last_seen = now
+
+
+class TimelineWriter:
+    """Buffered, batched writer for timeline events.
+
+    Producers call ``submit`` from any thread; it only enqueues and never
+    touches the database. A background flusher drains the queue, collapses
+    bursts of events sharing a debounce key into a single row carrying a
+    ``coalesced`` count, and inserts rows in batches with one commit each.
+
+    ``build`` callables run on the flusher thread, so slow work such as
+    reading file contents stays off the observer thread. A mapping may carry
+    raw file bytes under ``snapshot``; they are written to the blob store in
+    the same transaction and the row gets their ``content_digest``.
+
+    With a ``sink`` (such as an ``IngestClient``) settled rows are handed to
+    it instead of being written to the database from this process.
+    """
+
+    def __init__(self, session_factory, max_queue=10000, batch_size=500,
+                 flush_interval=1.0, debounce=0.5, max_delay=5.0,
+                 blob_store=None, sink=None):
+        self.session_factory = session_factory
+        self.sink = sink
+        self.blob_store = blob_store or BlobStore()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.max_queue = max_queue
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._pending = {}
+        self._batch = []
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+
+    def start(self):
+        """Start the background flusher"""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="timeline-writer", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=10.0):
+        """Flush everything that is buffered and stop the flusher"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, build, key=None):
+        """Queue an event for writing.
+
+        ``build`` is called on the flusher thread with the coalesced count
+        and returns a column mapping for ``TimelineEvent`` (or None to skip).
+        Events with the same ``key`` that arrive within the debounce window
+        are collapsed into one row. Returns False if the queue is full and
+        the event was dropped.
+        """
+        try:
+            self._queue.put_nowait((key, build, time.monotonic()))
+            self.submitted += 1
+            return True
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped % 1000 == 1:
+                logger.warning(f"Timeline write queue full, dropped {self.dropped} events")
+            return False
+
+    def add(self, mapping):
+        """Queue a ready-made event mapping without debouncing"""
+        return self.submit(lambda count: mapping)
+
+    def stats(self):
+        """Current queue and throughput counters"""
+        return {
+            'queued': self._queue.qsize(),
+            'pending': len(self._pending),
+            'submitted': self.submitted,
+            'written': self.written,
+            'dropped': self.dropped,
+        }
+
+    def _run(self):
+        last_flush = time.monotonic()
+        while True:
+            stopping = self._stop.is_set()
+            try:
+                self._accept(*self._queue.get(timeout=min(self.debounce, self.flush_interval)))
+                # Drain whatever else is already waiting without blocking
+                while len(self._batch) < self.batch_size:
+                    self._accept(*self._queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            now = time.monotonic()
+            self._release_settled(now, force=stopping)
+
+            if (len(self._batch) >= self.batch_size
+                    or now - last_flush >= self.flush_interval
+                    or stopping):
+                self._flush()
+                last_flush = now
+
+            if stopping and self._queue.empty() and not self._pending and not self._batch:
+                break
+
+    def _accept(self, key, build, now):
+        if key is None:
+            self._materialize(build, 1)
+            return
+        pending = self._pending.get(key)
+        if pending is None:
+            self._pending[key] = _Pending(build, now)
+        else:
+            pending.build = build
+            pending.count += 1
+            pending.last_seen = now
+
+    def _release_settled(self, now, force=False):
+        settled = [
+            key for key, p in self._pending.items()
+            if force
+            or now - p.last_seen >= self.debounce
+            or now - p.first_seen >= self.max_delay
+        ]
+        for key in settled:
+            pending = self._pending.pop(key)
+            self._materialize(pending.build, pending.count)
+
+    def _materialize(self, build, count):
+        try:
+            mapping = build(count)
+        except Exception as e:
+            logger.error(f"Failed to build timeline event: {str(e)}")
+            return
+        if mapping is not None:
+            self._batch.append(mapping)
+
+    def _flush(self):
+        if not self._batch:
+            return
+        rows, self._batch = self._batch, []
+        if self.sink is not None:
+            if self.sink.send_many(rows):
+                self.written += len(rows)
+        elif write_rows(self.session_factory, rows, self.blob_store):
+            self.written += len(rows)